@@ -0,0 +1,8 @@
+"""
+Benchmarks for the fetch, scoring, dedupe, storage and output hot paths.
+
+Run from the repository root:
+    python -m benchmarks                 # everything, results in benchmarks/results/
+    python -m benchmarks --quick -k store
+    python -m benchmarks --compare       # against benchmarks/baselines/baseline.json
+"""
@@ -0,0 +1,18 @@
+"""Content hashing and near-duplicate signatures, per 1,000 posts."""
+
+from src.dedupe import compute_content_hash, compute_minhash
+
+from .generators import generate_posts
+
+
+class ContentHashing:
+    def setup(self):
+        self.posts = generate_posts(1000, seed=2)
+    
+    def time_compute_content_hash(self):
+        for post in self.posts:
+            compute_content_hash(post.title, post.selftext)
+    
+    def time_compute_minhash(self):
+        for post in self.posts:
+            compute_minhash(post.title, post.selftext)
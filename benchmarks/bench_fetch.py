@@ -0,0 +1,54 @@
+"""End-to-end dry-run fetch: load listings, hash, dedupe, score and store."""
+
+import shutil
+import tempfile
+from pathlib import Path
+
+from src.config import AppConfig, RedditConfig
+from src.fetch import fetch_posts
+from src.reddit_client import RedditClient
+from src.store import Database
+
+from .generators import write_fixtures
+
+
+class FetchPipeline:
+    params = [[1_000, 10_000]]
+    param_names = ["posts"]
+    # Every run needs a fresh database, so time single runs
+    number = 1
+    repeat = 3
+    
+    def setup(self, posts):
+        self.tmpdir = Path(tempfile.mkdtemp(prefix="hirelab-bench-"))
+        self.subreddits = write_fixtures(self.tmpdir / "fixtures", posts // 5)
+        self.reddit_config = RedditConfig()
+        self.app_config = AppConfig(
+            posts_per_subreddit=posts,
+            dry_run=True,
+            data_dir=self.tmpdir,
+        )
+        self.client = RedditClient(self.reddit_config, fixtures_path=self.tmpdir / "fixtures")
+        self.db = None
+        self.runs = 0
+    
+    def setup_repeat(self, posts):
+        if self.db:
+            self.db.close()
+        self.runs += 1
+        self.db = Database(self.tmpdir / f"run{self.runs}.sqlite")
+    
+    def teardown(self, posts):
+        if self.db:
+            self.db.close()
+        shutil.rmtree(self.tmpdir)
+    
+    def time_fetch_posts(self, posts):
+        fetch_posts(
+            reddit_config=self.reddit_config,
+            app_config=self.app_config,
+            db=self.db,
+            subreddits=self.subreddits,
+            verbose=False,
+            client=self.client,
+        )
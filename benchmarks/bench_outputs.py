@@ -0,0 +1,34 @@
+"""Slack message building and CSV export of a digest."""
+
+import shutil
+import tempfile
+from pathlib import Path
+
+from src.outputs.sheets import _write_to_csv
+from src.outputs.slack import _build_slack_blocks
+
+from .generators import generate_posts
+
+
+class SlackBlocks:
+    def setup(self):
+        # A full digest (cli digest --limit default)
+        self.posts = generate_posts(20, seed=5)
+    
+    def time_build_slack_blocks(self):
+        _build_slack_blocks(self.posts, "🎯 HireLab Reddit Leads")
+
+
+class CsvExport:
+    def setup(self):
+        self.tmpdir = Path(tempfile.mkdtemp(prefix="hirelab-bench-"))
+        self.posts = generate_posts(100, seed=6)
+    
+    def setup_repeat(self):
+        (self.tmpdir / "queue.csv").unlink(missing_ok=True)
+    
+    def teardown(self):
+        shutil.rmtree(self.tmpdir)
+    
+    def time_write_to_csv(self):
+        _write_to_csv(self.posts, self.tmpdir / "queue.csv")
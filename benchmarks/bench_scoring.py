@@ -0,0 +1,29 @@
+"""Keyword matching and intent scoring, per 1,000 posts."""
+
+from src.scoring import calculate_intent_score, get_keyword_matcher, match_keywords, score_batch
+
+from .generators import generate_posts
+
+
+class IntentScoring:
+    def setup(self):
+        self.posts = generate_posts(1000, seed=1)
+        # Build the keyword automaton outside the timings
+        get_keyword_matcher()
+    
+    def time_match_keywords(self):
+        for post in self.posts:
+            match_keywords(post.title, post.selftext)
+    
+    def time_calculate_intent_score(self):
+        for post in self.posts:
+            calculate_intent_score(
+                title=post.title,
+                selftext=post.selftext,
+                subreddit=post.subreddit,
+                score=post.score,
+                num_comments=post.num_comments,
+            )
+    
+    def time_score_batch(self):
+        score_batch(self.posts)
@@ -0,0 +1,66 @@
+"""Post storage and queries against databases of 10k, 100k and 1M posts."""
+
+import shutil
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+
+from src.store import Database, PostStatus, fts_query
+
+from .generators import BASE_TIME, POST_INTERVAL_SECONDS, iter_posts, populate_database
+
+
+class PostStore:
+    params = [[10_000, 100_000, 1_000_000]]
+    param_names = ["rows"]
+    
+    def setup(self, rows):
+        self.tmpdir = Path(tempfile.mkdtemp(prefix="hirelab-bench-"))
+        self.db = Database(self.tmpdir / "bench.sqlite")
+        populate_database(self.db, rows, seed=3)
+        # New posts for save_post, numbered after the stored ones
+        self.new_posts = iter_posts(seed=4, start=rows)
+    
+    def teardown(self, rows):
+        self.db.close()
+        shutil.rmtree(self.tmpdir)
+    
+    def time_get_post(self, rows):
+        self.db.get_post("bm2s")
+    
+    def time_get_post_with_body(self, rows):
+        # The body and drafts load on first access
+        self.db.get_post("bm2s").selftext
+    
+    def time_get_posts_by_status(self, rows):
+        self.db.get_posts_by_status(
+            statuses=[PostStatus.NEW, PostStatus.QUEUED],
+            min_score=55,
+            limit=100,
+        )
+    
+    def time_get_post_summaries(self, rows):
+        self.db.get_post_summaries(
+            statuses=[PostStatus.NEW, PostStatus.QUEUED],
+            min_score=55,
+            limit=100,
+        )
+    
+    def time_get_recent_posts(self, rows):
+        # Generated posts are older than BASE_TIME; reach back over the newest 1%
+        age = (datetime.now(timezone.utc) - BASE_TIME).total_seconds()
+        hours = int((age + rows // 100 * POST_INTERVAL_SECONDS) / 3600) + 1
+        self.db.get_recent_posts(hours=hours, limit=50)
+    
+    def time_save_post(self, rows):
+        self.db.save_post(next(self.new_posts))
+    
+    # Every call inserts a row; keep the table size roughly constant
+    time_save_post.number = 200
+    
+    def time_search_posts(self, rows):
+        # A keyword many generated posts contain, so every match has to be ranked
+        self.db.search_posts(fts_query("resume"), statuses=[PostStatus.NEW, PostStatus.QUEUED], limit=21)
+    
+    def time_search_posts_phrase(self, rows):
+        self.db.search_posts(fts_query("cover letter"), min_score=50, limit=21)
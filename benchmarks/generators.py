@@ -0,0 +1,244 @@
+"""
+Synthetic posts shaped like data/fixtures/*.json.
+
+Titles and bodies are stitched together from the fixture posts' sentences
+plus keywords from the scoring lists, so keyword matching, scoring and
+hashing see realistic text. Everything is seeded: the same arguments always
+produce the same posts.
+"""
+
+import itertools
+import json
+import random
+import string
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterator, Optional
+
+from src.config import HIGH_INTENT_PHRASES, NEGATIVE_KEYWORDS, POSITIVE_KEYWORDS
+from src.dedupe import compute_content_hash
+from src.drafts import TEMPLATE_DRAFTS
+from src.store import Database, Post, PostStatus
+
+FIXTURES_DIR = Path(__file__).parent.parent / "data" / "fixtures"
+
+SUBREDDITS = ["resumes", "cscareerquestions", "careerguidance", "jobs", "recruitinghell"]
+
+# Reference time for created_utc, so generated data does not depend on the clock
+BASE_TIME = datetime(2024, 1, 15, 12, 0, tzinfo=timezone.utc)
+
+# Post n was created n * POST_INTERVAL_SECONDS before BASE_TIME
+POST_INTERVAL_SECONDS = 37
+
+# Share of posts that are edited reposts of a recent post
+REPOST_RATE = 0.02
+
+# Rough status mix of a database that has been running for a while
+STATUS_WEIGHTS = {
+    PostStatus.NEW: 40,
+    PostStatus.QUEUED: 20,
+    PostStatus.SENT: 15,
+    PostStatus.REPLIED: 10,
+    PostStatus.SKIPPED: 10,
+    PostStatus.DUPLICATE: 5,
+}
+
+_TEMPLATES = list(TEMPLATE_DRAFTS.values())
+
+
+@lru_cache(maxsize=1)
+def _corpus() -> tuple[list[str], list[str]]:
+    """Titles and body sentences of the fixture posts."""
+    titles, sentences = [], []
+    for fixture in sorted(FIXTURES_DIR.glob("*.json")):
+        for data in json.loads(fixture.read_text()):
+            titles.append(data["title"])
+            sentences.extend(
+                sentence.strip() + "."
+                for sentence in data.get("selftext", "").replace("?", ".").split(".")
+                if sentence.strip()
+            )
+    return titles, sentences
+
+
+def _reddit_id(index: int) -> str:
+    """Base-36 id that cannot collide with real or fixture ids."""
+    digits = ""
+    while True:
+        index, remainder = divmod(index, 36)
+        digits = (string.digits + string.ascii_lowercase)[remainder] + digits
+        if not index:
+            return f"bm{digits}"
+
+
+@lru_cache(maxsize=1)
+def _vocabulary() -> list[str]:
+    """Pseudo-words for the parts of a post that are unique to its author."""
+    rng = random.Random("vocabulary")
+    syllables = [c + v for c in "bcdfghklmnprstvw" for v in "aeiou"]
+    return sorted({
+        "".join(rng.choices(syllables, k=rng.randint(1, 3))) for _ in range(5000)
+    })
+
+
+def _text(rng: random.Random, index: int, recent: deque) -> tuple[str, str]:
+    """
+    Title and body of post `index`.
+    
+    Bodies mix a couple of fixture sentences and keywords with sentences of
+    pseudo-words, so unrelated posts share few shingles (as real posts do).
+    About 2% are edited reposts of a recent post, for the near-duplicate path.
+    """
+    titles, sentences = _corpus()
+    vocabulary = _vocabulary()
+    
+    if recent and rng.random() < REPOST_RATE:
+        title, body = rng.choice(recent)
+        return title, f"{body} EDIT: thanks everyone, still looking for advice."
+    
+    title = rng.choice(titles)
+    if rng.random() < 0.5:
+        title = f"{title} ({rng.choice(POSITIVE_KEYWORDS)})"
+    
+    body = rng.sample(sentences, rng.randint(1, 2))
+    for _ in range(rng.randint(2, 5)):
+        words = rng.choices(vocabulary, k=rng.randint(8, 20))
+        body.append(" ".join(words).capitalize() + ".")
+    for _ in range(rng.randint(0, 3)):
+        body.insert(rng.randrange(len(body) + 1), rng.choice(POSITIVE_KEYWORDS).capitalize() + "?")
+    if rng.random() < 0.3:
+        body.append(rng.choice(HIGH_INTENT_PHRASES).capitalize() + ".")
+    if rng.random() < 0.1:
+        body.append(f"Not {rng.choice(NEGATIVE_KEYWORDS)} related.")
+    
+    # A few posts are link posts or near-empty
+    if rng.random() < 0.05:
+        return title, ""
+    
+    selftext = " ".join(body)
+    recent.append((title, selftext))
+    return title, selftext
+
+
+def generate_listing(count: int, subreddit: str, seed: int = 0, start: int = 0) -> list[dict]:
+    """
+    Generate a listing in the format of data/fixtures/<subreddit>.json.
+    
+    Args:
+        count: Posts in the listing
+        subreddit: Subreddit the posts belong to
+        seed: Random seed
+        start: Index of the first post (ids are unique across indexes)
+    
+    Returns:
+        Post dicts, newest first
+    """
+    rng = random.Random(f"{seed}:{subreddit}")
+    recent: deque = deque(maxlen=100)
+    listing = []
+    for index in range(start, start + count):
+        reddit_id = _reddit_id(index)
+        title, selftext = _text(rng, index, recent)
+        created = BASE_TIME - timedelta(seconds=index * POST_INTERVAL_SECONDS)
+        listing.append({
+            "id": reddit_id,
+            "title": title,
+            "selftext": selftext,
+            "url": f"https://www.reddit.com/r/{subreddit}/comments/{reddit_id}",
+            "author": f"user_{rng.randrange(10 ** 6)}",
+            "created_utc": created.isoformat().replace("+00:00", "Z"),
+            "score": min(int(rng.paretovariate(1.2)), 5000),
+            "num_comments": min(int(rng.paretovariate(1.4)), 2000),
+        })
+    return listing
+
+
+def write_fixtures(
+    directory: Path,
+    posts_per_subreddit: int,
+    subreddits: Optional[list[str]] = None,
+    seed: int = 0,
+) -> list[str]:
+    """
+    Write one fixture file per subreddit, for dry-run fetches.
+    
+    Returns:
+        The subreddits written
+    """
+    subreddits = subreddits or SUBREDDITS
+    directory.mkdir(parents=True, exist_ok=True)
+    for offset, subreddit in enumerate(subreddits):
+        listing = generate_listing(
+            posts_per_subreddit, subreddit, seed=seed, start=offset * posts_per_subreddit,
+        )
+        (directory / f"{subreddit}.json").write_text(json.dumps(listing))
+    return subreddits
+
+
+def iter_posts(
+    count: Optional[int] = None,
+    seed: int = 0,
+    start: int = 0,
+    subreddits: Optional[list[str]] = None,
+) -> Iterator[Post]:
+    """
+    Generate scored, hashed posts as the fetch pipeline would store them.
+    
+    Args:
+        count: Posts to generate (None for an endless stream)
+        seed: Random seed
+        start: Index of the first post (ids are unique across indexes)
+        subreddits: Subreddits to spread the posts over
+    """
+    subreddits = subreddits or SUBREDDITS
+    rng = random.Random(seed)
+    statuses = list(STATUS_WEIGHTS)
+    weights = list(STATUS_WEIGHTS.values())
+    indexes = itertools.count(start) if count is None else range(start, start + count)
+    recent: deque = deque(maxlen=100)
+    
+    for index in indexes:
+        subreddit = subreddits[index % len(subreddits)]
+        title, selftext = _text(rng, index, recent)
+        status = rng.choices(statuses, weights)[0]
+        drafted = status in (PostStatus.QUEUED, PostStatus.SENT, PostStatus.REPLIED)
+        template = rng.choice(_TEMPLATES) if drafted else {}
+        created = BASE_TIME - timedelta(seconds=index * POST_INTERVAL_SECONDS)
+        reddit_id = _reddit_id(index)
+        
+        yield Post(
+            reddit_id=reddit_id,
+            subreddit=subreddit,
+            title=title,
+            selftext=selftext,
+            url=f"https://www.reddit.com/r/{subreddit}/comments/{reddit_id}",
+            author=f"user_{rng.randrange(10 ** 6)}",
+            created_utc=created,
+            score=min(int(rng.paretovariate(1.2)), 5000),
+            num_comments=min(int(rng.paretovariate(1.4)), 2000),
+            matched_keywords=rng.sample(POSITIVE_KEYWORDS, rng.randint(0, 4)),
+            intent_score=round(rng.uniform(0, 100), 2),
+            status=status,
+            last_seen_at=(created + timedelta(hours=1)).replace(tzinfo=None),
+            content_hash=compute_content_hash(title, selftext),
+            draft_a=template.get("draft_a", ""),
+            draft_b=template.get("draft_b", ""),
+            mention_allowed=rng.random() < 0.2,
+        )
+
+
+def generate_posts(count: int, seed: int = 0, start: int = 0) -> list[Post]:
+    """Generate a list of posts (see iter_posts)."""
+    return list(iter_posts(count, seed=seed, start=start))
+
+
+def populate_database(db: Database, rows: int, seed: int = 0, chunk_size: int = 10_000) -> None:
+    """Fill a database with `rows` synthetic posts, one transaction per chunk."""
+    posts = iter_posts(rows, seed=seed)
+    while True:
+        chunk = list(itertools.islice(posts, chunk_size))
+        if not chunk:
+            break
+        db.upsert_posts(chunk)
@@ -0,0 +1,248 @@
+"""
+Benchmark runner: discover, time, save and compare.
+
+Benchmarks are asv-style classes in benchmarks/bench_*.py:
+    
+    class PostStore:
+        params = [[10_000, 100_000]]    # one list per parameter
+        param_names = ["rows"]
+        
+        def setup(self, rows): ...      # once per parameter combination
+        def setup_repeat(self, rows): ...  # optional, before every repeat
+        def teardown(self, rows): ...
+        
+        def time_get_posts_by_status(self, rows): ...
+
+Each time_* method is called `number` times per repeat (calibrated so a
+repeat takes at least MIN_REPEAT_SECONDS unless the class or method sets
+`number`), and the per-call time of every repeat is recorded. Results are
+saved as JSON keyed by benchmark name and parameters, so two runs (or a
+run and a committed baseline) can be compared.
+"""
+
+import argparse
+import contextlib
+import gc
+import importlib
+import itertools
+import json
+import os
+import platform
+import sqlite3
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Iterator, Optional
+
+BENCHMARKS_DIR = Path(__file__).parent
+RESULTS_DIR = BENCHMARKS_DIR / "results"
+BASELINE_PATH = BENCHMARKS_DIR / "baselines" / "baseline.json"
+
+MIN_REPEAT_SECONDS = 0.2
+DEFAULT_REPEAT = 5
+
+# Slower than the baseline by more than this ratio counts as a regression
+DEFAULT_REGRESSION_RATIO = 1.2
+
+
+def discover(pattern: str = "") -> Iterator[tuple[str, type]]:
+    """Yield (module name, class) for every benchmark class matching a pattern."""
+    for path in sorted(BENCHMARKS_DIR.glob("bench_*.py")):
+        module = importlib.import_module(f"benchmarks.{path.stem}")
+        for name, cls in vars(module).items():
+            if not isinstance(cls, type) or cls.__module__ != module.__name__:
+                continue
+            methods = [attr for attr in vars(cls) if attr.startswith("time_")]
+            if methods and any(pattern in f"{path.stem}.{name}.{m}" for m in methods):
+                yield path.stem, cls
+
+
+def benchmark_key(module: str, cls: type, method: str, params: tuple) -> str:
+    """Result key, e.g. `bench_store.PostStore.time_save_post(rows=10000)`."""
+    names = getattr(cls, "param_names", [])
+    args = ", ".join(f"{name}={value}" for name, value in zip(names, params))
+    return f"{module}.{cls.__name__}.{method}({args})"
+
+
+def time_calls(
+    func: Callable[[], object],
+    number: int,
+    repeat: int,
+    before_repeat: Optional[Callable[[], object]] = None,
+) -> tuple[int, list[float]]:
+    """
+    Time `number` calls per repeat, with the garbage collector off like timeit.
+    
+    Returns:
+        The number of calls per repeat and the per-call seconds of each repeat
+    """
+    if not number:
+        # One call to warm up and estimate, then enough calls to fill a repeat
+        if before_repeat:
+            before_repeat()
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        number = max(1, int(MIN_REPEAT_SECONDS / max(elapsed, 1e-9)))
+    
+    times = []
+    for _ in range(repeat):
+        if before_repeat:
+            before_repeat()
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            for _ in range(number):
+                func()
+            times.append((time.perf_counter() - start) / number)
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+    return number, times
+
+
+def run_class(module: str, cls: type, pattern: str, quick: bool, repeat: Optional[int]) -> dict:
+    """Run every matching time_* method of a benchmark class for every parameter combination."""
+    results = {}
+    param_lists = getattr(cls, "params", [])
+    if quick:
+        param_lists = [values[:1] for values in param_lists]
+    methods = sorted(
+        attr for attr in vars(cls)
+        if attr.startswith("time_") and pattern in f"{module}.{cls.__name__}.{attr}"
+    )
+    
+    for params in itertools.product(*param_lists):
+        instance = cls()
+        print(f"{module}.{cls.__name__}{params or ''}: setting up...", file=sys.stderr)
+        with _quiet():
+            if hasattr(instance, "setup"):
+                instance.setup(*params)
+        try:
+            for method in methods:
+                func = getattr(instance, method)
+                before_repeat = getattr(instance, "setup_repeat", None)
+                with _quiet():
+                    number, times = time_calls(
+                        lambda: func(*params),
+                        number=getattr(func, "number", getattr(cls, "number", 0)),
+                        repeat=repeat or getattr(func, "repeat", getattr(cls, "repeat", DEFAULT_REPEAT)),
+                        before_repeat=(lambda: before_repeat(*params)) if before_repeat else None,
+                    )
+                key = benchmark_key(module, cls, method, params)
+                results[key] = {
+                    "min": min(times),
+                    "median": statistics.median(times),
+                    "mean": statistics.fmean(times),
+                    "stdev": statistics.stdev(times) if len(times) > 1 else 0.0,
+                    "number": number,
+                    "repeat": len(times),
+                }
+                print(f"  {key}: {_format_seconds(results[key]['median'])}", file=sys.stderr)
+        finally:
+            with _quiet():
+                if hasattr(instance, "teardown"):
+                    instance.teardown(*params)
+    return results
+
+
+def machine_info() -> dict:
+    """Where and on what code a run was made, to judge whether runs are comparable."""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=BENCHMARKS_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "created_at": datetime.utcnow().isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def compare(results: dict, baseline: dict, ratio: float) -> list[str]:
+    """
+    Print current vs baseline times.
+    
+    Compares the fastest repeat of each, which is the least affected by
+    other load on the machine (as the timeit docs recommend).
+    
+    Returns:
+        Keys of benchmarks slower than the baseline by more than `ratio`
+    """
+    regressions = []
+    print(f"\n{'benchmark':<72} {'baseline':>10} {'current':>10} {'ratio':>7}")
+    for key, current in results.items():
+        before = baseline.get(key)
+        if not before:
+            print(f"{key:<72} {'-':>10} {_format_seconds(current['min']):>10} {'new':>7}")
+            continue
+        change = current["min"] / before["min"]
+        flag = ""
+        if change > ratio:
+            flag = "  slower"
+            regressions.append(key)
+        elif change < 1 / ratio:
+            flag = "  faster"
+        print(f"{key:<72} {_format_seconds(before['min']):>10} "
+              f"{_format_seconds(current['min']):>10} {change:>6.2f}x{flag}")
+    return regressions
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Run the benchmark suite")
+    parser.add_argument("--filter", "-k", default="", help="Only run benchmarks whose name contains this")
+    parser.add_argument("--quick", action="store_true", help="Only the smallest value of each parameter")
+    parser.add_argument("--repeat", type=int, default=None, help="Repeats per benchmark")
+    parser.add_argument("--output", "-o", type=Path, default=None,
+                        help="Results file (default: benchmarks/results/<time>-<commit>.json)")
+    parser.add_argument("--compare", type=Path, nargs="?", const=BASELINE_PATH, default=None,
+                        help="Compare against a results file (default: the committed baseline)")
+    parser.add_argument("--fail-above", type=float, default=DEFAULT_REGRESSION_RATIO,
+                        help="Exit non-zero if a benchmark is this many times slower than the baseline")
+    args = parser.parse_args(argv)
+    
+    info = machine_info()
+    results = {}
+    for module, cls in discover(args.filter):
+        results.update(run_class(module, cls, args.filter, args.quick, args.repeat))
+    
+    output = args.output or RESULTS_DIR / f"{datetime.utcnow():%Y%m%d-%H%M%S}-{info['commit'] or 'unknown'}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps({"machine": info, "results": results}, indent=2) + "\n")
+    print(f"\nSaved {len(results)} results to {output}")
+    
+    if args.compare:
+        baseline = json.loads(args.compare.read_text())
+        regressions = compare(results, baseline["results"], args.fail_above)
+        if regressions:
+            print(f"\n{len(regressions)} benchmarks more than {args.fail_above:.2f}x slower than {args.compare}")
+            return 1
+    return 0
+
+
+@contextlib.contextmanager
+def _quiet() -> Iterator[None]:
+    """Swallow what the code under test prints, so it doesn't skew timings or the report."""
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        yield
+
+
+def _format_seconds(seconds: float) -> str:
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.3g}{unit}"
+    return f"{seconds / 1e-9:.3g}ns"
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Check that the CLI still starts fast.
+
+Importing src.cli must not load the heavy dependencies that only some
+commands use, and its cumulative import time (from `python -X importtime`,
+best of several runs) must stay under a budget. Exits non-zero on a
+regression, so it can run in CI or a pre-commit hook:
+    python scripts/check_import_time.py
+    python scripts/check_import_time.py --budget-ms 150 --runs 10
+"""
+
+import argparse
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+
+# Modules that must stay out of `import src.cli`; commands import them on use
+HEAVY_MODULES = [
+    "praw",
+    "prawcore",
+    "aiohttp",
+    "requests",
+    "openai",
+    "numpy",
+    "gspread",
+    "apscheduler",
+    "rich.markdown",
+    "rich.progress",
+    "src.fetch",
+    "src.scoring",
+    "src.drafts.generator",
+    "src.outputs.slack",
+    "src.workflows",
+]
+
+DEFAULT_BUDGET_MS = 200.0
+
+
+def measure_import_ms(module: str) -> float:
+    """Cumulative import time of a module in a fresh interpreter, in milliseconds."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    for line in result.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        parts = line.split("|")
+        if len(parts) == 3 and parts[2].strip() == module and not parts[2].startswith("  "):
+            return int(parts[1]) / 1000
+    raise RuntimeError(f"No importtime entry for {module}")
+
+
+def loaded_heavy_modules(module: str) -> list[str]:
+    """Heavy modules present in sys.modules after importing a module."""
+    code = (
+        f"import sys, {module}; "
+        f"print('\\n'.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return result.stdout.split()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Check the import time of the CLI")
+    parser.add_argument("--module", default="src.cli", help="Module to import")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS, help="Maximum import time")
+    parser.add_argument("--runs", type=int, default=5, help="Runs to take the best of")
+    args = parser.parse_args()
+    
+    failed = False
+    
+    heavy = loaded_heavy_modules(args.module)
+    if heavy:
+        print(f"✗ import {args.module} loads: {', '.join(heavy)}")
+        failed = True
+    else:
+        print(f"✓ import {args.module} loads none of the heavy modules")
+    
+    best = min(measure_import_ms(args.module) for _ in range(args.runs))
+    if best > args.budget_ms:
+        print(f"✗ import {args.module} took {best:.0f}ms (budget {args.budget_ms:.0f}ms)")
+        failed = True
+    else:
+        print(f"✓ import {args.module} took {best:.0f}ms (budget {args.budget_ms:.0f}ms)")
+    
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -16,11 +16,10 @@ from datetime import datetime, timedelta
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-import requests
-
+from src import perf
 from src.config import load_config
-from src.store import Database, PostStatus
-from src.outputs.slack import build_daily_digest
+from src.store import Database
+from src.workflows import send_daily_digest
 
 
 def main():
@@ -34,55 +33,13 @@ def main():
     _, slack_config, _, _, app_config = load_config()
     
     # Initialize database
-    db = Database(app_config.data_dir / "hirelab_reddit.sqlite")
-    
-    # Get stats
-    db_stats = db.get_stats()
-    
-    # Get top posts from last 24 hours
-    print("\n📊 Generating daily digest...")
-    posts = db.get_recent_posts(hours=24, limit=10)
-    
-    # Calculate additional stats
-    stats = {
-        "total_posts": db_stats.get("total_posts", 0),
-        "new_today": len(posts),
-        "replied": db_stats.get("by_status", {}).get("REPLIED", 0),
-    }
-    
-    print(f"  Posts tracked: {stats['total_posts']}")
-    print(f"  New in last 24h: {stats['new_today']}")
-    print(f"  Total replied: {stats['replied']}")
+    db = Database(app_config.data_dir / "hirelab_reddit.sqlite", compression=app_config.body_compression)
     
+    with perf.record_run("daily_digest", app_config):
+        send_daily_digest(db, slack_config)
     if not slack_config.is_configured:
-        print("\n⚠ Slack not configured")
-        print("Set SLACK_WEBHOOK_URL in .env to receive daily digests")
-        
-        # Print to console instead
-        print("\n📋 Top 10 Posts (Last 24 Hours):")
-        for i, post in enumerate(posts[:10], 1):
-            print(f"\n{i}. [{post.intent_score:.0f}] r/{post.subreddit}")
-            print(f"   {post.title[:60]}...")
-            print(f"   {post.url}")
-        
         return
     
-    # Build and send Slack message
-    print("\n📤 Sending daily digest to Slack...")
-    blocks = build_daily_digest(posts, stats)
-    
-    try:
-        response = requests.post(
-            slack_config.webhook_url,
-            json={"blocks": blocks},
-            headers={"Content-Type": "application/json"},
-            timeout=30,
-        )
-        response.raise_for_status()
-        print("  ✓ Daily digest sent to Slack")
-    except requests.RequestException as e:
-        print(f"  ✗ Failed to send: {e}")
-    
     print("\n✅ Done!")
     print("=" * 50)
 
@@ -15,11 +15,11 @@ from pathlib import Path
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from src import perf
 from src.config import load_config, DEFAULT_SUBREDDITS
-from src.store import Database, PostStatus, Action, ActionType
+from src.store import Database, create_draft_cache
 from src.fetch import fetch_posts
-from src.drafts import generate_drafts
-from src.outputs import send_to_slack, write_to_sheets, print_to_console
+from src.workflows import notify_high_intent_posts
 
 
 def main():
@@ -32,7 +32,7 @@ def main():
     reddit_config, slack_config, sheets_config, openai_config, app_config = load_config()
     
     # Initialize database
-    db = Database(app_config.data_dir / "hirelab_reddit.sqlite")
+    db = Database(app_config.data_dir / "hirelab_reddit.sqlite", compression=app_config.body_compression)
     
     # Check Reddit configuration
     if not reddit_config.is_configured:
@@ -43,70 +43,28 @@ def main():
     
     # Step 1: Fetch posts
     print("\n📥 Fetching posts from Reddit...")
-    stats = fetch_posts(
-        reddit_config=reddit_config,
-        app_config=app_config,
-        db=db,
-        subreddits=DEFAULT_SUBREDDITS,
-        verbose=True,
-    )
+    with perf.record_run("fetch", app_config):
+        stats = fetch_posts(
+            reddit_config=reddit_config,
+            app_config=app_config,
+            db=db,
+            subreddits=DEFAULT_SUBREDDITS,
+            verbose=True,
+        )
     
-    # Step 2: Get high-intent posts that need processing
-    print("\n🎯 Finding high-intent posts...")
-    posts = db.get_posts_by_status(
-        statuses=[PostStatus.NEW, PostStatus.QUEUED],
-        min_score=app_config.intent_score_threshold,
-        limit=20,
-    )
-    
-    if not posts:
-        print("No new high-intent posts found.")
+    # Steps 2-5: Draft, send to Slack, write to Sheets/CSV
+    with perf.record_run("digest", app_config):
+        processed = notify_high_intent_posts(
+            db,
+            slack_config,
+            sheets_config,
+            openai_config,
+            app_config,
+            cache=create_draft_cache(db, app_config),
+        )
+    if not processed:
         return
     
-    print(f"Found {len(posts)} posts above threshold")
-    
-    # Step 3: Generate drafts
-    print("\n✍️ Generating draft replies...")
-    for post in posts:
-        if not post.draft_a:
-            draft_a, draft_b = generate_drafts(post, openai_config)
-            post.draft_a = draft_a
-            post.draft_b = draft_b
-            db.save_post(post)
-            db.save_action(Action(
-                reddit_id=post.reddit_id,
-                action_type=ActionType.DRAFTED,
-            ))
-            print(f"  ✓ Generated drafts for {post.reddit_id}")
-    
-    # Step 4: Send to Slack
-    if slack_config.is_configured:
-        print("\n📤 Sending to Slack...")
-        if send_to_slack(posts, slack_config):
-            for post in posts:
-                db.update_status(post.reddit_id, PostStatus.SENT)
-                db.save_action(Action(
-                    reddit_id=post.reddit_id,
-                    action_type=ActionType.SENT_TO_SLACK,
-                ))
-            print("  ✓ Sent to Slack")
-        else:
-            print("  ✗ Failed to send to Slack")
-    else:
-        print("\n⚠ Slack not configured, printing to console...")
-        print_to_console(posts)
-    
-    # Step 5: Write to Sheets/CSV
-    csv_path = app_config.data_dir / "queue.csv"
-    print("\n📝 Writing to Sheets/CSV...")
-    if write_to_sheets(posts, sheets_config, csv_path):
-        for post in posts:
-            db.save_action(Action(
-                reddit_id=post.reddit_id,
-                action_type=ActionType.WRITTEN_TO_SHEETS,
-            ))
-        print("  ✓ Written to Sheets/CSV")
-    
     print("\n✅ Done!")
     print("=" * 50)
 
@@ -1,4 +1,11 @@
-"""Command-line interface for the Reddit HireLab Listener."""
+"""
+Command-line interface for the Reddit HireLab Listener.
+
+Only lightweight modules are imported at the top of this file; each command
+imports what it needs (Reddit clients, drafting, outputs) in its body, so
+quick commands like mark-replied start without loading praw, requests or
+numpy. scripts/check_import_time.py guards this.
+"""
 
 import click
 from pathlib import Path
@@ -6,20 +13,21 @@ from datetime import datetime
 
 from rich.console import Console
 
+from . import perf
 from .config import load_config, DEFAULT_SUBREDDITS
 from .store import Database, PostStatus, Action, ActionType
-from .fetch import fetch_posts
-from .drafts import generate_drafts
-from .outputs import send_to_slack, write_to_sheets, print_to_console
-from .outputs.console import print_stats, print_post_list
 
 console = Console()
 
 
-def get_db() -> Database:
+def get_db(auto_migrate: bool = True) -> Database:
     """Get database instance."""
     _, _, _, _, app_config = load_config()
-    return Database(app_config.data_dir / "hirelab_reddit.sqlite")
+    return Database(
+        app_config.data_dir / "hirelab_reddit.sqlite",
+        auto_migrate=auto_migrate,
+        compression=app_config.body_compression,
+    )
 
 
 @click.group()
@@ -31,25 +39,36 @@ def cli():
 
 @cli.command()
 @click.option("--subreddits", "-s", multiple=True, help="Specific subreddits to fetch (can be repeated)")
+@click.option("--workers", "-w", default=None, type=int, help="Subreddits to fetch in parallel (default: from config)")
+@click.option("--async/--no-async", "use_async", default=None, help="Fetch on one asyncio event loop (default: from config)")
+@click.option("--full-refresh", is_flag=True, help="Ignore fetch cursors and re-read the whole lookback window")
 @click.option("--verbose/--quiet", "-v/-q", default=True, help="Show progress output")
-def fetch(subreddits: tuple, verbose: bool):
+def fetch(subreddits: tuple, workers: int, use_async: bool, full_refresh: bool, verbose: bool):
     """Fetch posts from Reddit, score them, and store in database."""
+    from .fetch import fetch_posts
+    
     reddit_config, _, _, _, app_config = load_config()
     db = get_db()
     
     subs = list(subreddits) if subreddits else DEFAULT_SUBREDDITS
+    if workers is not None:
+        app_config.fetch_workers = workers
+    if use_async is not None:
+        app_config.fetch_async = use_async
     
     if not reddit_config.is_configured:
         console.print("[yellow]⚠ Reddit API not configured - running in dry-run mode[/yellow]")
         app_config.dry_run = True
     
-    stats = fetch_posts(
-        reddit_config=reddit_config,
-        app_config=app_config,
-        db=db,
-        subreddits=subs,
-        verbose=verbose,
-    )
+    with perf.record_run("fetch", app_config):
+        stats = fetch_posts(
+            reddit_config=reddit_config,
+            app_config=app_config,
+            db=db,
+            subreddits=subs,
+            verbose=verbose,
+            full_refresh=full_refresh,
+        )
     
     if verbose:
         console.print("\n[bold green]✓ Fetch complete![/bold green]")
@@ -63,64 +82,80 @@ def fetch(subreddits: tuple, verbose: bool):
 @click.option("--generate-drafts/--no-drafts", "gen_drafts", default=True, help="Generate reply drafts")
 def digest(min_score: float, limit: int, slack: bool, sheets: bool, gen_drafts: bool):
     """Generate and send digest of high-intent posts."""
+    from .drafts import generate_drafts_batch
+    from .outputs import print_to_console, send_to_slack, write_to_sheets
+    from .store import create_draft_cache
+    
     reddit_config, slack_config, sheets_config, openai_config, app_config = load_config()
     db = get_db()
     
     threshold = min_score if min_score is not None else app_config.intent_score_threshold
     
-    # Get posts that are NEW or QUEUED and haven't been sent yet
-    posts = db.get_posts_by_status(
-        statuses=[PostStatus.NEW, PostStatus.QUEUED],
-        min_score=threshold,
-        limit=limit,
-    )
-    
-    if not posts:
-        console.print("[yellow]No new high-intent posts found.[/yellow]")
-        return
-    
-    console.print(f"\n[bold]Found {len(posts)} posts above threshold ({threshold})[/bold]\n")
-    
-    # Generate drafts if requested
-    if gen_drafts:
-        console.print("[dim]Generating drafts...[/dim]")
-        for post in posts:
-            if not post.draft_a:
-                draft_a, draft_b = generate_drafts(post, openai_config)
+    with perf.record_run("digest", app_config):
+        # Get posts that are NEW or QUEUED and haven't been sent yet
+        posts = db.get_posts_by_status(
+            statuses=[PostStatus.NEW, PostStatus.QUEUED],
+            min_score=threshold,
+            limit=limit,
+        )
+        
+        if not posts:
+            console.print("[yellow]No new high-intent posts found.[/yellow]")
+            return
+        
+        console.print(f"\n[bold]Found {len(posts)} posts above threshold ({threshold})[/bold]\n")
+        
+        # Generate drafts if requested
+        if gen_drafts:
+            console.print("[dim]Generating drafts...[/dim]")
+            
+            def save_drafts(post, draft_a: str, draft_b: str) -> None:
                 post.draft_a = draft_a
                 post.draft_b = draft_b
-                db.save_post(post)
-                db.save_action(Action(
-                    reddit_id=post.reddit_id,
-                    action_type=ActionType.DRAFTED,
-                ))
-    
-    # Always print to console
-    print_to_console(posts, show_drafts=gen_drafts)
-    
-    # Send to Slack if configured and requested
-    if slack and slack_config.is_configured:
-        console.print("[dim]Sending to Slack...[/dim]")
-        if send_to_slack(posts, slack_config):
-            for post in posts:
-                db.update_status(post.reddit_id, PostStatus.SENT)
-                db.save_action(Action(
-                    reddit_id=post.reddit_id,
-                    action_type=ActionType.SENT_TO_SLACK,
-                ))
-            console.print("[green]✓ Sent to Slack[/green]")
-    
-    # Write to Sheets if configured and requested
-    if sheets:
-        csv_fallback = app_config.data_dir / "queue.csv"
-        console.print("[dim]Writing to Sheets/CSV...[/dim]")
-        if write_to_sheets(posts, sheets_config, csv_fallback):
-            for post in posts:
-                db.save_action(Action(
-                    reddit_id=post.reddit_id,
-                    action_type=ActionType.WRITTEN_TO_SHEETS,
-                ))
-            console.print("[green]✓ Written to Sheets/CSV[/green]")
+                with db.transaction():
+                    db.save_post(post)
+                    db.save_action(Action(
+                        reddit_id=post.reddit_id,
+                        action_type=ActionType.DRAFTED,
+                    ))
+            
+            cache = create_draft_cache(db, app_config)
+            generate_drafts_batch(
+                [post for post in posts if not post.draft_a],
+                openai_config,
+                on_result=save_drafts,
+                cache=cache,
+                on_draft_a=lambda post, _: console.print(f"[dim]  Draft A ready for {post.reddit_id}[/dim]"),
+            )
+            if cache and (cache.hits or cache.misses):
+                console.print(f"[dim]Draft cache: {cache.hits} hits, {cache.misses} misses[/dim]")
+        
+        # Always print to console
+        print_to_console(posts, show_drafts=gen_drafts)
+        
+        # Send to Slack if configured and requested
+        if slack and slack_config.is_configured:
+            console.print("[dim]Sending to Slack...[/dim]")
+            if send_to_slack(posts, slack_config):
+                for post in posts:
+                    db.update_status(post.reddit_id, PostStatus.SENT)
+                    db.save_action(Action(
+                        reddit_id=post.reddit_id,
+                        action_type=ActionType.SENT_TO_SLACK,
+                    ))
+                console.print("[green]✓ Sent to Slack[/green]")
+        
+        # Write to Sheets if configured and requested
+        if sheets:
+            csv_fallback = app_config.data_dir / "queue.csv"
+            console.print("[dim]Writing to Sheets/CSV...[/dim]")
+            if write_to_sheets(posts, sheets_config, csv_fallback):
+                for post in posts:
+                    db.save_action(Action(
+                        reddit_id=post.reddit_id,
+                        action_type=ActionType.WRITTEN_TO_SHEETS,
+                    ))
+                console.print("[green]✓ Written to Sheets/CSV[/green]")
 
 
 @cli.command("mark-replied")
@@ -174,10 +209,12 @@ def mark_skipped(reddit_id: str, notes: str):
 @click.option("--limit", "-l", default=50, help="Maximum posts to show")
 def list_posts(status: tuple, min_score: float, limit: int):
     """List posts from the database."""
+    from .outputs.console import print_post_list
+    
     db = get_db()
     
     statuses = [PostStatus(s) for s in status]
-    posts = db.get_posts_by_status(
+    posts = db.get_post_summaries(
         statuses=statuses,
         min_score=min_score,
         limit=limit,
@@ -191,18 +228,169 @@ def list_posts(status: tuple, min_score: float, limit: int):
 
 
 @cli.command()
-def stats():
+@click.argument("query", nargs=-1, required=True)
+@click.option("--status", "-s", type=click.Choice(["NEW", "QUEUED", "SENT", "REPLIED", "SKIPPED", "DUPLICATE"]),
+              multiple=True, help="Only posts with this status (can be repeated)")
+@click.option("--subreddit", "-r", multiple=True, help="Only posts from this subreddit (can be repeated)")
+@click.option("--min-score", "-m", type=float, default=None, help="Minimum intent score")
+@click.option("--days", "-d", type=int, default=None, help="Only posts created in the last N days")
+@click.option("--page", "-p", default=1, type=click.IntRange(min=1), help="Page of results to show")
+@click.option("--per-page", "-l", default=20, type=click.IntRange(min=1), help="Results per page")
+@click.option("--raw", is_flag=True, help="Pass the query to FTS5 as is (OR, NOT, NEAR, \"phrases\", prefix*)")
+def search(query: tuple, status: tuple, subreddit: tuple, min_score: float, days: int,
+           page: int, per_page: int, raw: bool):
+    """Search post titles and bodies, best matches first.
+    
+    By default every word must match; end a word with * to match it as a
+    prefix (resum* finds resume and resumes).
+    """
+    import sqlite3
+    from datetime import timedelta
+    
+    from .outputs.console import print_search_results
+    from .store import fts_query
+    
+    text = " ".join(query)
+    match = text if raw else fts_query(text)
+    if not match:
+        console.print("[red]✗ Empty search query[/red]")
+        raise SystemExit(1)
+    
+    db = get_db()
+    since = datetime.utcnow() - timedelta(days=days) if days is not None else None
+    try:
+        # One extra hit tells whether there is a next page
+        hits = db.search_posts(
+            match,
+            statuses=[PostStatus(s) for s in status],
+            subreddits=[s.removeprefix("r/") for s in subreddit],
+            min_score=min_score,
+            since=since,
+            limit=per_page + 1,
+            offset=(page - 1) * per_page,
+        )
+    except RuntimeError as e:
+        console.print(f"[red]✗ {e}[/red]")
+        raise SystemExit(1)
+    except sqlite3.OperationalError as e:
+        console.print(f"[red]✗ Invalid search query: {e}[/red]")
+        raise SystemExit(1)
+    
+    if not hits:
+        console.print("[yellow]No posts found matching the search.[/yellow]")
+        return
+    
+    print_search_results(hits[:per_page], text, page, has_more=len(hits) > per_page)
+
+
+@cli.command()
+@click.option("--perf", "show_perf", is_flag=True, help="Show where the time of recent runs went")
+@click.option("--runs", "-n", default=5, help="Recent runs to show with --perf")
+@click.option("--run", "run_name", type=click.Choice(["fetch", "digest", "daily_digest"]), default=None,
+              help="Only show runs of this job with --perf")
+def stats(show_perf: bool, runs: int, run_name: str):
     """Show database statistics."""
+    from .outputs.console import print_perf_runs, print_stats
+    from .store import create_draft_cache
+    
+    _, _, _, _, app_config = load_config()
+    if show_perf:
+        print_perf_runs(perf.load_runs(app_config, limit=runs, name=run_name))
+        return
+    
     db = get_db()
     db_stats = db.get_stats()
+    cache = create_draft_cache(db, app_config)
+    if cache:
+        db_stats["draft_cache"] = cache.stats()
     print_stats(db_stats)
 
 
+@cli.command()
+@click.option("--threshold", "-t", default=None, type=float, help="Intent score threshold (default: from config)")
+@click.option("--update-status/--keep-status", default=False, help="Move NEW/QUEUED posts to match the threshold")
+@click.option("--chunk-size", default=5000, help="Posts read and written per batch")
+@click.option("--workers", "-w", default=None, type=int, help="Scoring processes (default: CPU count)")
+def rescore(threshold: float, update_status: bool, chunk_size: int, workers: int):
+    """Recompute intent scores of stored posts after keyword or weight changes."""
+    from rich.progress import BarColumn, Progress, TextColumn
+    
+    from .rescore import rescore_posts
+    
+    _, _, _, _, app_config = load_config()
+    db = get_db()
+    
+    threshold = threshold if threshold is not None else app_config.intent_score_threshold
+    total = db.count_posts()
+    
+    with Progress(
+        TextColumn("[progress.description]{task.description}"),
+        BarColumn(),
+        TextColumn("{task.completed}/{task.total}"),
+        console=console,
+    ) as progress:
+        task = progress.add_task("Rescoring posts", total=total)
+        stats = rescore_posts(
+            db,
+            threshold=threshold,
+            update_status=update_status,
+            chunk_size=chunk_size,
+            workers=workers,
+            on_progress=lambda n: progress.advance(task, n),
+        )
+    
+    console.print(f"\n[green]✓[/green] Rescored {stats['scanned']} posts in {stats['elapsed_seconds']}s "
+                  f"({stats['rows_per_second']:.0f} rows/sec)")
+    console.print(f"  • Updated: {stats['updated']}")
+    if update_status:
+        console.print(f"  • Status changed: {stats['status_changed']}")
+
+
+@cli.command()
+@click.option("--status", "show_status", is_flag=True, help="Only show the schema version and pending migrations")
+@click.option("--chunk-size", default=2000, help="Rows copied per transaction when a table is rebuilt")
+@click.option("--pause", default=0.05, help="Seconds between those transactions, to let fetches write")
+def migrate(show_status: bool, chunk_size: int, pause: float):
+    """Apply pending database schema migrations.
+    
+    Every command migrates the database when it opens it; run this after
+    upgrading to do it up front, with progress, before cron picks it up.
+    """
+    db = get_db(auto_migrate=False)
+    pending = db.pending_migrations()
+    console.print(f"Schema version {db.schema_version()}, {len(pending)} migrations pending")
+    for migration in pending:
+        console.print(f"  [cyan]{migration.version}[/cyan] {migration.description}")
+    if show_status or not pending:
+        return
+    
+    applied = db.migrate(chunk_size=chunk_size, pause=pause, verbose=True)
+    console.print(f"[green]✓ Applied {len(applied)} migrations, schema version {db.schema_version()}[/green]")
+
+
+@cli.command("compress-bodies")
+@click.option("--chunk-size", default=2000, help="Posts rewritten per transaction")
+def compress_bodies(chunk_size: int):
+    """Rewrite stored post bodies and drafts with BODY_COMPRESSION.
+    
+    New posts are stored with the configured codec as they are written; this
+    converts the ones stored before it was set (or changed).
+    """
+    db = get_db()
+    console.print(f"Compressing post bodies and drafts with {db.compression}...")
+    rewritten = db.recompress_bodies(chunk_size=chunk_size)
+    console.print(f"[green]✓ Rewrote {rewritten} posts[/green]")
+    if rewritten:
+        console.print("[dim]Run VACUUM on the database to return the freed space to the filesystem.[/dim]")
+
+
 @cli.command()
 @click.argument("reddit_id")
 @click.option("--show-drafts/--no-drafts", default=True, help="Show draft replies")
 def show(reddit_id: str, show_drafts: bool):
     """Show details for a specific post."""
+    from .outputs import print_to_console
+    
     db = get_db()
     
     post = db.get_post(reddit_id)
@@ -224,9 +412,15 @@ def show(reddit_id: str, show_drafts: bool):
 
 @cli.command()
 @click.argument("reddit_id")
-def regenerate(reddit_id: str):
+@click.option("--cache/--no-cache", "use_cache", default=True, help="Reuse cached drafts for an identical prompt")
+def regenerate(reddit_id: str, use_cache: bool):
     """Regenerate drafts for a specific post."""
-    _, _, _, openai_config, _ = load_config()
+    from .drafts import generate_drafts
+    from .outputs import print_to_console
+    from .outputs.console import print_draft_a, print_draft_b
+    from .store import create_draft_cache
+    
+    _, _, _, openai_config, app_config = load_config()
     db = get_db()
     
     post = db.get_post(reddit_id)
@@ -235,7 +429,14 @@ def regenerate(reddit_id: str):
         return
     
     console.print("[dim]Regenerating drafts...[/dim]")
-    draft_a, draft_b = generate_drafts(post, openai_config)
+    cache = create_draft_cache(db, app_config) if use_cache else None
+    streamed = []
+    
+    def show_draft_a(draft: str) -> None:
+        streamed.append(draft)
+        print_draft_a(draft, "Draft A ready (Draft B still generating):")
+    
+    draft_a, draft_b = generate_drafts(post, openai_config, cache=cache, on_draft_a=show_draft_a)
     post.draft_a = draft_a
     post.draft_b = draft_b
     db.save_post(post)
@@ -246,7 +447,101 @@ def regenerate(reddit_id: str):
     ))
     
     console.print("[green]✓ Drafts regenerated[/green]\n")
-    print_to_console([post], show_drafts=True)
+    if streamed == [draft_a]:
+        # Draft A is already on screen; a template fallback would differ from it
+        if draft_b and post.mention_allowed and draft_b != draft_a:
+            print_draft_b(draft_b)
+    else:
+        print_to_console([post], show_drafts=True)
+
+
+@cli.command()
+@click.option("--fetch-interval", default=None, type=int, help="Minutes between fetches (default: from config)")
+@click.option("--digest-interval", default=None, type=int, help="Minutes between digests (default: from config)")
+@click.option("--daily-digest-at", default=None, help="HH:MM for the daily digest, in TIMEZONE (default: from config)")
+def serve(fetch_interval: int, digest_interval: int, daily_digest_at: str):
+    """Run fetch, digest and daily-digest jobs in one long-lived process."""
+    import logging
+    
+    from .daemon import ListenerDaemon
+    
+    reddit_config, slack_config, sheets_config, openai_config, app_config = load_config()
+    if fetch_interval is not None:
+        app_config.fetch_interval_minutes = fetch_interval
+    if digest_interval is not None:
+        app_config.digest_interval_minutes = digest_interval
+    if daily_digest_at is not None:
+        app_config.daily_digest_time = daily_digest_at
+    
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    
+    console.print("[bold blue]Starting HireLab listener daemon[/bold blue] (Ctrl+C to stop)")
+    daemon = ListenerDaemon(reddit_config, slack_config, sheets_config, openai_config, app_config)
+    daemon.serve()
+    console.print("[green]✓ Stopped[/green]")
+
+
+@cli.group()
+def drafts():
+    """Draft replies offline through the OpenAI Batch API."""
+    pass
+
+
+@drafts.command("submit")
+@click.option("--limit", "-l", default=None, type=int, help="Maximum posts in the batch")
+def drafts_submit(limit: int):
+    """Submit one batch job drafting every QUEUED post without drafts."""
+    from .drafts.batch import submit_draft_batch
+    
+    _, _, _, openai_config, _ = load_config()
+    if not openai_config.is_configured:
+        console.print("[yellow]OpenAI not configured; set OPENAI_API_KEY to use batch drafting[/yellow]")
+        return
+    db = get_db()
+    
+    batch = submit_draft_batch(db, openai_config, limit=limit)
+    if not batch:
+        console.print("[yellow]No posts need drafts.[/yellow]")
+        return
+    
+    console.print(f"[green]✓[/green] Submitted batch {batch.batch_id} with {len(batch.reddit_ids)} posts")
+    console.print("[dim]Run 'hirelab drafts collect' later to store the drafts.[/dim]")
+
+
+@drafts.command("collect")
+@click.option("--wait", is_flag=True, help="Keep polling until every batch has finished")
+@click.option("--poll-interval", default=60, help="Seconds between polls with --wait")
+def drafts_collect(wait: bool, poll_interval: int):
+    """Store the drafts of finished batch jobs."""
+    import time
+    
+    from .drafts.batch import collect_draft_batches
+    from .store import create_draft_cache
+    
+    _, _, _, openai_config, app_config = load_config()
+    if not openai_config.is_configured:
+        console.print("[yellow]OpenAI not configured; set OPENAI_API_KEY to use batch drafting[/yellow]")
+        return
+    db = get_db()
+    cache = create_draft_cache(db, app_config)
+    
+    while True:
+        stats = collect_draft_batches(db, openai_config, cache=cache)
+        if not wait or not stats["pending"]:
+            break
+        console.print(f"[dim]{stats['pending']} batches still running, checking again in {poll_interval}s...[/dim]")
+        time.sleep(poll_interval)
+    
+    if not stats["checked"]:
+        console.print("[yellow]No batches waiting to be collected.[/yellow]")
+        return
+    
+    console.print(f"[green]✓[/green] Collected {stats['collected']} of {stats['checked']} batches")
+    console.print(f"  • Drafted: {stats['drafted']}")
+    if stats["failed"]:
+        console.print(f"  • Failed (left for the next run): {stats['failed']}")
+    if stats["pending"]:
+        console.print(f"  • Still running: {stats['pending']}")
 
 
 if __name__ == "__main__":
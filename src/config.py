@@ -17,6 +17,7 @@ class RedditConfig:
     client_id: str = ""
     client_secret: str = ""
     user_agent: str = "hirelab-listener:v1 (by /u/yourusername)"
+    requests_per_minute: float = 100
     
     @property
     def is_configured(self) -> bool:
@@ -49,6 +50,9 @@ class OpenAIConfig:
     """OpenAI API configuration."""
     api_key: str = ""
     model: str = "gpt-4o-mini"
+    base_url: str = ""
+    max_concurrency: int = 8
+    timeout: float = 60.0
     
     @property
     def is_configured(self) -> bool:
@@ -62,6 +66,16 @@ class AppConfig:
     intent_score_threshold: int = 55
     fetch_hours_lookback: int = 72
     posts_per_subreddit: int = 25
+    fetch_workers: int = 1
+    fetch_async: bool = False
+    draft_cache_ttl_hours: int = 168
+    draft_cache_max_entries: int = 5000
+    fetch_interval_minutes: int = 30
+    digest_interval_minutes: int = 30
+    daily_digest_time: str = "09:00"
+    perf_metrics: bool = True
+    perf_prometheus_textfile: str = ""
+    body_compression: str = "none"
     dry_run: bool = False
     data_dir: Path = field(default_factory=lambda: Path(__file__).parent.parent / "data")
     
@@ -173,6 +187,7 @@ def load_config() -> tuple[RedditConfig, SlackConfig, SheetsConfig, OpenAIConfig
         client_id=os.getenv("REDDIT_CLIENT_ID", ""),
         client_secret=os.getenv("REDDIT_CLIENT_SECRET", ""),
         user_agent=os.getenv("REDDIT_USER_AGENT", "hirelab-listener:v1 (by /u/yourusername)"),
+        requests_per_minute=float(os.getenv("REDDIT_REQUESTS_PER_MINUTE", "100")),
     )
     
     slack = SlackConfig(
@@ -187,6 +202,9 @@ def load_config() -> tuple[RedditConfig, SlackConfig, SheetsConfig, OpenAIConfig
     openai = OpenAIConfig(
         api_key=os.getenv("OPENAI_API_KEY", ""),
         model=os.getenv("OPENAI_MODEL", "gpt-4o-mini"),
+        base_url=os.getenv("OPENAI_BASE_URL", ""),
+        max_concurrency=int(os.getenv("OPENAI_MAX_CONCURRENCY", "8")),
+        timeout=float(os.getenv("OPENAI_TIMEOUT", "60")),
     )
     
     app = AppConfig(
@@ -194,6 +212,16 @@ def load_config() -> tuple[RedditConfig, SlackConfig, SheetsConfig, OpenAIConfig
         intent_score_threshold=int(os.getenv("INTENT_SCORE_THRESHOLD", "55")),
         fetch_hours_lookback=int(os.getenv("FETCH_HOURS_LOOKBACK", "72")),
         posts_per_subreddit=int(os.getenv("POSTS_PER_SUBREDDIT", "25")),
+        fetch_workers=int(os.getenv("FETCH_WORKERS", "1")),
+        fetch_async=os.getenv("FETCH_ASYNC", "false").lower() == "true",
+        draft_cache_ttl_hours=int(os.getenv("DRAFT_CACHE_TTL_HOURS", "168")),
+        draft_cache_max_entries=int(os.getenv("DRAFT_CACHE_MAX_ENTRIES", "5000")),
+        fetch_interval_minutes=int(os.getenv("FETCH_INTERVAL_MINUTES", "30")),
+        digest_interval_minutes=int(os.getenv("DIGEST_INTERVAL_MINUTES", "30")),
+        daily_digest_time=os.getenv("DAILY_DIGEST_TIME", "09:00"),
+        perf_metrics=os.getenv("PERF_METRICS", "true").lower() == "true",
+        perf_prometheus_textfile=os.getenv("PERF_PROMETHEUS_TEXTFILE", ""),
+        body_compression=os.getenv("BODY_COMPRESSION", "none").lower(),
         dry_run=os.getenv("DRY_RUN", "false").lower() == "true",
     )
     
@@ -0,0 +1,181 @@
+"""Long-running scheduler process behind `hirelab serve`."""
+
+import signal
+import threading
+from datetime import datetime, timedelta
+
+from apscheduler.executors.pool import ThreadPoolExecutor
+from apscheduler.schedulers.background import BackgroundScheduler
+from apscheduler.triggers.cron import CronTrigger
+from apscheduler.triggers.interval import IntervalTrigger
+
+from . import perf
+from .config import AppConfig, OpenAIConfig, RedditConfig, SheetsConfig, SlackConfig, DEFAULT_SUBREDDITS
+from .drafts import get_engine
+from .fetch import create_reddit_client, fetch_posts
+from .scoring import get_keyword_matcher
+from .store import Database, create_draft_cache
+from .workflows import notify_high_intent_posts, send_daily_digest
+
+# First digest run after startup, so it follows the fetch that starts immediately
+DIGEST_START_DELAY = timedelta(minutes=5)
+
+
+class ListenerDaemon:
+    """
+    Runs the fetch, digest and daily-digest jobs on a schedule in one process.
+    
+    Everything expensive is built once and reused by every run: the database
+    connections, the Reddit client (PRAW session and shared rate limiter),
+    the OpenAI client, the draft cache and the compiled keyword matcher.
+    
+    Each job runs at most one instance at a time; if a run is still going
+    when the next one is due, the due run is skipped (missed runs are
+    coalesced into one). Fetch and digest also take a shared lock, so a
+    digest never reads a fetch that is halfway stored.
+    """
+    
+    def __init__(
+        self,
+        reddit_config: RedditConfig,
+        slack_config: SlackConfig,
+        sheets_config: SheetsConfig,
+        openai_config: OpenAIConfig,
+        app_config: AppConfig,
+    ):
+        """
+        Build the long-lived state and the schedule.
+        
+        Args:
+            reddit_config: Reddit API configuration
+            slack_config: Slack configuration
+            sheets_config: Google Sheets configuration
+            openai_config: OpenAI API configuration
+            app_config: Application settings, including the job schedule
+        """
+        self.reddit_config = reddit_config
+        self.slack_config = slack_config
+        self.sheets_config = sheets_config
+        self.openai_config = openai_config
+        self.app_config = app_config
+        
+        if not reddit_config.is_configured:
+            print("[WARN] Reddit API not configured, fetching from fixtures (dry-run mode)")
+            app_config.dry_run = True
+        
+        self.db = Database(app_config.data_dir / "hirelab_reddit.sqlite", compression=app_config.body_compression)
+        self.reddit_client = create_reddit_client(reddit_config, app_config)
+        self.draft_engine = get_engine(openai_config)
+        self.draft_cache = create_draft_cache(self.db, app_config)
+        self._pipeline_lock = threading.Lock()
+        # Set by the signal handler; serve() shuts the scheduler down on the main thread
+        self._stop_requested = threading.Event()
+        self._stop_signal = ""
+        
+        self.scheduler = BackgroundScheduler(
+            timezone=app_config.timezone,
+            executors={"default": ThreadPoolExecutor(max_workers=3)},
+            job_defaults={"max_instances": 1, "coalesce": True, "misfire_grace_time": 300},
+        )
+        self._add_jobs()
+    
+    def _add_jobs(self) -> None:
+        now = datetime.now(self.scheduler.timezone)
+        
+        self.scheduler.add_job(
+            self.run_fetch,
+            IntervalTrigger(minutes=self.app_config.fetch_interval_minutes),
+            id="fetch",
+            name="Fetch posts",
+            next_run_time=now,
+        )
+        self.scheduler.add_job(
+            self.run_digest,
+            IntervalTrigger(
+                minutes=self.app_config.digest_interval_minutes,
+                start_date=now + DIGEST_START_DELAY,
+            ),
+            id="digest",
+            name="Draft and notify",
+        )
+        
+        hour, minute = (int(part) for part in self.app_config.daily_digest_time.split(":"))
+        self.scheduler.add_job(
+            self.run_daily_digest,
+            CronTrigger(hour=hour, minute=minute),
+            id="daily_digest",
+            name="Daily digest",
+        )
+    
+    def warm_up(self) -> None:
+        """Build lazily created state up front, so the first runs do not pay for it."""
+        get_keyword_matcher()
+        if self.openai_config.is_configured:
+            self.draft_engine.client
+    
+    def run_fetch(self) -> dict:
+        """Fetch, score and store new posts."""
+        with self._pipeline_lock, perf.record_run("fetch", self.app_config):
+            stats = fetch_posts(
+                reddit_config=self.reddit_config,
+                app_config=self.app_config,
+                db=self.db,
+                subreddits=DEFAULT_SUBREDDITS,
+                verbose=False,
+                client=self.reddit_client,
+            )
+        print(f"[fetch] {stats['total_fetched']} fetched, {stats['new_posts']} new, "
+              f"{stats['duplicates']} duplicates, {stats['above_threshold']} above threshold")
+        return stats
+    
+    def run_digest(self) -> int:
+        """Draft replies for high-intent posts and send them out."""
+        with self._pipeline_lock, perf.record_run("digest", self.app_config):
+            return notify_high_intent_posts(
+                self.db,
+                self.slack_config,
+                self.sheets_config,
+                self.openai_config,
+                self.app_config,
+                cache=self.draft_cache,
+            )
+    
+    def run_daily_digest(self) -> bool:
+        """Send the daily digest."""
+        with perf.record_run("daily_digest", self.app_config):
+            return send_daily_digest(self.db, self.slack_config)
+    
+    def serve(self) -> None:
+        """
+        Run the scheduler until SIGINT or SIGTERM.
+        
+        On a signal no new runs start and the process exits once running jobs
+        have finished; a second signal exits immediately.
+        """
+        signal.signal(signal.SIGINT, self._handle_signal)
+        signal.signal(signal.SIGTERM, self._handle_signal)
+        
+        self.warm_up()
+        for job in self.scheduler.get_jobs():
+            print(f"Scheduled: {job.name} ({job.trigger})")
+        
+        try:
+            self.scheduler.start()
+            self._stop_requested.wait()
+            print(f"\nReceived {self._stop_signal}, waiting for running jobs to finish...")
+            self.scheduler.shutdown(wait=True)
+        finally:
+            self.close()
+    
+    def close(self) -> None:
+        """Release the database connections and the OpenAI connection pool."""
+        self.db.close()
+        self.draft_engine.close()
+    
+    def _handle_signal(self, signum, frame) -> None:
+        if self._stop_requested.is_set():
+            print("\nForced exit")
+            raise SystemExit(1)
+        
+        self._stop_signal = signal.Signals(signum).name
+        self._stop_requested.set()
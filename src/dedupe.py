@@ -2,9 +2,21 @@
 
 import hashlib
 import re
+import struct
 from typing import Optional
 
-from .store import Database
+from .store import Database, Post
+
+# Near-duplicate detection (MinHash over word shingles, banded LSH)
+SHINGLE_SIZE = 3
+MIN_SHINGLES = 5
+MINHASH_BINS = 64
+LSH_BANDS = 16
+LSH_ROWS = MINHASH_BINS // LSH_BANDS
+NEAR_DUPLICATE_THRESHOLD = 0.7
+
+_UINT64_MASK = (1 << 64) - 1
+_DENSIFY_STEP = 0x9E3779B97F4A7C15  # Keeps borrowed values distinct from real ones
 
 
 def normalize_for_hash(text: str) -> str:
@@ -74,3 +86,178 @@ def is_duplicate(
     
     return None
 
+
+def compute_minhash(title: str, selftext: str) -> Optional[tuple[int, ...]]:
+    """
+    Compute a MinHash signature for near-duplicate detection.
+    
+    Uses word shingles of the full normalized title and selftext (no
+    truncation, so edits anywhere in the post count). The fraction of equal
+    positions in two signatures estimates the Jaccard similarity of their
+    shingle sets.
+    
+    This is one-permutation MinHash: each shingle is hashed once and lands in
+    one of MINHASH_BINS bins, which keep their minimum. Empty bins borrow the
+    value of the next non-empty bin (offset by the distance), so the cost is
+    linear in the number of shingles rather than bins x shingles.
+    
+    Returns:
+        Signature of MINHASH_BINS values, or None if the post is too short for
+        a meaningful similarity
+    """
+    words = f"{normalize_for_hash(title)} {_normalize_full(selftext)}".split()
+    shingles = {" ".join(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1)}
+    if len(shingles) < MIN_SHINGLES:
+        return None
+    
+    bins: list[Optional[int]] = [None] * MINHASH_BINS
+    for shingle in shingles:
+        value = int.from_bytes(hashlib.blake2b(shingle.encode('utf-8'), digest_size=8).digest(), "little")
+        index, value = value % MINHASH_BINS, value // MINHASH_BINS
+        current = bins[index]
+        if current is None or value < current:
+            bins[index] = value
+    
+    # Densify: fill empty bins from the next non-empty bin to the right
+    signature = []
+    for index in range(MINHASH_BINS):
+        offset = 0
+        while bins[(index + offset) % MINHASH_BINS] is None:
+            offset += 1
+        value = bins[(index + offset) % MINHASH_BINS]
+        signature.append((value + offset * _DENSIFY_STEP) & _UINT64_MASK)
+    return tuple(signature)
+
+
+def minhash_buckets(signature: tuple[int, ...]) -> list[int]:
+    """
+    Compute the LSH bucket keys of a signature, one per band.
+    
+    Two posts share a bucket when all rows of one band are equal, which is
+    likely for similar posts and unlikely otherwise. Keys fit in a signed
+    64-bit SQLite integer, with the band number in the top bits.
+    """
+    buckets = []
+    for band in range(LSH_BANDS):
+        rows = signature[band * LSH_ROWS:(band + 1) * LSH_ROWS]
+        digest = hashlib.blake2b(struct.pack(f"<{LSH_ROWS}Q", *rows), digest_size=7).digest()
+        buckets.append((band << 56) | int.from_bytes(digest, "little"))
+    return buckets
+
+
+def minhash_similarity(a: tuple[int, ...], b: tuple[int, ...]) -> float:
+    """Estimate the Jaccard similarity of two posts from their signatures."""
+    return sum(1 for x, y in zip(a, b) if x == y) / len(a)
+
+
+def encode_minhash(signature: tuple[int, ...]) -> bytes:
+    """Pack a signature for storage."""
+    return struct.pack(f"<{len(signature)}Q", *signature)
+
+
+def decode_minhash(data: bytes) -> tuple[int, ...]:
+    """Unpack a stored signature."""
+    return struct.unpack(f"<{len(data) // 8}Q", data)
+
+
+def _normalize_full(text: str) -> str:
+    """Normalize text like normalize_for_hash, without truncating it."""
+    text = re.sub(r'[^\w\s]', '', text.lower())
+    return re.sub(r'\s+', ' ', text).strip()
+
+
+class DedupeIndex:
+    """
+    Duplicate checks for a whole fetch run.
+    
+    Stored posts are looked up a page at a time, with indexed IN (...)
+    queries on reddit_id and content_hash, so a run costs in proportion to
+    the posts it fetches rather than the size of the table. Posts recorded
+    during the run are also kept in memory, so cross-posts within the same
+    run (or the same page) are caught before they are written.
+    """
+    
+    def __init__(self, db: Database):
+        """Create an index backed by a database."""
+        self.db = db
+        # Posts recorded during this run, and the first post seen with each content hash
+        self._run_ids: set[str] = set()
+        self._run_hashes: dict[str, str] = {}
+        # Near-duplicate signatures added during this run, and their LSH buckets
+        self._run_signatures: dict[str, tuple[int, ...]] = {}
+        self._run_buckets: dict[int, list[str]] = {}
+    
+    def add(self, reddit_id: str, content_hash: str) -> None:
+        """Record a post that is being stored."""
+        self._run_ids.add(reddit_id)
+        self._run_hashes.setdefault(content_hash, reddit_id)
+    
+    def find_near_duplicate(
+        self,
+        reddit_id: str,
+        signature: tuple[int, ...],
+    ) -> Optional[tuple[str, float]]:
+        """
+        Find the most similar known post above NEAR_DUPLICATE_THRESHOLD.
+        
+        Only posts sharing an LSH bucket with the signature are compared, so
+        the cost depends on the number of candidates, not the table size.
+        
+        Returns:
+            Tuple of (reddit_id, estimated similarity), or None
+        """
+        buckets = minhash_buckets(signature)
+        candidates = {
+            candidate_id: decode_minhash(minhash)
+            for candidate_id, minhash in self.db.find_signature_candidates(buckets)
+        }
+        for bucket in buckets:
+            for candidate_id in self._run_buckets.get(bucket, ()):
+                candidates[candidate_id] = self._run_signatures[candidate_id]
+        candidates.pop(reddit_id, None)
+        
+        best = None
+        for candidate_id, candidate in candidates.items():
+            similarity = minhash_similarity(signature, candidate)
+            if similarity >= NEAR_DUPLICATE_THRESHOLD and (best is None or similarity > best[1]):
+                best = (candidate_id, similarity)
+        return best
+    
+    def add_signature(self, reddit_id: str, signature: tuple[int, ...]) -> None:
+        """Record the signature of a post that is being stored."""
+        self._run_signatures[reddit_id] = signature
+        for bucket in minhash_buckets(signature):
+            self._run_buckets.setdefault(bucket, []).append(reddit_id)
+    
+    def find_duplicates(self, posts: list[Post]) -> list[Optional[str]]:
+        """
+        Check a batch of posts and record the ones that will be stored.
+        
+        Same rules as is_duplicate. Posts that repeat an earlier post of the
+        batch (or of the run) are duplicates of it, so when a page lists a
+        post twice only the second copy is a duplicate.
+        
+        Args:
+            posts: Posts with content_hash already computed
+            
+        Returns:
+            For each post, in order, the reddit_id of the existing post it
+            duplicates, or None
+        """
+        stored_ids = self.db.find_existing_ids(
+            [post.reddit_id for post in posts if post.reddit_id not in self._run_ids]
+        )
+        stored_hashes = self.db.find_content_hashes(
+            [post.content_hash for post in posts if post.content_hash not in self._run_hashes]
+        )
+        
+        duplicates: list[Optional[str]] = []
+        for post in posts:
+            if post.reddit_id in self._run_ids or post.reddit_id in stored_ids:
+                duplicates.append(post.reddit_id)
+                continue
+            
+            existing_id = stored_hashes.get(post.content_hash) or self._run_hashes.get(post.content_hash)
+            duplicates.append(existing_id if existing_id != post.reddit_id else None)
+            self.add(post.reddit_id, post.content_hash)
+        return duplicates
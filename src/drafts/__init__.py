@@ -1,7 +1,30 @@
-"""Draft generation module."""
+"""
+Draft generation module.
 
-from .generator import generate_drafts
-from .prompt_templates import TEMPLATE_DRAFTS
+Submodules are imported on first attribute access (PEP 562), so commands
+that never draft do not load the generator.
+"""
 
-__all__ = ["generate_drafts", "TEMPLATE_DRAFTS"]
+import importlib
 
+_EXPORTS = {
+    "DraftEngine": ".generator",
+    "generate_drafts": ".generator",
+    "generate_drafts_batch": ".generator",
+    "get_engine": ".generator",
+    "TEMPLATE_DRAFTS": ".prompt_templates",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(list(globals()) + __all__)
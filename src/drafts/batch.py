@@ -0,0 +1,212 @@
+"""Offline draft generation through the OpenAI Batch API."""
+
+import io
+import json
+from datetime import datetime
+from typing import Optional
+
+from ..config import OpenAIConfig
+from ..store import Database, DraftBatch, DraftCache, Post, PostStatus, draft_cache_key
+from .generator import (
+    MAX_TOKENS,
+    TEMPERATURE,
+    DraftEngine,
+    _build_messages,
+    _parse_llm_response,
+    get_engine,
+)
+
+BATCH_ENDPOINT = "/v1/chat/completions"
+COMPLETION_WINDOW = "24h"
+
+# Batch states after which OpenAI does no more work (expired and cancelled
+# batches may still have an output file with the requests that finished)
+FINAL_STATUSES = ("completed", "failed", "expired", "cancelled")
+
+
+def build_batch_file(posts: list[Post], openai_config: OpenAIConfig) -> bytes:
+    """
+    Build the JSONL input file for a batch: one chat completion per post.
+    
+    Each request carries the post's reddit_id as custom_id, so results can
+    be matched back to posts in any order.
+    """
+    lines = []
+    for post in posts:
+        lines.append(json.dumps({
+            "custom_id": post.reddit_id,
+            "method": "POST",
+            "url": BATCH_ENDPOINT,
+            "body": {
+                "model": openai_config.model,
+                "messages": _build_messages(post),
+                "temperature": TEMPERATURE,
+                "max_tokens": MAX_TOKENS,
+            },
+        }, ensure_ascii=False))
+    return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+def parse_batch_output(content: str) -> dict[str, Optional[str]]:
+    """
+    Parse a batch output file.
+    
+    Returns:
+        Mapping of custom_id to the completion text, or None if that
+        request failed
+    """
+    results: dict[str, Optional[str]] = {}
+    for line in content.splitlines():
+        if not line.strip():
+            continue
+        record = json.loads(line)
+        response = record.get("response") or {}
+        text = None
+        if response.get("status_code") == 200:
+            try:
+                text = response["body"]["choices"][0]["message"]["content"]
+            except (KeyError, IndexError, TypeError):
+                text = None
+        results[record["custom_id"]] = text
+    return results
+
+
+def submit_draft_batch(
+    db: Database,
+    openai_config: OpenAIConfig,
+    statuses: Optional[list[PostStatus]] = None,
+    limit: Optional[int] = None,
+    engine: Optional[DraftEngine] = None,
+) -> Optional[DraftBatch]:
+    """
+    Submit one batch job drafting every post that still needs drafts.
+    
+    Posts already waiting in an uncollected batch are left out, so running
+    submit twice does not pay for the same post twice.
+    
+    Args:
+        db: Database instance
+        openai_config: OpenAI API configuration
+        statuses: Post statuses to draft (defaults to QUEUED)
+        limit: Maximum posts in the batch
+        engine: Engine whose client is used (defaults to the shared one)
+    
+    Returns:
+        The submitted batch, or None if there was nothing to draft
+    """
+    engine = engine or get_engine(openai_config)
+    pending = {
+        reddit_id
+        for batch in db.get_draft_batches(pending_only=True)
+        for reddit_id in batch.reddit_ids
+    }
+    # Fetch enough extra rows to still fill the batch after leaving out pending posts
+    posts = [
+        post for post in db.get_posts_without_drafts(
+            statuses or [PostStatus.QUEUED],
+            limit=limit + len(pending) if limit is not None else None,
+        )
+        if post.reddit_id not in pending
+    ][:limit]
+    if not posts:
+        return None
+    
+    filename = f"hirelab-drafts-{datetime.utcnow():%Y%m%d%H%M%S}.jsonl"
+    input_file = engine.client.files.create(
+        file=(filename, io.BytesIO(build_batch_file(posts, openai_config))),
+        purpose="batch",
+    )
+    remote = engine.client.batches.create(
+        input_file_id=input_file.id,
+        endpoint=BATCH_ENDPOINT,
+        completion_window=COMPLETION_WINDOW,
+    )
+    
+    batch = DraftBatch(
+        batch_id=remote.id,
+        input_file_id=input_file.id,
+        reddit_ids=[post.reddit_id for post in posts],
+        status=remote.status,
+    )
+    db.save_draft_batch(batch)
+    return batch
+
+
+def collect_draft_batches(
+    db: Database,
+    openai_config: OpenAIConfig,
+    cache: Optional[DraftCache] = None,
+    engine: Optional[DraftEngine] = None,
+) -> dict:
+    """
+    Check every uncollected batch and store the drafts of finished ones.
+    
+    All drafts of a batch are written in one transaction, skipping posts
+    that were drafted some other way in the meantime. Requests that failed
+    or could not be parsed are left without drafts, so the next submit or
+    digest picks them up again.
+    
+    Args:
+        db: Database instance
+        openai_config: OpenAI API configuration
+        cache: Draft cache to store the new drafts in
+        engine: Engine whose client is used (defaults to the shared one)
+    
+    Returns:
+        Dictionary with collection statistics
+    """
+    engine = engine or get_engine(openai_config)
+    stats = {"checked": 0, "pending": 0, "collected": 0, "drafted": 0, "failed": 0}
+    
+    for batch in db.get_draft_batches(pending_only=True):
+        stats["checked"] += 1
+        remote = engine.client.batches.retrieve(batch.batch_id)
+        batch.status = remote.status
+        batch.output_file_id = remote.output_file_id
+        
+        if remote.status not in FINAL_STATUSES:
+            stats["pending"] += 1
+            db.save_draft_batch(batch)
+            continue
+        
+        results: dict[str, Optional[str]] = {}
+        if remote.output_file_id:
+            results = parse_batch_output(engine.client.files.content(remote.output_file_id).text)
+        
+        drafts = []
+        for reddit_id in batch.reddit_ids:
+            draft_a, draft_b = _parse_llm_response(results.get(reddit_id) or "")
+            if draft_a and draft_b:
+                drafts.append((reddit_id, draft_a, draft_b))
+        
+        saved = db.save_drafts(drafts, notes=f"Batch {batch.batch_id}", overwrite=False)
+        if cache:
+            _cache_drafts(db, cache, openai_config, drafts)
+        
+        batch.collected_at = datetime.utcnow()
+        db.save_draft_batch(batch)
+        stats["collected"] += 1
+        stats["drafted"] += saved
+        stats["failed"] += len(batch.reddit_ids) - len(drafts)
+    
+    return stats
+
+
+def _cache_drafts(
+    db: Database,
+    cache: DraftCache,
+    openai_config: OpenAIConfig,
+    drafts: list[tuple[str, str, str]],
+) -> None:
+    """Store batch drafts under the same keys live generation looks up."""
+    for reddit_id, draft_a, draft_b in drafts:
+        post = db.get_post(reddit_id)
+        if post:
+            messages = _build_messages(post)
+            key = draft_cache_key(
+                openai_config.model,
+                messages[0]["content"],
+                messages[1]["content"],
+                TEMPERATURE,
+            )
+            cache.put(key, openai_config.model, draft_a, draft_b)
@@ -1,9 +1,14 @@
 """Draft generation using LLM or templates."""
 
+import contextvars
 import re
-from typing import Optional
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Optional
 
+from .. import perf
 from ..config import OpenAIConfig
+from ..store.cache import DraftCache, draft_cache_key
 from ..store.models import Post
 from .prompt_templates import (
     SYSTEM_PROMPT,
@@ -12,10 +17,196 @@ from .prompt_templates import (
     select_template,
 )
 
+# Sampling parameters for every draft request
+TEMPERATURE = 0.7
+MAX_TOKENS = 1500
+
+# Delimited drafts in the LLM response
+END_DRAFT_A = "---END_DRAFT_A---"
+_DRAFT_A_PATTERN = re.compile(r'---DRAFT_A---\s*(.*?)\s*---END_DRAFT_A---', re.DOTALL)
+_DRAFT_B_PATTERN = re.compile(r'---DRAFT_B---\s*(.*?)\s*---END_DRAFT_B---', re.DOTALL)
+
+
+class DraftEngine:
+    """
+    Generates drafts with one long-lived OpenAI client.
+    
+    The client, and with it the keep-alive connection pool, is created on
+    first use and reused for every draft in the process, including the
+    concurrent requests of generate_drafts_batch (the OpenAI client is
+    thread-safe). Pass a client to inject a preconfigured or fake one.
+    """
+    
+    def __init__(self, openai_config: OpenAIConfig, client=None):
+        """
+        Initialize the engine.
+        
+        Args:
+            openai_config: OpenAI API configuration
+            client: OpenAI client to use instead of building one from the config
+        """
+        self.openai_config = openai_config
+        self._client = client
+        self._lock = threading.Lock()
+    
+    @property
+    def client(self):
+        """The shared OpenAI client, created on first use."""
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    from openai import OpenAI
+                    
+                    self._client = OpenAI(
+                        api_key=self.openai_config.api_key,
+                        base_url=self.openai_config.base_url or None,
+                        timeout=self.openai_config.timeout,
+                    )
+        return self._client
+    
+    def generate(
+        self,
+        post: Post,
+        cache: Optional[DraftCache] = None,
+        on_draft_a: Optional[Callable[[str], None]] = None,
+    ) -> tuple[str, str]:
+        """
+        Generate (draft_a, draft_b) for a post, falling back to templates.
+        
+        With a cache, an answer to an identical prompt is reused instead of
+        calling the API, and fresh LLM answers are stored. Template drafts
+        are never cached.
+        
+        With on_draft_a, the completion is streamed and Draft A is handed
+        over as soon as its end marker arrives, while Draft B is still being
+        generated. If the full response later fails to parse, the returned
+        drafts are the template fallback, not the Draft A already delivered.
+        """
+        if not self.openai_config.is_configured:
+            perf.count("drafts.template")
+            return _generate_with_templates(post)
+        
+        messages = _build_messages(post)
+        key = None
+        if cache:
+            key = draft_cache_key(
+                self.openai_config.model,
+                messages[0]["content"],
+                messages[1]["content"],
+                TEMPERATURE,
+            )
+            with perf.timer("drafts.cache"):
+                cached = cache.get(key)
+            perf.count("drafts.cache_hits" if cached else "drafts.cache_misses")
+            if cached:
+                if on_draft_a:
+                    on_draft_a(cached[0])
+                return cached
+        
+        with perf.timer("drafts.llm"):
+            drafts = self._generate_with_llm(messages, on_draft_a)
+        perf.count("drafts.llm_calls")
+        if drafts is None:
+            perf.count("drafts.llm_failures")
+            perf.count("drafts.template")
+            return _generate_with_templates(post)
+        
+        if cache:
+            with perf.timer("drafts.cache"):
+                cache.put(key, self.openai_config.model, *drafts)
+        return drafts
+    
+    def close(self) -> None:
+        """Close the client's connection pool."""
+        if self._client is not None:
+            self._client.close()
+            self._client = None
+    
+    def _generate_with_llm(
+        self,
+        messages: list[dict],
+        on_draft_a: Optional[Callable[[str], None]] = None,
+    ) -> Optional[tuple[str, str]]:
+        """Generate drafts using OpenAI API; None if the call or parsing fails."""
+        try:
+            if on_draft_a:
+                content = self._stream_completion(messages, on_draft_a)
+            else:
+                response = self.client.chat.completions.create(
+                    model=self.openai_config.model,
+                    messages=messages,
+                    temperature=TEMPERATURE,
+                    max_tokens=MAX_TOKENS,
+                )
+                content = response.choices[0].message.content
+            
+            # Parse the response
+            draft_a, draft_b = _parse_llm_response(content)
+            
+            if draft_a and draft_b:
+                return draft_a, draft_b
+            else:
+                # Fallback to templates if parsing fails
+                print("[WARN] Failed to parse LLM response, falling back to templates")
+                return None
+        
+        except Exception as e:
+            print(f"[WARN] LLM generation failed: {e}, falling back to templates")
+            return None
+    
+    def _stream_completion(self, messages: list[dict], on_draft_a: Callable[[str], None]) -> str:
+        """Stream a completion, calling on_draft_a once Draft A is complete."""
+        stream = self.client.chat.completions.create(
+            model=self.openai_config.model,
+            messages=messages,
+            temperature=TEMPERATURE,
+            max_tokens=MAX_TOKENS,
+            stream=True,
+        )
+        
+        content = ""
+        draft_a_sent = False
+        for chunk in stream:
+            if not chunk.choices or not chunk.choices[0].delta.content:
+                continue
+            # Only the new text (plus room for a marker split across chunks) is searched
+            search_from = max(0, len(content) - len(END_DRAFT_A))
+            content += chunk.choices[0].delta.content
+            
+            if not draft_a_sent and END_DRAFT_A in content[search_from:]:
+                match = _DRAFT_A_PATTERN.search(content)
+                if match and match.group(1).strip():
+                    on_draft_a(match.group(1).strip())
+                draft_a_sent = True
+        
+        return content
+
+
+_engines: dict[tuple, DraftEngine] = {}
+_engines_lock = threading.Lock()
+
+
+def get_engine(openai_config: OpenAIConfig) -> DraftEngine:
+    """Return the process-wide engine for this OpenAI configuration."""
+    key = (
+        openai_config.api_key,
+        openai_config.base_url,
+        openai_config.model,
+        openai_config.timeout,
+    )
+    with _engines_lock:
+        engine = _engines.get(key)
+        if engine is None:
+            engine = _engines[key] = DraftEngine(openai_config)
+        return engine
+
 
 def generate_drafts(
     post: Post,
     openai_config: OpenAIConfig,
+    engine: Optional[DraftEngine] = None,
+    cache: Optional[DraftCache] = None,
+    on_draft_a: Optional[Callable[[str], None]] = None,
 ) -> tuple[str, str]:
     """
     Generate draft replies for a Reddit post.
@@ -23,58 +214,102 @@ def generate_drafts(
     Args:
         post: The Reddit post to generate drafts for
         openai_config: OpenAI API configuration
+        engine: Engine to use (defaults to the shared one for openai_config)
+        cache: Draft cache checked before calling the LLM
+        on_draft_a: Stream the LLM response and call this with Draft A as
+            soon as it is complete
         
     Returns:
         Tuple of (draft_a, draft_b)
     """
-    if openai_config.is_configured:
-        return _generate_with_llm(post, openai_config)
-    else:
-        return _generate_with_templates(post)
+    engine = engine or get_engine(openai_config)
+    try:
+        return engine.generate(post, cache, on_draft_a)
+    finally:
+        if cache:
+            cache.flush()
 
 
-def _generate_with_llm(
-    post: Post,
+def generate_drafts_batch(
+    posts: list[Post],
     openai_config: OpenAIConfig,
-) -> tuple[str, str]:
-    """Generate drafts using OpenAI API."""
+    on_result: Optional[Callable[[Post, str, str], None]] = None,
+    max_concurrency: Optional[int] = None,
+    engine: Optional[DraftEngine] = None,
+    cache: Optional[DraftCache] = None,
+    on_draft_a: Optional[Callable[[Post, str], None]] = None,
+) -> dict[str, tuple[str, str]]:
+    """
+    Generate draft replies for many posts concurrently.
+    
+    LLM calls run on a thread pool, each bounded by the configured request
+    timeout and falling back to templates on its own. on_result is called
+    on the calling thread as each post finishes (in completion order), so
+    callers can persist drafts without waiting for the whole batch.
+    
+    Args:
+        posts: Posts to generate drafts for
+        openai_config: OpenAI API configuration
+        on_result: Called with (post, draft_a, draft_b) as each post finishes
+        max_concurrency: Maximum requests in flight (defaults to the config)
+        engine: Engine to use (defaults to the shared one for openai_config)
+        cache: Draft cache checked before calling the LLM
+        on_draft_a: Stream the LLM responses and call this with (post, draft_a)
+            as soon as a post's Draft A is complete, on the thread drafting it
+    
+    Returns:
+        Mapping of reddit_id to (draft_a, draft_b)
+    """
+    engine = engine or get_engine(openai_config)
+    results: dict[str, tuple[str, str]] = {}
+    
+    def finish(post: Post, drafts: tuple[str, str]) -> None:
+        results[post.reddit_id] = drafts
+        if on_result:
+            on_result(post, *drafts)
+    
+    def draft_a_callback(post: Post) -> Optional[Callable[[str], None]]:
+        if on_draft_a is None:
+            return None
+        return lambda draft_a: on_draft_a(post, draft_a)
+    
+    workers = min(max_concurrency or openai_config.max_concurrency, len(posts))
     try:
-        from openai import OpenAI
-        
-        client = OpenAI(api_key=openai_config.api_key)
+        if not openai_config.is_configured or workers <= 1:
+            for post in posts:
+                finish(post, engine.generate(post, cache, draft_a_callback(post)))
+            return results
         
-        user_prompt = get_user_prompt(
-            subreddit=post.subreddit,
-            title=post.title,
-            selftext=post.selftext,
-            mention_allowed=post.mention_allowed,
-        )
-        
-        response = client.chat.completions.create(
-            model=openai_config.model,
-            messages=[
-                {"role": "system", "content": SYSTEM_PROMPT},
-                {"role": "user", "content": user_prompt},
-            ],
-            temperature=0.7,
-            max_tokens=1500,
-        )
-        
-        content = response.choices[0].message.content
-        
-        # Parse the response
-        draft_a, draft_b = _parse_llm_response(content)
-        
-        if draft_a and draft_b:
-            return draft_a, draft_b
-        else:
-            # Fallback to templates if parsing fails
-            print("[WARN] Failed to parse LLM response, falling back to templates")
-            return _generate_with_templates(post)
-            
-    except Exception as e:
-        print(f"[WARN] LLM generation failed: {e}, falling back to templates")
-        return _generate_with_templates(post)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            # Each worker runs in a copy of this context, so its timers go to this run
+            futures = {
+                executor.submit(
+                    contextvars.copy_context().run, engine.generate, post, cache, draft_a_callback(post)
+                ): post
+                for post in posts
+            }
+            for future in as_completed(futures):
+                finish(futures[future], future.result())
+    finally:
+        # Lookup statistics are written in batches; don't leave the last ones pending
+        if cache:
+            cache.flush()
+    
+    return results
+
+
+def _build_messages(post: Post) -> list[dict]:
+    """Build the chat messages for a post."""
+    user_prompt = get_user_prompt(
+        subreddit=post.subreddit,
+        title=post.title,
+        selftext=post.selftext,
+        mention_allowed=post.mention_allowed,
+    )
+    return [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": user_prompt},
+    ]
 
 
 def _parse_llm_response(content: str) -> tuple[Optional[str], Optional[str]]:
@@ -83,20 +318,12 @@ def _parse_llm_response(content: str) -> tuple[Optional[str], Optional[str]]:
     draft_b = None
     
     # Try to extract Draft A
-    match_a = re.search(
-        r'---DRAFT_A---\s*(.*?)\s*---END_DRAFT_A---',
-        content,
-        re.DOTALL
-    )
+    match_a = _DRAFT_A_PATTERN.search(content)
     if match_a:
         draft_a = match_a.group(1).strip()
     
     # Try to extract Draft B
-    match_b = re.search(
-        r'---DRAFT_B---\s*(.*?)\s*---END_DRAFT_B---',
-        content,
-        re.DOTALL
-    )
+    match_b = _DRAFT_B_PATTERN.search(content)
     if match_b:
         draft_b = match_b.group(1).strip()
     
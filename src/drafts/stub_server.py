@@ -0,0 +1,316 @@
+"""
+Local OpenAI-compatible stub server for exercising draft generation offline.
+
+Answers chat completions with canned drafts in the format the generator
+parses, so the LLM path (client reuse, concurrency, timeouts, fallbacks)
+can be run without an API key or network access. Streaming requests get
+the same text as server-sent event chunks, spread over the delay. Also
+implements enough of the Files and Batches endpoints for `hirelab drafts
+submit` / `collect`: a batch is reported in progress when created and
+completed on the next retrieve.
+
+Run standalone and point the app at it:
+    python -m src.drafts.stub_server --port 8765 --delay 0.5
+    OPENAI_API_KEY=stub OPENAI_BASE_URL=http://127.0.0.1:8765/v1 hirelab digest
+
+Or start it in-process:
+    with StubOpenAIServer(delay=0.2) as server:
+        config = OpenAIConfig(api_key="stub", base_url=server.base_url)
+"""
+
+import argparse
+import hashlib
+import json
+import threading
+import time
+from email.parser import BytesParser
+from email.policy import HTTP
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Iterator, Optional
+
+# Characters of completion text per streamed chunk (roughly two tokens)
+STREAM_CHUNK_CHARS = 8
+
+
+class StubOpenAIServer:
+    """Minimal OpenAI-compatible HTTP server running on a background thread."""
+    
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, delay: float = 0.0):
+        """
+        Initialize the server (call start() or use it as a context manager).
+        
+        Args:
+            host: Interface to bind
+            port: Port to bind (0 picks a free one)
+            delay: Seconds to wait before answering each completion
+        """
+        self.delay = delay
+        self.requests = 0
+        self.connections = 0
+        self.files: dict[str, dict] = {}
+        self.file_contents: dict[str, bytes] = {}
+        self.batches: dict[str, dict] = {}
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._httpd = ThreadingHTTPServer((host, port), _make_handler(self))
+        self._httpd.daemon_threads = True
+    
+    @property
+    def base_url(self) -> str:
+        """Base URL to pass as OPENAI_BASE_URL."""
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+    
+    def start(self) -> "StubOpenAIServer":
+        """Serve requests on a background thread."""
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+    
+    def stop(self) -> None:
+        """Stop serving and release the port."""
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+    
+    def serve_forever(self) -> None:
+        """Serve requests on the current thread until interrupted."""
+        try:
+            self._httpd.serve_forever()
+        finally:
+            self._httpd.server_close()
+    
+    def __enter__(self) -> "StubOpenAIServer":
+        return self.start()
+    
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+    
+    def _count(self, attribute: str) -> None:
+        with self._lock:
+            setattr(self, attribute, getattr(self, attribute) + 1)
+    
+    def chat_completion(self, body: dict) -> dict:
+        """Answer a chat completion request."""
+        self._count("requests")
+        if self.delay:
+            time.sleep(self.delay)
+        return self._completion(body)
+    
+    def stream_chat_completion(self, body: dict) -> Iterator[dict]:
+        """Answer a streaming chat completion request chunk by chunk."""
+        self._count("requests")
+        completion = self._completion(body)
+        content = completion["choices"][0]["message"]["content"]
+        pieces = [
+            content[i:i + STREAM_CHUNK_CHARS]
+            for i in range(0, len(content), STREAM_CHUNK_CHARS)
+        ]
+        
+        chunk = {key: completion[key] for key in ("id", "created", "model")}
+        chunk["object"] = "chat.completion.chunk"
+        for index, piece in enumerate(pieces):
+            if self.delay:
+                time.sleep(self.delay / len(pieces))
+            delta = {"role": "assistant", "content": piece} if index == 0 else {"content": piece}
+            yield {**chunk, "choices": [{"index": 0, "delta": delta, "finish_reason": None}]}
+        yield {**chunk, "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]}
+    
+    def create_file(self, filename: str, purpose: str, content: bytes) -> dict:
+        """Store an uploaded file."""
+        with self._lock:
+            file_id = f"file-stub-{len(self.files) + 1}"
+            self.files[file_id] = {
+                "id": file_id,
+                "object": "file",
+                "bytes": len(content),
+                "created_at": int(time.time()),
+                "filename": filename,
+                "purpose": purpose,
+                "status": "processed",
+            }
+            self.file_contents[file_id] = content
+        return self.files[file_id]
+    
+    def create_batch(self, body: dict) -> dict:
+        """Accept a batch job; it completes on the next retrieve."""
+        with self._lock:
+            batch_id = f"batch_stub_{len(self.batches) + 1}"
+            self.batches[batch_id] = {
+                "id": batch_id,
+                "object": "batch",
+                "endpoint": body["endpoint"],
+                "input_file_id": body["input_file_id"],
+                "completion_window": body["completion_window"],
+                "status": "in_progress",
+                "created_at": int(time.time()),
+                "output_file_id": None,
+            }
+        return self.batches[batch_id]
+    
+    def retrieve_batch(self, batch_id: str) -> Optional[dict]:
+        """Return a batch, running it first if it is still in progress."""
+        batch = self.batches.get(batch_id)
+        if batch and batch["status"] == "in_progress":
+            lines = []
+            for line in self.file_contents[batch["input_file_id"]].decode("utf-8").splitlines():
+                if not line.strip():
+                    continue
+                request = json.loads(line)
+                lines.append(json.dumps({
+                    "id": f"batch_req_{request['custom_id']}",
+                    "custom_id": request["custom_id"],
+                    "response": {"status_code": 200, "body": self._completion(request["body"])},
+                    "error": None,
+                }))
+            output = self.create_file("batch_output.jsonl", "batch_output", "\n".join(lines).encode("utf-8"))
+            batch.update(
+                status="completed",
+                output_file_id=output["id"],
+                completed_at=int(time.time()),
+            )
+        return batch
+    
+    def _completion(self, body: dict) -> dict:
+        return {
+            "id": f"chatcmpl-stub-{self.requests}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "stub"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": stub_content(body.get("messages", []))},
+                "finish_reason": "stop",
+            }],
+            "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+        }
+
+
+def stub_content(messages: list[dict]) -> str:
+    """Canned drafts for a conversation, stable for identical prompts."""
+    prompt = messages[-1]["content"] if messages else ""
+    digest = hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:8]
+    return (
+        "---DRAFT_A---\n"
+        f"Stub draft A ({digest}): happy to share what worked for me.\n"
+        "---END_DRAFT_A---\n"
+        "---DRAFT_B---\n"
+        f"Stub draft B ({digest}): a few concrete suggestions below.\n"
+        "---END_DRAFT_B---"
+    )
+
+
+def _make_handler(server: StubOpenAIServer) -> type[BaseHTTPRequestHandler]:
+    """Build a request handler class bound to a server instance."""
+    
+    class Handler(BaseHTTPRequestHandler):
+        # Keep-alive, like the real API
+        protocol_version = "HTTP/1.1"
+        
+        def setup(self) -> None:
+            super().setup()
+            server._count("connections")
+        
+        def do_POST(self) -> None:
+            length = int(self.headers.get("Content-Length", 0))
+            raw = self.rfile.read(length)
+            path = self.path.rstrip("/")
+            
+            if path.endswith("/chat/completions"):
+                body = json.loads(raw or b"{}")
+                if body.get("stream"):
+                    self._send_events(server.stream_chat_completion(body))
+                else:
+                    self._send_json(200, server.chat_completion(body))
+            elif path.endswith("/files"):
+                fields = self._parse_multipart(raw)
+                filename, content = fields["file"]
+                self._send_json(200, server.create_file(filename, fields["purpose"][1].decode(), content))
+            elif path.endswith("/batches"):
+                self._send_json(200, server.create_batch(json.loads(raw or b"{}")))
+            else:
+                self._not_found()
+        
+        def do_GET(self) -> None:
+            parts = self.path.rstrip("/").split("/")
+            
+            batch = None
+            content = None
+            if len(parts) >= 2 and parts[-2] == "batches":
+                batch = server.retrieve_batch(parts[-1])
+            elif len(parts) >= 3 and parts[-3] == "files" and parts[-1] == "content":
+                content = server.file_contents.get(parts[-2])
+            
+            if batch is not None:
+                self._send_json(200, batch)
+            elif content is not None:
+                self._send_bytes(200, content, "application/octet-stream")
+            else:
+                self._not_found()
+        
+        def _parse_multipart(self, raw: bytes) -> dict[str, tuple[str, bytes]]:
+            """Parse a multipart/form-data body into {name: (filename, content)}."""
+            header = f"Content-Type: {self.headers['Content-Type']}\r\n\r\n".encode()
+            message = BytesParser(policy=HTTP).parsebytes(header + raw)
+            return {
+                part.get_param("name", header="content-disposition"): (
+                    part.get_filename() or "",
+                    part.get_payload(decode=True),
+                )
+                for part in message.iter_parts()
+            }
+        
+        def _not_found(self) -> None:
+            self._send_json(404, {"error": {"message": f"Unknown path {self.path}"}})
+        
+        def _send_json(self, status: int, payload: dict) -> None:
+            self._send_bytes(status, json.dumps(payload).encode("utf-8"), "application/json")
+        
+        def _send_events(self, events: Iterator[dict]) -> None:
+            """Send server-sent events with chunked transfer encoding."""
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            
+            def write_chunk(data: bytes) -> None:
+                self.wfile.write(f"{len(data):X}\r\n".encode() + data + b"\r\n")
+                self.wfile.flush()
+            
+            for event in events:
+                write_chunk(f"data: {json.dumps(event)}\n\n".encode("utf-8"))
+            write_chunk(b"data: [DONE]\n\n")
+            self.wfile.write(b"0\r\n\r\n")
+        
+        def _send_bytes(self, status: int, data: bytes, content_type: str) -> None:
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+        
+        def log_message(self, format: str, *args) -> None:
+            pass
+    
+    return Handler
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run a local OpenAI-compatible stub server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--delay", type=float, default=0.0, help="Seconds per completion")
+    args = parser.parse_args()
+    
+    server = StubOpenAIServer(host=args.host, port=args.port, delay=args.delay)
+    print(f"Stub OpenAI server listening on {server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
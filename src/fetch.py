@@ -1,19 +1,27 @@
 """Fetch posts from Reddit subreddits."""
 
+import asyncio
+import contextvars
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
-from typing import Optional
+from typing import Iterable, Iterator, Optional
 
 from rich.console import Console
 from rich.progress import Progress, SpinnerColumn, TextColumn
 
+from . import perf
 from .config import DEFAULT_SUBREDDITS, AppConfig, RedditConfig
-from .reddit_client import RedditClient
-from .scoring import calculate_intent_score, check_mention_allowed
-from .dedupe import compute_content_hash, is_duplicate
-from .store import Database, Post, PostStatus, Action, ActionType
+from .reddit_client import AsyncRedditClient, RateLimiter, RedditClient
+from .scoring import calculate_intent_score, check_mention_allowed, match_keywords
+from .dedupe import DedupeIndex, compute_content_hash, compute_minhash, encode_minhash, minhash_buckets
+from .store import Database, Post, PostStatus, Action, ActionType, FetchCursor
 
 console = Console()
 
+# Posts stored per transaction (one Reddit listing page)
+FETCH_BATCH_SIZE = 100
+
 
 def fetch_posts(
     reddit_config: RedditConfig,
@@ -21,37 +29,78 @@ def fetch_posts(
     db: Database,
     subreddits: Optional[list[str]] = None,
     verbose: bool = True,
+    full_refresh: bool = False,
+    client: Optional[RedditClient] = None,
 ) -> dict:
     """
     Fetch posts from Reddit, score them, dedupe, and store.
     
+    Each subreddit keeps a cursor (the newest post seen so far), so a run only
+    pulls posts published since the previous one.
+    
     Args:
         reddit_config: Reddit API configuration
         app_config: Application settings
         db: Database instance
         subreddits: Optional list of subreddits to fetch from (defaults to DEFAULT_SUBREDDITS)
         verbose: Whether to print progress
+        full_refresh: Ignore stored cursors and re-read the whole lookback window
+        client: Reddit client to reuse (defaults to a new one from the config)
         
     Returns:
         Dictionary with fetch statistics
     """
     subreddits = subreddits or DEFAULT_SUBREDDITS
-    client = RedditClient(
-        config=reddit_config,
-        fixtures_path=app_config.data_dir / "fixtures" if app_config.dry_run else None,
-    )
+    client = client or create_reddit_client(reddit_config, app_config)
+    fixtures_path = client.fixtures_path
+    rate_limiter = client.rate_limiter
     
     stats = {
         "total_fetched": 0,
         "new_posts": 0,
         "duplicates": 0,
+        "near_duplicates": 0,
         "above_threshold": 0,
         "by_subreddit": {},
     }
     
     if verbose:
         mode = "LIVE" if client.is_live else "DRY-RUN"
-        console.print(f"\n[bold blue]Fetching posts ({mode} mode)[/bold blue]")
+        workers = min(app_config.fetch_workers, len(subreddits))
+        suffix = f", {workers} workers" if workers > 1 else ""
+        if app_config.fetch_async:
+            suffix = f", async, {workers} in flight"
+        console.print(f"\n[bold blue]Fetching posts ({mode} mode{suffix})[/bold blue]")
+    
+    cursors = {} if full_refresh else {
+        subreddit: db.get_fetch_cursor(subreddit) for subreddit in subreddits
+    }
+    
+    # Duplicate checks against stored posts and the posts of this run
+    dedupe_index = DedupeIndex(db)
+    
+    if app_config.fetch_async:
+        # One event loop downloads every listing, then they are stored in order
+        async_client = AsyncRedditClient(
+            config=reddit_config,
+            fixtures_path=fixtures_path,
+            max_connections=max(app_config.fetch_workers, 1),
+            rate_limiter=rate_limiter,
+        )
+        with perf.timer("fetch.reddit"):
+            listings = asyncio.run(_fetch_listings_async(async_client, subreddits, app_config, cursors))
+    else:
+        listings = _iter_listings(
+            client=client,
+            client_factory=lambda: RedditClient(
+                config=reddit_config,
+                fixtures_path=fixtures_path,
+                rate_limiter=rate_limiter,
+            ),
+            subreddits=subreddits,
+            app_config=app_config,
+            cursors=cursors,
+        )
     
     with Progress(
         SpinnerColumn(),
@@ -59,45 +108,133 @@ def fetch_posts(
         console=console,
         disable=not verbose,
     ) as progress:
-        for subreddit in subreddits:
+        # Listings download lazily (or wait on the worker pool) as they are iterated
+        for subreddit, posts in perf.timed_iter(listings, "fetch.reddit"):
             task = progress.add_task(f"r/{subreddit}...", total=None)
-            subreddit_stats = {"fetched": 0, "new": 0, "duplicates": 0}
-            
-            for post in client.fetch_subreddit_posts(
-                subreddit_name=subreddit,
-                limit=app_config.posts_per_subreddit,
-                max_age_hours=app_config.fetch_hours_lookback,
-            ):
+            try:
+                stats["by_subreddit"][subreddit] = _store_listing(
+                    subreddit, posts, app_config, db, dedupe_index, stats,
+                    on_page=lambda subreddit_stats: progress.update(
+                        task, description=f"r/{subreddit} ({subreddit_stats['fetched']} posts)"
+                    ),
+                )
+            except Exception as e:
+                # One failing subreddit must not cost the others their run
+                console.print(f"[yellow]Failed to fetch r/{subreddit}: {e}[/yellow]")
+            progress.update(task, completed=True)
+    
+    stats["failed_subreddits"] = [name for name in subreddits if name not in stats["by_subreddit"]]
+    perf.count("fetch.posts", stats["total_fetched"])
+    perf.count("fetch.new_posts", stats["new_posts"])
+    perf.count("fetch.duplicates", stats["duplicates"])
+    perf.count("fetch.near_duplicates", stats["near_duplicates"])
+    perf.count("fetch.above_threshold", stats["above_threshold"])
+    
+    if verbose:
+        console.print(f"\n[green]✓[/green] Fetched {stats['total_fetched']} posts")
+        console.print(f"  • New: {stats['new_posts']}")
+        console.print(f"  • Duplicates: {stats['duplicates']} ({stats['near_duplicates']} near-duplicates)")
+        console.print(f"  • Above threshold: {stats['above_threshold']}")
+        if stats["failed_subreddits"]:
+            console.print(f"  • Failed: {', '.join('r/' + name for name in stats['failed_subreddits'])}")
+    
+    return stats
+
+
+def _store_listing(
+    subreddit: str,
+    posts: Iterable[Post],
+    app_config: AppConfig,
+    db: Database,
+    dedupe_index: DedupeIndex,
+    stats: dict,
+    on_page=None,
+) -> dict:
+    """
+    Score, dedupe and store one subreddit's listing, a page per transaction.
+    
+    Adds to the run totals in ``stats``, saves the subreddit's cursor once the
+    whole listing is stored (except in dry-run mode, where fixtures must not
+    move the real cursor), and calls ``on_page`` with the subreddit's stats
+    after each page.
+    
+    Returns:
+        The subreddit's stats
+    """
+    subreddit_stats = {"fetched": 0, "new": 0, "duplicates": 0}
+    newest: Optional[Post] = None
+    
+    for page in _batched(perf.timed_iter(posts, "fetch.reddit"), FETCH_BATCH_SIZE):
+        to_save: list[Post] = []
+        actions: list[Action] = []
+        signatures: list[tuple[str, bytes, list[int]]] = []
+        
+        with perf.timer("fetch.hash"):
+            for post in page:
                 stats["total_fetched"] += 1
                 subreddit_stats["fetched"] += 1
+                if newest is None or post.created_utc > newest.created_utc:
+                    newest = post
                 
                 # Compute content hash
                 post.content_hash = compute_content_hash(post.title, post.selftext)
+        
+        # Check the whole page for duplicate content at once
+        with perf.timer("fetch.dedupe"):
+            duplicates = dedupe_index.find_duplicates(page)
+        
+        for post, existing_id in zip(page, duplicates):
+            if existing_id:
+                stats["duplicates"] += 1
+                subreddit_stats["duplicates"] += 1
                 
-                # Check for duplicate content
-                existing_id = is_duplicate(db, post.reddit_id, post.content_hash)
-                if existing_id:
-                    stats["duplicates"] += 1
-                    subreddit_stats["duplicates"] += 1
-                    
-                    # Record the duplicate
-                    if not db.post_exists(post.reddit_id):
-                        post.status = PostStatus.DUPLICATE
-                        db.save_post(post)
-                        db.save_action(Action(
-                            reddit_id=post.reddit_id,
-                            action_type=ActionType.MARK_SKIPPED,
-                            notes=f"Duplicate of {existing_id}",
-                        ))
-                    continue
+                # Record the duplicate (unless it is a post we already have)
+                if existing_id != post.reddit_id:
+                    post.status = PostStatus.DUPLICATE
+                    to_save.append(post)
+                    actions.append(Action(
+                        reddit_id=post.reddit_id,
+                        action_type=ActionType.MARK_SKIPPED,
+                        notes=f"Duplicate of {existing_id}",
+                    ))
+                continue
+            
+            # Check for near-duplicate content (edited reposts, [UPDATE] variants)
+            near_duplicate = None
+            with perf.timer("fetch.near_dedupe"):
+                signature = compute_minhash(post.title, post.selftext)
+                if signature:
+                    near_duplicate = dedupe_index.find_near_duplicate(post.reddit_id, signature)
+                    dedupe_index.add_signature(post.reddit_id, signature)
+                    signatures.append(
+                        (post.reddit_id, encode_minhash(signature), minhash_buckets(signature))
+                    )
+            
+            if near_duplicate:
+                existing_id, similarity = near_duplicate
+                stats["duplicates"] += 1
+                stats["near_duplicates"] += 1
+                subreddit_stats["duplicates"] += 1
                 
-                # Calculate intent score
+                post.status = PostStatus.DUPLICATE
+                to_save.append(post)
+                actions.append(Action(
+                    reddit_id=post.reddit_id,
+                    action_type=ActionType.MARK_SKIPPED,
+                    notes=f"Near-duplicate of {existing_id} (similarity {similarity:.2f})",
+                ))
+                continue
+            
+            # Calculate intent score (one keyword scan shared by both checks)
+            with perf.timer("fetch.score"):
+                matches = match_keywords(post.title, post.selftext)
                 score_result = calculate_intent_score(
                     title=post.title,
                     selftext=post.selftext,
                     subreddit=subreddit,
                     score=post.score,
                     num_comments=post.num_comments,
+                    matches=matches,
                 )
                 
                 post.intent_score = score_result["score"]
@@ -106,35 +243,146 @@ def fetch_posts(
                     post.title,
                     post.selftext,
                     subreddit,
+                    matches=matches,
                 )
-                
-                # Determine status
-                if db.post_exists(post.reddit_id):
-                    # Update existing post
-                    db.save_post(post)
-                else:
-                    # New post
-                    stats["new_posts"] += 1
-                    subreddit_stats["new"] += 1
-                    
-                    if post.intent_score >= app_config.intent_score_threshold:
-                        post.status = PostStatus.QUEUED
-                        stats["above_threshold"] += 1
-                    else:
-                        post.status = PostStatus.NEW
-                    
-                    db.save_post(post)
-                
-                progress.update(task, description=f"r/{subreddit} ({subreddit_stats['fetched']} posts)")
             
-            stats["by_subreddit"][subreddit] = subreddit_stats
-            progress.update(task, completed=True)
+            # Determine status
+            if post.intent_score >= app_config.intent_score_threshold:
+                post.status = PostStatus.QUEUED
+            else:
+                post.status = PostStatus.NEW
+            
+            to_save.append(post)
+        
+        # Store the page in a single transaction
+        with perf.timer("fetch.store"), db.transaction():
+            results = db.upsert_posts(to_save, actions)
+            db.save_signatures(signatures)
+        for post, (_, is_new) in zip(to_save, results):
+            if is_new and post.status != PostStatus.DUPLICATE:
+                stats["new_posts"] += 1
+                subreddit_stats["new"] += 1
+                if post.status == PostStatus.QUEUED:
+                    stats["above_threshold"] += 1
+        
+        if on_page:
+            on_page(subreddit_stats)
     
-    if verbose:
-        console.print(f"\n[green]✓[/green] Fetched {stats['total_fetched']} posts")
-        console.print(f"  • New: {stats['new_posts']}")
-        console.print(f"  • Duplicates: {stats['duplicates']}")
-        console.print(f"  • Above threshold: {stats['above_threshold']}")
+    if newest is not None and not app_config.dry_run:
+        db.save_fetch_cursor(FetchCursor(
+            subreddit=subreddit,
+            last_created_utc=newest.created_utc.timestamp(),
+            last_fullname=newest.fullname,
+        ))
     
-    return stats
+    return subreddit_stats
+
+
+def create_reddit_client(reddit_config: RedditConfig, app_config: AppConfig) -> RedditClient:
+    """
+    Create a Reddit client for fetching.
+    
+    Live clients share one rate limit with every other worker and process;
+    in dry-run mode the client reads JSON fixtures instead.
+    """
+    fixtures_path = app_config.data_dir / "fixtures" if app_config.dry_run else None
+    rate_limiter = None
+    if reddit_config.is_configured:
+        # One quota per OAuth app, shared by every worker and every process
+        rate_limiter = RateLimiter(
+            app_config.data_dir / "ratelimit.sqlite",
+            key=reddit_config.client_id,
+            requests_per_minute=reddit_config.requests_per_minute,
+        )
+    return RedditClient(config=reddit_config, fixtures_path=fixtures_path, rate_limiter=rate_limiter)
+
+
+async def _fetch_listings_async(
+    async_client: AsyncRedditClient,
+    subreddits: list[str],
+    app_config: AppConfig,
+    cursors: dict[str, Optional[FetchCursor]],
+) -> list[tuple[str, list[Post]]]:
+    """
+    Download every listing concurrently, with up to ``fetch_workers`` requests in flight.
+    
+    Returns:
+        (subreddit, posts) pairs in the order the subreddits were given,
+        leaving out the ones that failed (fetch_many logs them)
+    """
+    async with async_client:
+        listings = await async_client.fetch_many(
+            subreddits,
+            limit=app_config.posts_per_subreddit,
+            max_age_hours=app_config.fetch_hours_lookback,
+            cursors=cursors,
+            max_concurrency=max(app_config.fetch_workers, 1),
+        )
+    return [(subreddit, listings[subreddit]) for subreddit in subreddits if subreddit in listings]
+
+
+def _iter_listings(
+    client: RedditClient,
+    client_factory,
+    subreddits: list[str],
+    app_config: AppConfig,
+    cursors: dict[str, Optional[FetchCursor]],
+) -> Iterator[tuple[str, Iterable[Post]]]:
+    """
+    Yield (subreddit, posts) pairs in the order the subreddits were given.
+    
+    With a single worker each listing is streamed lazily from ``client``. With
+    more workers, listings are downloaded in parallel on a thread pool (one
+    RedditClient per worker thread, since PRAW instances are not thread-safe)
+    while the caller scores and stores them one subreddit at a time, so the
+    database is only ever touched from the calling thread.
+    
+    A listing that fails to download raises when its posts are iterated, so
+    the caller can skip that subreddit and carry on with the others.
+    
+    With ``fetch_async`` set, listings come from _fetch_listings_async instead.
+    """
+    def fetch(reddit_client: RedditClient, subreddit: str) -> Iterable[Post]:
+        return reddit_client.fetch_subreddit_posts(
+            subreddit_name=subreddit,
+            limit=app_config.posts_per_subreddit,
+            max_age_hours=app_config.fetch_hours_lookback,
+            cursor=cursors.get(subreddit),
+        )
+    
+    workers = min(app_config.fetch_workers, len(subreddits))
+    if workers <= 1:
+        for subreddit in subreddits:
+            yield subreddit, fetch(client, subreddit)
+        return
+    
+    local = threading.local()
+    
+    def fetch_all(subreddit: str) -> list[Post]:
+        if not hasattr(local, "client"):
+            local.client = client_factory()
+        return list(fetch(local.client, subreddit))
+    
+    def result(future: Future) -> Iterator[Post]:
+        # A failed download raises where the caller reads the listing, like the serial path
+        yield from future.result()
+    
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="fetch") as executor:
+        futures = [
+            executor.submit(contextvars.copy_context().run, fetch_all, subreddit)
+            for subreddit in subreddits
+        ]
+        for subreddit, future in zip(subreddits, futures):
+            yield subreddit, result(future)
+
 
+def _batched(posts: Iterable[Post], size: int) -> Iterator[list[Post]]:
+    """Group a stream of posts into lists of at most ``size``."""
+    batch: list[Post] = []
+    for post in posts:
+        batch.append(post)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
@@ -0,0 +1,177 @@
+"""Multi-pattern keyword matching using an Aho-Corasick automaton."""
+
+from bisect import bisect_right
+from itertools import accumulate
+from typing import Iterable, Sequence
+
+
+class KeywordMatcher:
+    """
+    Find every occurrence of many keywords in a single pass over the text.
+    
+    Keywords are grouped into named categories and matched as plain substrings,
+    exactly like ``keyword in text``. The automaton is built once, so matching
+    cost depends on the length of the text, not on the number of keywords.
+    """
+    
+    def __init__(self, categories: dict[str, Iterable[str]]):
+        """
+        Build the automaton.
+        
+        Args:
+            categories: Mapping of category name to its keywords. Keywords are
+                matched lowercase; text passed to find() must be lowercased too.
+        """
+        self._categories = list(categories)
+        self._patterns: list[str] = []
+        # Pattern ID -> (category, position in category, keyword) using it
+        self._owners: list[list[tuple[str, int, str]]] = []
+        pattern_ids: dict[str, int] = {}
+        
+        for name, keywords in categories.items():
+            for position, keyword in enumerate(keywords):
+                pattern = keyword.lower()
+                if not pattern:
+                    continue
+                if pattern not in pattern_ids:
+                    pattern_ids[pattern] = len(self._patterns)
+                    self._patterns.append(pattern)
+                    self._owners.append([])
+                self._owners[pattern_ids[pattern]].append((name, position, keyword))
+        
+        self._delta: list[dict[str, int]] = []
+        self._out: list[tuple[int, ...]] = []
+        self._build()
+        
+        # For find_ids_batch(): shortest patterns first, and for each pattern
+        # the longest other pattern it contains, if any
+        self._by_length = sorted(range(len(self._patterns)), key=lambda i: len(self._patterns[i]))
+        self._inner: dict[int, int] = {}
+        for pattern_id, pattern in enumerate(self._patterns):
+            inner = [i for i, other in enumerate(self._patterns) if i != pattern_id and other in pattern]
+            if inner:
+                self._inner[pattern_id] = max(inner, key=lambda i: len(self._patterns[i]))
+    
+    def _build(self) -> None:
+        """
+        Build the automaton as a deterministic transition table.
+        
+        Each state maps a character to its next state with failure links
+        already resolved, so matching is a single dict lookup per character.
+        Characters missing from a state's table lead back to the root.
+        """
+        goto: list[dict[str, int]] = [{}]
+        fail: list[int] = [0]
+        out: list[tuple[int, ...]] = [()]
+        
+        for pattern_id, pattern in enumerate(self._patterns):
+            state = 0
+            for char in pattern:
+                next_state = goto[state].get(char)
+                if next_state is None:
+                    next_state = len(goto)
+                    goto[state][char] = next_state
+                    goto.append({})
+                    fail.append(0)
+                    out.append(())
+                state = next_state
+            out[state] += (pattern_id,)
+        
+        # Breadth-first so every failure target is finished before it is used
+        queue = list(goto[0].values())
+        for state in queue:
+            for char, child in goto[state].items():
+                queue.append(child)
+                target = fail[state]
+                while target and char not in goto[target]:
+                    target = fail[target]
+                fail[child] = goto[target].get(char, 0)
+                out[child] += out[fail[child]]
+        
+        # Resolve failure links into full transitions, again breadth-first so
+        # the failure state's table is complete before it is copied
+        delta: list[dict[str, int]] = [dict() for _ in goto]
+        delta[0] = dict(goto[0])
+        for state in queue:
+            delta[state] = {**delta[fail[state]], **goto[state]}
+        
+        self._delta = delta
+        self._out = out
+    
+    @property
+    def categories(self) -> list[str]:
+        """Names of the keyword categories."""
+        return list(self._categories)
+    
+    def find_ids(self, text: str) -> set[int]:
+        """Return the IDs of all patterns occurring in the text."""
+        delta, out = self._delta, self._out
+        found: set[int] = set()
+        state = 0
+        
+        for char in text:
+            state = delta[state].get(char, 0)
+            if out[state]:
+                found.update(out[state])
+        
+        return found
+    
+    def find_ids_batch(self, texts: Sequence[str]) -> list[set[int]]:
+        """
+        Return the IDs of all patterns occurring in each of many texts.
+        
+        Same result as find_ids() per text, but the scanning runs in C: the
+        texts are joined into one string and searched with str.find, one
+        pattern at a time. After a hit the search skips to the next text, so
+        the Python work is one step per (text, pattern) match rather than one
+        per character. A pattern containing a shorter one (``resume review``,
+        ``resume``) is only looked for in the texts the shorter one was found in.
+        """
+        found: list[set[int]] = [set() for _ in texts]
+        # Texts each pattern was found in, by pattern ID
+        hits: dict[int, list[int]] = {}
+        # NUL separates the texts, so a pattern without NUL never matches across two of them
+        joined = "\0".join(texts)
+        # Offset where each text ends (where the next one starts)
+        ends = list(accumulate(len(text) + 1 for text in texts))
+        
+        for pattern_id in self._by_length:
+            pattern = self._patterns[pattern_id]
+            inner = self._inner.get(pattern_id)
+            if inner is not None or "\0" in pattern:
+                candidates = hits[inner] if inner is not None else range(len(texts))
+                matched = [index for index in candidates if pattern in texts[index]]
+            else:
+                matched = []
+                position = joined.find(pattern)
+                while position != -1:
+                    index = bisect_right(ends, position)
+                    matched.append(index)
+                    position = joined.find(pattern, ends[index])
+            
+            hits[pattern_id] = matched
+            for index in matched:
+                found[index].add(pattern_id)
+        
+        return found
+    
+    def find(self, text: str) -> dict[str, list[str]]:
+        """
+        Find the keywords of every category that occur in the text.
+        
+        Returns:
+            Mapping of category name to matched keywords, in the order they
+            were given for that category
+        """
+        return self.group(self.find_ids(text))
+    
+    def group(self, found: set[int]) -> dict[str, list[str]]:
+        """Split a set of pattern IDs from find_ids() into per-category keywords."""
+        hits: dict[str, list[tuple[int, str]]] = {name: [] for name in self._categories}
+        for pattern_id in found:
+            for name, position, keyword in self._owners[pattern_id]:
+                hits[name].append((position, keyword))
+        return {
+            name: [keyword for _, keyword in sorted(matched)]
+            for name, matched in hits.items()
+        }
@@ -1,8 +1,28 @@
-"""Output modules for Slack, Sheets, and Console."""
+"""
+Output modules for Slack, Sheets, and Console.
 
-from .slack import send_to_slack
-from .sheets import write_to_sheets
-from .console import print_to_console
+Submodules are imported on first attribute access (PEP 562), so importing
+one output does not pull in the dependencies of the others.
+"""
 
-__all__ = ["send_to_slack", "write_to_sheets", "print_to_console"]
+import importlib
 
+_EXPORTS = {
+    "send_to_slack": ".slack",
+    "write_to_sheets": ".sheets",
+    "print_to_console": ".console",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(list(globals()) + __all__)
@@ -1,15 +1,14 @@
 """Console output module using Rich."""
 
 from datetime import datetime
+from typing import Union
 
 from rich.console import Console
 from rich.panel import Panel
 from rich.table import Table
 from rich.text import Text
-from rich.markdown import Markdown
 
-from ..store.models import Post, PostStatus
-from ..scoring import get_match_reasons
+from ..store.models import Post, PostStatus, PostSummary, SearchHit
 
 
 console = Console()
@@ -47,6 +46,9 @@ def print_to_console(
 
 def _print_post(post: Post, index: int, show_drafts: bool = True) -> None:
     """Print a single post with rich formatting."""
+    # Imported here so `hirelab stats` and `list` don't load the scorer (and numpy)
+    from ..scoring import get_match_reasons
+    
     # Build header
     status_color = _get_status_color(post.status)
     header = f"[{index}] r/{post.subreddit} • Score: {post.intent_score:.0f} • {post.status.value}"
@@ -86,16 +88,26 @@ def _print_post(post: Post, index: int, show_drafts: bool = True) -> None:
 def _print_drafts(post: Post) -> None:
     """Print draft replies for a post."""
     if post.draft_a:
-        console.print("  [bold green]Draft A (no mention):[/bold green]")
-        # Indent the draft
-        for line in post.draft_a.split("\n"):
-            console.print(f"    {line}")
+        print_draft_a(post.draft_a)
     
     if post.draft_b and post.mention_allowed and post.draft_b != post.draft_a:
         console.print()
-        console.print("  [bold yellow]Draft B (soft mention):[/bold yellow]")
-        for line in post.draft_b.split("\n"):
-            console.print(f"    {line}")
+        print_draft_b(post.draft_b)
+
+
+def print_draft_a(draft_a: str, label: str = "Draft A (no mention):") -> None:
+    """Print Draft A on its own, e.g. as soon as it has streamed in."""
+    console.print(f"  [bold green]{label}[/bold green]")
+    # Indent the draft
+    for line in draft_a.split("\n"):
+        console.print(f"    {line}")
+
+
+def print_draft_b(draft_b: str, label: str = "Draft B (soft mention):") -> None:
+    """Print Draft B on its own."""
+    console.print(f"  [bold yellow]{label}[/bold yellow]")
+    for line in draft_b.split("\n"):
+        console.print(f"    {line}")
 
 
 def _get_status_color(status: PostStatus) -> str:
@@ -123,10 +135,59 @@ def print_stats(stats: dict) -> None:
     table.add_row("Total Posts", str(stats.get("total_posts", 0)), style="bold")
     table.add_row("Total Actions", str(stats.get("total_actions", 0)), style="bold")
     
+    if "draft_cache" in stats:
+        cache = stats["draft_cache"]
+        table.add_section()
+        table.add_row("Cached Drafts", str(cache["entries"]))
+        table.add_row("Cache Hits", str(cache["hits"]))
+        table.add_row("Cache Misses", str(cache["misses"]))
+    
     console.print(table)
 
 
-def print_post_list(posts: list[Post]) -> None:
+def print_perf_runs(runs: list[dict]) -> None:
+    """Print the stage breakdown of recorded runs, most recent first."""
+    if not runs:
+        console.print("[yellow]No runs recorded yet (set PERF_METRICS=true and run fetch or digest).[/yellow]")
+        return
+    
+    for run in reversed(runs):
+        duration = run["duration_seconds"]
+        title = f"⏱ {run['run']} at {run['started_at']} • {duration:.2f}s"
+        if "error" in run:
+            title += f" • [red]{run['error']}[/red]"
+        
+        table = Table(title=title, title_justify="left")
+        table.add_column("Stage", style="cyan")
+        table.add_column("Calls", justify="right")
+        table.add_column("Seconds", justify="right", style="green")
+        table.add_column("% of run", justify="right")
+        table.add_column("Max", justify="right", style="dim")
+        
+        stages = sorted(run["stages"].items(), key=lambda item: item[1]["seconds"], reverse=True)
+        for stage, entry in stages:
+            share = 100 * entry["seconds"] / duration if duration else 0
+            table.add_row(
+                stage,
+                str(entry["calls"]),
+                f"{entry['seconds']:.3f}",
+                f"{share:.0f}%",
+                f"{entry['max_seconds']:.3f}",
+            )
+        
+        if run["counters"]:
+            table.add_section()
+            for counter, value in run["counters"].items():
+                table.add_row(counter, str(value), "", "", "", style="dim")
+        
+        console.print(table)
+        console.print()
+    
+    console.print("[dim]Stages can nest (db.* inside fetch.*) and concurrent stages (drafts.llm) "
+                  "add up across threads, so shares can exceed 100%.[/dim]")
+
+
+def print_post_list(posts: list[Union[Post, PostSummary]]) -> None:
     """Print a compact list of posts."""
     table = Table(title="Posts")
     table.add_column("#", style="dim", width=4)
@@ -150,6 +211,38 @@ def print_post_list(posts: list[Post]) -> None:
     console.print(table)
 
 
+def print_search_results(hits: list[SearchHit], query: str, page: int, has_more: bool) -> None:
+    """Print one page of search results with their matching snippets."""
+    table = Table(title=f"🔎 \"{query}\" • page {page}", title_justify="left", show_lines=True)
+    table.add_column("ID", style="cyan", no_wrap=True)
+    table.add_column("Score", justify="right", style="yellow")
+    table.add_column("Subreddit", style="green", no_wrap=True)
+    table.add_column("Status")
+    table.add_column("Post", overflow="fold")
+    
+    for hit in hits:
+        post = hit.post
+        content = Text()
+        for text, is_match in hit.split_matches(hit.title):
+            content.append(text, style="bold yellow" if is_match else "bold")
+        content.append(f"  {post.created_utc:%Y-%m-%d}", style="dim")
+        if hit.snippet:
+            content.append("\n")
+            for text, is_match in hit.split_matches(hit.snippet):
+                content.append(text.replace("\n", " "), style="bold yellow" if is_match else "")
+        table.add_row(
+            post.reddit_id,
+            f"{post.intent_score:.0f}",
+            f"r/{post.subreddit}",
+            Text(post.status.value, style=_get_status_color(post.status)),
+            content,
+        )
+    
+    console.print(table)
+    if has_more:
+        console.print(f"[dim]More results: add --page {page + 1}[/dim]")
+
+
 def confirm_action(message: str) -> bool:
     """Ask for user confirmation."""
     response = console.input(f"[yellow]{message} (y/n): [/yellow]")
@@ -5,6 +5,7 @@ from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
+from .. import perf
 from ..config import SheetsConfig
 from ..store.models import Post
 
@@ -26,12 +27,20 @@ def write_to_sheets(
         True if successful, False otherwise
     """
     if sheets_config.is_configured:
-        return _write_to_gsheets(posts, sheets_config)
+        destination = "sheets"
+        with perf.timer("sheets.write"):
+            written = _write_to_gsheets(posts, sheets_config)
     elif fallback_csv_path:
-        return _write_to_csv(posts, fallback_csv_path)
+        destination = "csv"
+        with perf.timer("csv.write"):
+            written = _write_to_csv(posts, fallback_csv_path)
     else:
         print("[WARN] Neither Sheets nor CSV path configured, skipping")
         return False
+    
+    if written:
+        perf.count(f"{destination}.rows", len(posts))
+    return written
 
 
 def _write_to_gsheets(posts: list[Post], config: SheetsConfig) -> bool:
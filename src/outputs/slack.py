@@ -5,6 +5,7 @@ from typing import Optional
 
 import requests
 
+from .. import perf
 from ..config import SlackConfig
 from ..store.models import Post
 from ..scoring import get_match_reasons
@@ -35,19 +36,23 @@ def send_to_slack(
         return True
     
     # Build Slack blocks
-    blocks = _build_slack_blocks(posts, title)
+    with perf.timer("slack.build"):
+        blocks = _build_slack_blocks(posts, title)
     
     try:
-        response = requests.post(
-            slack_config.webhook_url,
-            json={"blocks": blocks},
-            headers={"Content-Type": "application/json"},
-            timeout=30,
-        )
-        response.raise_for_status()
+        with perf.timer("slack.send"):
+            response = requests.post(
+                slack_config.webhook_url,
+                json={"blocks": blocks},
+                headers={"Content-Type": "application/json"},
+                timeout=30,
+            )
+            response.raise_for_status()
+        perf.count("slack.posts", len(posts))
         return True
     except requests.RequestException as e:
         print(f"[ERROR] Failed to send to Slack: {e}")
+        perf.count("slack.failures")
         return False
 
 
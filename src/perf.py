@@ -0,0 +1,272 @@
+"""
+Per-stage timers and counters for pipeline runs.
+
+Code marks its stages with `timer()` and counts events with `count()`:
+    
+    with perf.timer("fetch.score"):
+        ...
+    perf.count("fetch.posts", len(page))
+
+Both do nothing (one context variable lookup) unless a run is being
+recorded:
+    
+    with perf.record_run("fetch", app_config):
+        fetch_posts(...)
+
+The run is tracked in a context variable, so runs that overlap on other
+threads (daemon jobs) each get only their own stages. Worker threads of a
+run must be started in a copy of its context:
+    
+    executor.submit(contextvars.copy_context().run, work, item)
+
+When the run ends its summary (wall time, per-stage calls and seconds,
+counters) is appended to data_dir/perf_runs.jsonl, which `hirelab stats
+--perf` reads, and optionally written to a Prometheus textfile.
+
+Stage seconds are summed over every thread that ran the stage, so stages
+run concurrently (LLM calls) can add up to more than the run's wall time.
+Stages can also nest (a db.read inside fetch.dedupe).
+"""
+
+import contextvars
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+from .config import AppConfig
+
+# Runs kept in perf_runs.jsonl
+MAX_RUNS = 500
+
+_NULL_TIMER = nullcontext()
+
+# Recorder of the run the current thread (or task) belongs to
+_current: contextvars.ContextVar[Optional["Recorder"]] = contextvars.ContextVar("perf_recorder", default=None)
+# Serializes writes to the run history
+_save_lock = threading.Lock()
+
+
+class Recorder:
+    """Accumulates stage timings and counters for one run."""
+    
+    def __init__(self, name: str):
+        self.name = name
+        self.started_at = datetime.utcnow()
+        self._start = time.perf_counter()
+        self.duration = 0.0
+        self.stages: dict[str, list] = {}
+        self.counters: dict[str, int] = {}
+        self._lock = threading.Lock()
+    
+    def add_time(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            entry = self.stages.get(stage)
+            if entry is None:
+                self.stages[stage] = [1, seconds, seconds]
+            else:
+                entry[0] += 1
+                entry[1] += seconds
+                if seconds > entry[2]:
+                    entry[2] = seconds
+    
+    def add_count(self, name: str, value: int) -> None:
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+    
+    def finish(self) -> None:
+        self.duration = time.perf_counter() - self._start
+    
+    def summary(self) -> dict:
+        """JSON-serializable summary of the run."""
+        with self._lock:
+            return {
+                "run": self.name,
+                "started_at": self.started_at.isoformat(timespec="seconds"),
+                "duration_seconds": round(self.duration, 6),
+                "stages": {
+                    stage: {"calls": calls, "seconds": round(total, 6), "max_seconds": round(longest, 6)}
+                    for stage, (calls, total, longest) in sorted(self.stages.items())
+                },
+                "counters": dict(sorted(self.counters.items())),
+            }
+
+
+class _Timer:
+    __slots__ = ("recorder", "stage", "start")
+    
+    def __init__(self, recorder: Recorder, stage: str):
+        self.recorder = recorder
+        self.stage = stage
+    
+    def __enter__(self) -> "_Timer":
+        self.start = time.perf_counter()
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.recorder.add_time(self.stage, time.perf_counter() - self.start)
+
+
+def timer(stage: str):
+    """Context manager timing a stage; a shared no-op when no run is recorded."""
+    recorder = _current.get()
+    if recorder is None:
+        return _NULL_TIMER
+    return _Timer(recorder, stage)
+
+
+def count(name: str, value: int = 1) -> None:
+    """Add to a counter of the run being recorded."""
+    recorder = _current.get()
+    if recorder is not None:
+        recorder.add_count(name, value)
+
+
+def timed_iter(iterable: Iterable, stage: str) -> Iterator:
+    """
+    Iterate, timing each next() call as a stage.
+    
+    For lazy sources such as Reddit listings, where the I/O happens while
+    the consumer iterates.
+    """
+    iterator = iter(iterable)
+    while True:
+        with timer(stage):
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+        yield item
+
+
+@contextmanager
+def record_run(name: str, app_config: AppConfig) -> Iterator[Optional[Recorder]]:
+    """
+    Record the stages of a run and export its summary when it ends.
+    
+    Does nothing (and yields None) when PERF_METRICS is off. The summary is
+    exported even if the run fails, with an "error" field.
+    """
+    if not app_config.perf_metrics:
+        yield None
+        return
+    
+    recorder = Recorder(name)
+    token = _current.set(recorder)
+    error = None
+    try:
+        yield recorder
+    except BaseException as e:
+        error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        _current.reset(token)
+        recorder.finish()
+        summary = recorder.summary()
+        if error:
+            summary["error"] = error
+        try:
+            save_run(summary, app_config)
+        except OSError as e:
+            print(f"[WARN] Could not save performance summary: {e}")
+
+
+def runs_path(app_config: AppConfig) -> Path:
+    return app_config.data_dir / "perf_runs.jsonl"
+
+
+def save_run(summary: dict, app_config: AppConfig) -> None:
+    """Append a run summary to the history, and refresh the Prometheus textfile if configured."""
+    path = runs_path(app_config)
+    with _save_lock:
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(summary) + "\n")
+        
+        # Trim the history once it is twice the size kept
+        runs = load_runs(app_config)
+        if len(runs) > 2 * MAX_RUNS:
+            runs = runs[-MAX_RUNS:]
+            _write_atomic(path, "".join(json.dumps(run) + "\n" for run in runs))
+        
+        if app_config.perf_prometheus_textfile:
+            latest = {run["run"]: run for run in runs}
+            _write_atomic(Path(app_config.perf_prometheus_textfile), format_prometheus(list(latest.values())))
+
+
+def load_runs(app_config: AppConfig, limit: Optional[int] = None, name: Optional[str] = None) -> list[dict]:
+    """
+    Read recorded run summaries, oldest first.
+    
+    Args:
+        app_config: Application settings (for data_dir)
+        limit: Only the most recent this many runs
+        name: Only runs with this name (e.g. "fetch")
+    """
+    path = runs_path(app_config)
+    if not path.exists():
+        return []
+    
+    runs = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                run = json.loads(line)
+            except json.JSONDecodeError:
+                # A line cut short by a crash mid-write
+                continue
+            if name is None or run.get("run") == name:
+                runs.append(run)
+    return runs[-limit:] if limit else runs
+
+
+def format_prometheus(runs: list[dict]) -> str:
+    """
+    Render the latest run of each name in the Prometheus text format.
+    
+    Meant for node_exporter's textfile collector; every value is a gauge
+    describing the last run.
+    """
+    metrics = {
+        "hirelab_run_duration_seconds": ("Wall time of the last run.", []),
+        "hirelab_run_timestamp_seconds": ("Unix time the last run started.", []),
+        "hirelab_run_failed": ("1 if the last run raised an error.", []),
+        "hirelab_stage_seconds": ("Seconds spent in a stage during the last run.", []),
+        "hirelab_stage_calls": ("Times a stage ran during the last run.", []),
+        "hirelab_counter": ("Pipeline counters of the last run.", []),
+    }
+    
+    for run in runs:
+        labels = f'run="{_escape_label(run["run"])}"'
+        started = datetime.fromisoformat(run["started_at"])
+        metrics["hirelab_run_duration_seconds"][1].append((labels, run["duration_seconds"]))
+        metrics["hirelab_run_timestamp_seconds"][1].append((labels, (started - datetime(1970, 1, 1)).total_seconds()))
+        metrics["hirelab_run_failed"][1].append((labels, int("error" in run)))
+        for stage, entry in run["stages"].items():
+            stage_labels = f'{labels},stage="{_escape_label(stage)}"'
+            metrics["hirelab_stage_seconds"][1].append((stage_labels, entry["seconds"]))
+            metrics["hirelab_stage_calls"][1].append((stage_labels, entry["calls"]))
+        for counter, value in run["counters"].items():
+            metrics["hirelab_counter"][1].append((f'{labels},name="{_escape_label(counter)}"', value))
+    
+    lines = []
+    for metric, (help_text, samples) in metrics.items():
+        lines.append(f"# HELP {metric} {help_text}")
+        lines.append(f"# TYPE {metric} gauge")
+        lines.extend(f"{metric}{{{labels}}} {value}" for labels, value in samples)
+    return "\n".join(lines) + "\n"
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _write_atomic(path: Path, content: str) -> None:
+    """Replace a file in one step, so readers (node_exporter) never see half of it."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp_path.write_text(content, encoding="utf-8")
+    os.replace(tmp_path, path)
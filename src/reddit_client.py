@@ -1,37 +1,228 @@
-"""Reddit API client wrapper using PRAW."""
+"""Reddit API client wrappers (PRAW, and an asyncio client for the JSON API)."""
 
+import asyncio
 import json
+import sqlite3
+import time
+from contextlib import contextmanager
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Iterator, Optional
+from typing import AsyncIterator, Iterator, Mapping, Optional
 
 import praw
+import prawcore
 from praw.models import Submission
 
 from .config import RedditConfig
-from .store.models import Post
+from .store.models import FetchCursor, Post
+
+
+class RateLimiter:
+    """
+    Token bucket for the Reddit API, shared by every client, thread and process.
+    
+    The bucket lives in one row of a small SQLite file and is only changed
+    inside BEGIN IMMEDIATE transactions, so parallel fetch workers and
+    overlapping cron runs draw from the same quota. Each request reserves
+    the next free send slot (a generic cell rate algorithm): requests leave
+    evenly spaced at the allowed rate, with a small burst after idle periods,
+    instead of bursting into a 429 and backing off.
+    
+    After every response the rate is re-derived from Reddit's X-Ratelimit-*
+    headers: the requests remaining in the window, less the slots already
+    handed out and a little headroom for requests still in flight, are spread
+    evenly over the seconds left until the window resets.
+    """
+    
+    # Requests kept in reserve for responses that have not come back yet
+    HEADROOM = 5
+    
+    def __init__(
+        self,
+        path: Path,
+        key: str = "reddit",
+        requests_per_minute: float = 100,
+        burst: int = 5,
+    ):
+        """
+        Initialize the rate limiter.
+        
+        Args:
+            path: SQLite file holding the shared bucket (created if missing)
+            key: Bucket name; clients sharing a quota must use the same key
+            requests_per_minute: Rate used until Reddit reports the real quota
+            burst: Requests allowed back to back after an idle period
+        """
+        self.path = Path(path)
+        self.key = key
+        self.default_interval = 60.0 / requests_per_minute
+        self.burst = max(burst, 1)
+        
+        with self._transaction() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS rate_limits (
+                    key TEXT PRIMARY KEY,
+                    next_slot REAL NOT NULL,
+                    interval REAL NOT NULL,
+                    window_ends REAL NOT NULL
+                )
+            """)
+    
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """Open the bucket file and hold its write lock for the block."""
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        finally:
+            conn.close()
+    
+    def _load(self, conn: sqlite3.Connection, now: float) -> tuple[float, float, float]:
+        """Read (next_slot, interval, window_ends), resetting an expired window."""
+        row = conn.execute(
+            "SELECT next_slot, interval, window_ends FROM rate_limits WHERE key = ?",
+            (self.key,),
+        ).fetchone()
+        if row is None:
+            return now, self.default_interval, 0.0
+        next_slot, interval, window_ends = row
+        if now >= window_ends:
+            interval = self.default_interval
+        return next_slot, interval, window_ends
+    
+    def _save(
+        self,
+        conn: sqlite3.Connection,
+        next_slot: float,
+        interval: float,
+        window_ends: float,
+    ) -> None:
+        conn.execute(
+            """
+            INSERT INTO rate_limits (key, next_slot, interval, window_ends)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT(key) DO UPDATE SET
+                next_slot = excluded.next_slot,
+                interval = excluded.interval,
+                window_ends = excluded.window_ends
+            """,
+            (self.key, next_slot, interval, window_ends),
+        )
+    
+    def reserve(self) -> float:
+        """
+        Reserve a send slot for one request.
+        
+        Returns:
+            Seconds to wait before sending the request
+        """
+        now = time.time()
+        with self._transaction() as conn:
+            next_slot, interval, window_ends = self._load(conn, now)
+            slot = max(next_slot, now - (self.burst - 1) * interval)
+            self._save(conn, slot + interval, interval, window_ends)
+        return max(0.0, slot - now)
+    
+    def acquire(self) -> None:
+        """Block until this process may send one request."""
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+    
+    async def acquire_async(self) -> None:
+        """Wait until this process may send one request, without blocking the loop."""
+        delay = await asyncio.to_thread(self.reserve)
+        if delay > 0:
+            await asyncio.sleep(delay)
+    
+    def update_from_headers(self, headers: Mapping[str, str]) -> None:
+        """
+        Re-derive the request rate from a response's X-Ratelimit-* headers.
+        
+        Args:
+            headers: Case-insensitive response headers; responses without
+                rate limit headers (e.g. the token endpoint) are ignored
+        """
+        remaining = headers.get("x-ratelimit-remaining")
+        reset = headers.get("x-ratelimit-reset")
+        if remaining is None or reset is None:
+            return
+        
+        now = time.time()
+        seconds_to_reset = max(float(reset), 1.0)
+        with self._transaction() as conn:
+            next_slot, interval, _ = self._load(conn, now)
+            reserved = max(0.0, (next_slot - now) / interval)
+            budget = float(remaining) - reserved - self.HEADROOM
+            window_ends = now + seconds_to_reset
+            
+            if budget < 1:
+                # Quota spent: nothing more until the window resets
+                self._save(conn, max(next_slot, window_ends), self.default_interval, window_ends)
+            else:
+                self._save(conn, next_slot, seconds_to_reset / budget, window_ends)
+
+
+class _RateLimitedRequestor(prawcore.Requestor):
+    """PRAW requestor that schedules every API call through a shared RateLimiter."""
+    
+    def __init__(self, *args, rate_limiter: RateLimiter, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._rate_limiter = rate_limiter
+    
+    def request(self, *args, **kwargs):
+        url = args[1] if len(args) > 1 else kwargs.get("url", "")
+        # Token requests go to www.reddit.com and do not count against the quota
+        if not url.startswith(self.oauth_url):
+            return super().request(*args, **kwargs)
+        
+        self._rate_limiter.acquire()
+        response = super().request(*args, **kwargs)
+        self._rate_limiter.update_from_headers(response.headers)
+        return response
 
 
 class RedditClient:
     """Client for interacting with the Reddit API."""
     
-    def __init__(self, config: RedditConfig, fixtures_path: Optional[Path] = None):
+    def __init__(
+        self,
+        config: RedditConfig,
+        fixtures_path: Optional[Path] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+    ):
         """
         Initialize the Reddit client.
         
         Args:
             config: Reddit API configuration
             fixtures_path: Path to JSON fixtures for dry-run mode
+            rate_limiter: Shared rate limiter; without one, PRAW's own
+                per-instance limiting applies
         """
         self.config = config
         self.fixtures_path = fixtures_path
+        self.rate_limiter = rate_limiter
         self._reddit: Optional[praw.Reddit] = None
         
         if config.is_configured:
+            requestor = {}
+            if rate_limiter:
+                requestor = {
+                    "requestor_class": _RateLimitedRequestor,
+                    "requestor_kwargs": {"rate_limiter": rate_limiter},
+                }
             self._reddit = praw.Reddit(
                 client_id=config.client_id,
                 client_secret=config.client_secret,
                 user_agent=config.user_agent,
+                **requestor,
             )
     
     @property
@@ -44,6 +235,7 @@ class RedditClient:
         subreddit_name: str,
         limit: int = 25,
         max_age_hours: int = 72,
+        cursor: Optional[FetchCursor] = None,
     ) -> Iterator[Post]:
         """
         Fetch posts from a subreddit.
@@ -52,14 +244,16 @@ class RedditClient:
             subreddit_name: Name of the subreddit to fetch from
             limit: Maximum number of posts to fetch
             max_age_hours: Only include posts created within this many hours
+            cursor: High-water mark from a previous run; the cursor post and
+                older posts are not yielded
             
         Yields:
             Post objects
         """
         if self._reddit:
-            yield from self._fetch_live(subreddit_name, limit, max_age_hours)
+            yield from self._fetch_live(subreddit_name, limit, max_age_hours, cursor)
         elif self.fixtures_path:
-            yield from self._fetch_fixtures(subreddit_name)
+            yield from self._fetch_fixtures(subreddit_name, cursor)
         else:
             print(f"[DRY-RUN] Would fetch {limit} posts from r/{subreddit_name}")
     
@@ -68,45 +262,40 @@ class RedditClient:
         subreddit_name: str,
         limit: int,
         max_age_hours: int,
+        cursor: Optional[FetchCursor] = None,
     ) -> Iterator[Post]:
-        """Fetch posts from the live Reddit API."""
+        """
+        Fetch posts from the live Reddit API.
+        
+        The listing is newest-first and paged lazily by PRAW, so stopping at the
+        first post that is too old or already seen by the cursor also stops any
+        further page requests.
+        """
         subreddit = self._reddit.subreddit(subreddit_name)
         cutoff_time = datetime.now(timezone.utc).timestamp() - (max_age_hours * 3600)
         
         for submission in subreddit.new(limit=limit):
-            # Skip stickied posts
+            # Skip stickied posts (pinned to the top regardless of age)
             if submission.stickied:
                 continue
             
-            # Skip posts older than max_age_hours
+            # Everything from here on was seen by a previous run
+            if cursor and cursor.is_seen(submission.name, submission.created_utc):
+                break
+            
+            # Everything from here on is older than max_age_hours
             if submission.created_utc < cutoff_time:
-                continue
+                break
             
             yield self._submission_to_post(submission, subreddit_name)
     
-    def _fetch_fixtures(self, subreddit_name: str) -> Iterator[Post]:
+    def _fetch_fixtures(
+        self,
+        subreddit_name: str,
+        cursor: Optional[FetchCursor] = None,
+    ) -> Iterator[Post]:
         """Load posts from JSON fixtures."""
-        fixture_file = self.fixtures_path / f"{subreddit_name}.json"
-        
-        if not fixture_file.exists():
-            print(f"[DRY-RUN] No fixture file found for r/{subreddit_name}")
-            return
-        
-        with open(fixture_file) as f:
-            posts_data = json.load(f)
-        
-        for data in posts_data:
-            yield Post(
-                reddit_id=data["id"],
-                subreddit=subreddit_name,
-                title=data["title"],
-                selftext=data.get("selftext", ""),
-                url=data["url"],
-                author=data.get("author", "[deleted]"),
-                created_utc=datetime.fromisoformat(data["created_utc"].replace("Z", "+00:00")),
-                score=data.get("score", 0),
-                num_comments=data.get("num_comments", 0),
-            )
+        return _load_fixture_posts(self.fixtures_path, subreddit_name, cursor)
     
     def _submission_to_post(self, submission: Submission, subreddit_name: str) -> Post:
         """Convert a PRAW submission to our Post model."""
@@ -122,3 +311,267 @@ class RedditClient:
             num_comments=submission.num_comments,
         )
 
+
+class AsyncRedditClient:
+    """
+    Asyncio client for Reddit's JSON listing API.
+    
+    Has the same fetch_subreddit_posts contract as RedditClient (as an async
+    iterator), but all requests share one aiohttp connection pool, so a single
+    event loop can keep many listing requests in flight. Authenticates with
+    the application-only OAuth flow. Falls back to JSON fixtures like
+    RedditClient when the API is not configured.
+    
+    Use as an async context manager:
+        
+        async with AsyncRedditClient(config) as client:
+            listings = await client.fetch_many(["resumes", "jobs"])
+    """
+    
+    TOKEN_URL = "https://www.reddit.com/api/v1/access_token"
+    API_URL = "https://oauth.reddit.com"
+    PAGE_SIZE = 100
+    
+    def __init__(
+        self,
+        config: RedditConfig,
+        fixtures_path: Optional[Path] = None,
+        max_connections: int = 16,
+        rate_limiter: Optional[RateLimiter] = None,
+    ):
+        """
+        Initialize the client.
+        
+        Args:
+            config: Reddit API configuration
+            fixtures_path: Path to JSON fixtures for dry-run mode
+            max_connections: Size of the shared HTTP connection pool
+            rate_limiter: Shared rate limiter every API request is scheduled through
+        """
+        self.config = config
+        self.fixtures_path = fixtures_path
+        self.max_connections = max_connections
+        self.rate_limiter = rate_limiter
+        self._session = None
+        self._token: Optional[str] = None
+        self._token_expires_at = 0.0
+        self._token_lock: Optional[asyncio.Lock] = None
+    
+    @property
+    def is_live(self) -> bool:
+        """Check if we're connected to the live Reddit API."""
+        return self.config.is_configured
+    
+    async def __aenter__(self) -> "AsyncRedditClient":
+        if self.is_live:
+            import aiohttp
+            
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.max_connections),
+                headers={"User-Agent": self.config.user_agent},
+                timeout=aiohttp.ClientTimeout(total=30),
+            )
+            self._token_lock = asyncio.Lock()
+        return self
+    
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+    
+    async def close(self) -> None:
+        """Close the shared connection pool."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+    
+    async def fetch_subreddit_posts(
+        self,
+        subreddit_name: str,
+        limit: int = 25,
+        max_age_hours: int = 72,
+        cursor: Optional[FetchCursor] = None,
+    ) -> AsyncIterator[Post]:
+        """
+        Fetch posts from a subreddit.
+        
+        Args:
+            subreddit_name: Name of the subreddit to fetch from
+            limit: Maximum number of posts to fetch
+            max_age_hours: Only include posts created within this many hours
+            cursor: High-water mark from a previous run; the cursor post and
+                older posts are not yielded
+        
+        Yields:
+            Post objects
+        """
+        if self.is_live:
+            async for post in self._fetch_live(subreddit_name, limit, max_age_hours, cursor):
+                yield post
+        elif self.fixtures_path:
+            for post in _load_fixture_posts(self.fixtures_path, subreddit_name, cursor):
+                yield post
+        else:
+            print(f"[DRY-RUN] Would fetch {limit} posts from r/{subreddit_name}")
+    
+    async def fetch_many(
+        self,
+        subreddit_names: list[str],
+        limit: int = 25,
+        max_age_hours: int = 72,
+        cursors: Optional[dict[str, Optional[FetchCursor]]] = None,
+        max_concurrency: int = 16,
+    ) -> dict[str, list[Post]]:
+        """
+        Fetch several subreddits concurrently.
+        
+        A subreddit that fails (HTTP error, timeout) is logged and left out;
+        the others are still returned.
+        
+        Returns:
+            Mapping of subreddit name to its posts, in the order given
+        """
+        cursors = cursors or {}
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def fetch_one(name: str) -> list[Post]:
+            async with semaphore:
+                return [
+                    post async for post in self.fetch_subreddit_posts(
+                        name, limit, max_age_hours, cursors.get(name)
+                    )
+                ]
+        
+        results = await asyncio.gather(
+            *(fetch_one(name) for name in subreddit_names),
+            return_exceptions=True,
+        )
+        listings = {}
+        for name, result in zip(subreddit_names, results):
+            if isinstance(result, Exception):
+                print(f"[WARN] Failed to fetch r/{name}: {result!r}")
+            elif isinstance(result, BaseException):
+                raise result
+            else:
+                listings[name] = result
+        return listings
+    
+    async def _fetch_live(
+        self,
+        subreddit_name: str,
+        limit: int,
+        max_age_hours: int,
+        cursor: Optional[FetchCursor] = None,
+    ) -> AsyncIterator[Post]:
+        """Page through /r/<subreddit>/new, newest first, stopping like RedditClient."""
+        cutoff_time = datetime.now(timezone.utc).timestamp() - (max_age_hours * 3600)
+        remaining = limit
+        after = None
+        
+        while remaining > 0:
+            params = {"limit": str(min(remaining, self.PAGE_SIZE)), "raw_json": "1"}
+            if after:
+                params["after"] = after
+            listing = await self._get(f"/r/{subreddit_name}/new", params)
+            
+            children = listing["data"]["children"][:remaining]
+            for child in children:
+                data = child["data"]
+                remaining -= 1
+                
+                # Skip stickied posts (pinned to the top regardless of age)
+                if data.get("stickied"):
+                    continue
+                
+                # Everything from here on was seen by a previous run, or is too old
+                if cursor and cursor.is_seen(data["name"], data["created_utc"]):
+                    return
+                if data["created_utc"] < cutoff_time:
+                    return
+                
+                yield _listing_to_post(data, subreddit_name)
+            
+            after = listing["data"].get("after")
+            if not children or not after:
+                return
+    
+    async def _get(self, path: str, params: dict) -> dict:
+        """GET a JSON resource from the OAuth API."""
+        token = await self._get_token()
+        if self.rate_limiter:
+            await self.rate_limiter.acquire_async()
+        async with self._session.get(
+            f"{self.API_URL}{path}",
+            params=params,
+            headers={"Authorization": f"bearer {token}"},
+        ) as response:
+            if self.rate_limiter:
+                # Writes the shared rate limit state to SQLite; keep it off the loop
+                await asyncio.to_thread(self.rate_limiter.update_from_headers, response.headers)
+            response.raise_for_status()
+            return await response.json()
+    
+    async def _get_token(self) -> str:
+        """Get an application-only OAuth token, refreshing it before it expires."""
+        import aiohttp
+        
+        async with self._token_lock:
+            if self._token and time.time() < self._token_expires_at - 60:
+                return self._token
+            
+            async with self._session.post(
+                self.TOKEN_URL,
+                data={"grant_type": "client_credentials"},
+                auth=aiohttp.BasicAuth(self.config.client_id, self.config.client_secret),
+            ) as response:
+                response.raise_for_status()
+                payload = await response.json()
+            
+            self._token = payload["access_token"]
+            self._token_expires_at = time.time() + payload.get("expires_in", 3600)
+            return self._token
+
+
+def _load_fixture_posts(
+    fixtures_path: Path,
+    subreddit_name: str,
+    cursor: Optional[FetchCursor] = None,
+) -> Iterator[Post]:
+    """Load posts for a subreddit from JSON fixtures."""
+    fixture_file = fixtures_path / f"{subreddit_name}.json"
+    
+    if not fixture_file.exists():
+        print(f"[DRY-RUN] No fixture file found for r/{subreddit_name}")
+        return
+    
+    with open(fixture_file) as f:
+        posts_data = json.load(f)
+    
+    for data in posts_data:
+        post = Post(
+            reddit_id=data["id"],
+            subreddit=subreddit_name,
+            title=data["title"],
+            selftext=data.get("selftext", ""),
+            url=data["url"],
+            author=data.get("author", "[deleted]"),
+            created_utc=datetime.fromisoformat(data["created_utc"].replace("Z", "+00:00")),
+            score=data.get("score", 0),
+            num_comments=data.get("num_comments", 0),
+        )
+        if cursor and cursor.is_seen(post.fullname, post.created_utc.timestamp()):
+            continue
+        yield post
+
+
+def _listing_to_post(data: dict, subreddit_name: str) -> Post:
+    """Convert a submission from a JSON listing to our Post model."""
+    return Post(
+        reddit_id=data["id"],
+        subreddit=subreddit_name,
+        title=data["title"],
+        selftext=data.get("selftext") or "",
+        url=f"https://www.reddit.com{data['permalink']}",
+        author=data.get("author") or "[deleted]",
+        created_utc=datetime.fromtimestamp(data["created_utc"], tz=timezone.utc),
+        score=data.get("score", 0),
+        num_comments=data.get("num_comments", 0),
+    )
@@ -0,0 +1,146 @@
+"""Recompute intent scores for posts already in the database."""
+
+import json
+import os
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Callable, NamedTuple, Optional
+
+from .scoring import check_mention_allowed, match_keywords_batch, score_batch
+from .store import Database, PostStatus
+
+# Columns read for each post; everything scoring needs plus the current values
+RESCORE_COLUMNS = [
+    "subreddit", "title", "selftext", "score", "num_comments",
+    "intent_score", "matched_keywords", "mention_allowed", "status",
+]
+
+
+class _StoredPost(NamedTuple):
+    """The slice of a stored post that scoring needs (cheap to pickle)."""
+    id: int
+    subreddit: str
+    title: str
+    selftext: str
+    score: int
+    num_comments: int
+    intent_score: float
+    matched_keywords: str
+    mention_allowed: bool
+    status: str
+
+
+def rescore_posts(
+    db: Database,
+    threshold: float,
+    update_status: bool = False,
+    chunk_size: int = 5000,
+    workers: Optional[int] = None,
+    on_progress: Optional[Callable[[int], None]] = None,
+) -> dict:
+    """
+    Re-score every stored post with the current keyword lists and weights.
+    
+    Posts are streamed from SQLite in chunks and scored on a process pool;
+    only rows whose score, keywords, mention flag or status changed are
+    written back, one transaction per chunk. DUPLICATE posts are left as
+    they are. At most two chunks per worker are in flight, so memory stays
+    bounded however large the table is.
+    
+    Args:
+        db: Database instance
+        threshold: Intent score threshold between NEW and QUEUED
+        update_status: Move NEW/QUEUED posts to the status matching the threshold
+        chunk_size: Posts per chunk
+        workers: Scoring processes (defaults to the CPU count; 1 scores inline)
+        on_progress: Called with the number of posts in each finished chunk
+    
+    Returns:
+        Dictionary with rescore statistics
+    """
+    workers = workers or os.cpu_count() or 1
+    stats = {
+        "scanned": 0,
+        "updated": 0,
+        "status_changed": 0,
+        "elapsed_seconds": 0.0,
+        "rows_per_second": 0.0,
+    }
+    started = time.perf_counter()
+    
+    def apply(result: tuple[int, list[dict]]) -> None:
+        scanned, updates = result
+        stats["scanned"] += scanned
+        updated, status_changed = db.update_scores(updates)
+        stats["updated"] += updated
+        stats["status_changed"] += status_changed
+        if on_progress:
+            on_progress(scanned)
+    
+    chunks = (
+        [_StoredPost(**{**dict(row), "selftext": row["selftext"] or ""}) for row in rows]
+        for rows in db.iter_post_chunks(RESCORE_COLUMNS, chunk_size)
+    )
+    
+    if workers == 1:
+        for chunk in chunks:
+            apply(_rescore_chunk(chunk, threshold, update_status))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            pending: deque[Future] = deque()
+            for chunk in chunks:
+                pending.append(executor.submit(_rescore_chunk, chunk, threshold, update_status))
+                if len(pending) >= workers * 2:
+                    apply(pending.popleft().result())
+            while pending:
+                apply(pending.popleft().result())
+    
+    elapsed = time.perf_counter() - started
+    stats["elapsed_seconds"] = round(elapsed, 2)
+    stats["rows_per_second"] = round(stats["scanned"] / elapsed, 1) if elapsed else 0.0
+    return stats
+
+
+def _rescore_chunk(
+    posts: list[_StoredPost],
+    threshold: float,
+    update_status: bool,
+) -> tuple[int, list[dict]]:
+    """Score a chunk of posts and return the updates for rows that changed."""
+    # Duplicates were never scored and must not be queued
+    scored = [post for post in posts if post.status != PostStatus.DUPLICATE.value]
+    matches = match_keywords_batch(scored)
+    results = score_batch(scored, matches)
+    
+    updates = []
+    for post, post_matches, result in zip(scored, matches, results):
+        mention_allowed = check_mention_allowed(
+            post.title,
+            post.selftext,
+            post.subreddit,
+            matches=post_matches,
+        )
+        
+        status = None
+        if update_status and post.status in (PostStatus.NEW.value, PostStatus.QUEUED.value):
+            new_status = PostStatus.QUEUED if result["score"] >= threshold else PostStatus.NEW
+            if new_status.value != post.status:
+                status = new_status
+        
+        unchanged = (
+            result["score"] == post.intent_score
+            and set(result["matched_keywords"]) == set(json.loads(post.matched_keywords or "[]"))
+            and mention_allowed == bool(post.mention_allowed)
+            and status is None
+        )
+        if not unchanged:
+            updates.append({
+                "id": post.id,
+                "intent_score": result["score"],
+                "matched_keywords": result["matched_keywords"],
+                "mention_allowed": mention_allowed,
+                "status": status,
+            })
+    
+    return len(posts), updates
@@ -1,8 +1,13 @@
 """Intent scoring for Reddit posts."""
 
 import math
-import re
-from typing import Optional
+from functools import lru_cache
+from typing import Optional, Sequence
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy is an optional speedup
+    np = None
 
 from .config import (
     POSITIVE_KEYWORDS,
@@ -11,11 +16,47 @@ from .config import (
     SUBREDDIT_WEIGHTS,
     MENTION_ALLOWED_PHRASES,
 )
+from .matcher import KeywordMatcher
+
+# Phrases that signal a post is hostile to tools or self-promotion
+HOSTILE_INDICATORS = ["spam", "promotion", "sick of", "hate these", "stop promoting"]
 
 
 def normalize_text(text: str) -> str:
     """Normalize text for keyword matching."""
-    return re.sub(r'\s+', ' ', text.lower().strip())
+    # Same as re.sub(r'\s+', ' ', text.lower().strip()), several times faster
+    return " ".join(text.lower().split())
+
+
+@lru_cache(maxsize=1)
+def get_keyword_matcher() -> KeywordMatcher:
+    """
+    Get the keyword matcher for all scoring keyword lists.
+    
+    Built once per process; call ``get_keyword_matcher.cache_clear()`` after
+    changing the keyword lists at runtime.
+    """
+    return KeywordMatcher({
+        "positive": POSITIVE_KEYWORDS,
+        "high_intent": HIGH_INTENT_PHRASES,
+        "negative": NEGATIVE_KEYWORDS,
+        "mention_allowed": MENTION_ALLOWED_PHRASES,
+        "hostile": HOSTILE_INDICATORS,
+    })
+
+
+def match_keywords(title: str, selftext: str) -> dict[str, list[str]]:
+    """
+    Find the keywords of every scoring category in a post in a single pass.
+    
+    The result can be passed to calculate_intent_score and
+    check_mention_allowed to avoid scanning the text twice.
+    
+    Returns:
+        Mapping of category ("positive", "high_intent", "negative",
+        "mention_allowed", "hostile") to matched keywords
+    """
+    return get_keyword_matcher().find(normalize_text(f"{title} {selftext}"))
 
 
 def calculate_intent_score(
@@ -24,6 +65,7 @@ def calculate_intent_score(
     subreddit: str,
     score: int,
     num_comments: int,
+    matches: Optional[dict[str, list[str]]] = None,
 ) -> dict:
     """
     Calculate an intent score for a Reddit post.
@@ -33,54 +75,44 @@ def calculate_intent_score(
     - High-intent phrases: +10 each, capped at +30
     - Subreddit weight multiplier
     - Engagement bonus: log1p(score + num_comments) * 3, capped at +15
+      (no bonus when downvotes make the total negative)
     - Negative keyword penalty: -15 each, capped at -30
     - Short selftext penalty: -10 if < 20 chars
     
+    Args:
+        matches: Precomputed result of match_keywords for this post
+    
     Returns:
         Dictionary with score and metadata
     """
-    combined_text = normalize_text(f"{title} {selftext}")
+    if matches is None:
+        matches = match_keywords(title, selftext)
     
     # Track matched keywords
-    matched_keywords = []
+    matched_keywords = list(matches["positive"])
     
     # Base score
     intent_score = 0.0
     
     # Keyword matches (+5 each, cap at +40)
-    keyword_score = 0
-    for keyword in POSITIVE_KEYWORDS:
-        if keyword.lower() in combined_text:
-            keyword_score += 5
-            matched_keywords.append(keyword)
-    keyword_score = min(keyword_score, 40)
+    keyword_score = min(5 * len(matches["positive"]), 40)
     intent_score += keyword_score
     
     # High-intent phrases (+10 each, cap at +30)
-    phrase_score = 0
-    matched_phrases = []
-    for phrase in HIGH_INTENT_PHRASES:
-        if phrase.lower() in combined_text:
-            phrase_score += 10
-            matched_phrases.append(phrase)
-    phrase_score = min(phrase_score, 30)
+    phrase_score = min(10 * len(matches["high_intent"]), 30)
     intent_score += phrase_score
-    matched_keywords.extend(matched_phrases)
+    matched_keywords.extend(matches["high_intent"])
     
     # Subreddit weight multiplier
     subreddit_weight = SUBREDDIT_WEIGHTS.get(subreddit, 1.0)
     intent_score *= subreddit_weight
     
-    # Engagement bonus (log1p(score + num_comments) * 3, cap at +15)
-    engagement_score = min(math.log1p(score + num_comments) * 3, 15)
+    # Engagement bonus (log1p(score + num_comments) * 3, cap at +15, floor at 0)
+    engagement_score = min(math.log1p(max(score + num_comments, 0)) * 3, 15)
     intent_score += engagement_score
     
     # Negative keyword penalty (-15 each, cap at -30)
-    negative_score = 0
-    for keyword in NEGATIVE_KEYWORDS:
-        if keyword.lower() in combined_text:
-            negative_score -= 15
-    negative_score = max(negative_score, -30)
+    negative_score = max(-15 * len(matches["negative"]), -30)
     intent_score += negative_score
     
     # Short selftext penalty
@@ -99,10 +131,116 @@ def calculate_intent_score(
     }
 
 
+def match_keywords_batch(posts: Sequence) -> list[dict[str, list[str]]]:
+    """
+    Run match_keywords over many posts.
+    
+    Each text is normalized on its own, then the whole batch is searched at
+    once (see KeywordMatcher.find_ids_batch), which is faster than matching
+    post by post.
+    
+    Args:
+        posts: Posts (or any objects with ``title`` and ``selftext``)
+    """
+    matcher = get_keyword_matcher()
+    texts = [normalize_text(f"{post.title} {post.selftext}") for post in posts]
+    return [matcher.group(found) for found in matcher.find_ids_batch(texts)]
+
+
+def score_batch(
+    posts: Sequence,
+    matches: Optional[Sequence[dict[str, list[str]]]] = None,
+) -> list[dict]:
+    """
+    Calculate intent scores for many posts at once.
+    
+    Returns exactly what calculate_intent_score returns for each post, but
+    computes the numeric part (subreddit weights, engagement bonus, penalties
+    and clamping) as array operations when NumPy is installed.
+    
+    Args:
+        posts: Posts (or any objects with ``title``, ``selftext``,
+            ``subreddit``, ``score`` and ``num_comments``)
+        matches: Precomputed result of match_keywords_batch for these posts
+        
+    Returns:
+        One score dictionary per post, in input order
+    """
+    if matches is None:
+        matches = match_keywords_batch(posts)
+    
+    if np is None:
+        return [
+            calculate_intent_score(
+                title=post.title,
+                selftext=post.selftext,
+                subreddit=post.subreddit,
+                score=post.score,
+                num_comments=post.num_comments,
+                matches=post_matches,
+            )
+            for post, post_matches in zip(posts, matches)
+        ]
+    
+    count = len(posts)
+    positive = np.fromiter((len(m["positive"]) for m in matches), dtype=np.int64, count=count)
+    high_intent = np.fromiter((len(m["high_intent"]) for m in matches), dtype=np.int64, count=count)
+    negative = np.fromiter((len(m["negative"]) for m in matches), dtype=np.int64, count=count)
+    weights = np.fromiter(
+        (SUBREDDIT_WEIGHTS.get(post.subreddit, 1.0) for post in posts), dtype=np.float64, count=count
+    )
+    engagement_totals = np.fromiter(
+        (post.score + post.num_comments for post in posts), dtype=np.int64, count=count
+    )
+    short = np.fromiter((len(post.selftext.strip()) < 20 for post in posts), dtype=bool, count=count)
+    
+    # Same operations, in the same order, as calculate_intent_score
+    intent_scores = np.minimum(5 * positive, 40).astype(np.float64)
+    intent_scores += np.minimum(10 * high_intent, 30)
+    intent_scores *= weights
+    engagement = _engagement_bonus(engagement_totals)
+    intent_scores += engagement
+    negative_scores = np.maximum(-15 * negative, -30)
+    intent_scores += negative_scores
+    intent_scores -= np.where(short, 10, 0)
+    intent_scores = np.clip(intent_scores, 0, 100)
+    
+    return [
+        {
+            "score": round(float(intent_score), 2),
+            "matched_keywords": list(set(m["positive"] + m["high_intent"])),
+            "subreddit_weight": float(weight),
+            "engagement_bonus": round(float(bonus), 2),
+            "had_negative_keywords": bool(negative_score < 0),
+        }
+        for m, intent_score, weight, bonus, negative_score in zip(
+            matches, intent_scores, weights, engagement, negative_scores
+        )
+    ]
+
+
+# Engagement bonus reaches its cap of 15 at log1p(x) * 3 >= 15, i.e. x >= 148
+_ENGAGEMENT_CAP_AT = 148
+_ENGAGEMENT_TABLE = [min(math.log1p(total) * 3, 15) for total in range(_ENGAGEMENT_CAP_AT + 1)]
+
+
+def _engagement_bonus(totals):
+    """
+    Vectorized ``min(math.log1p(max(total, 0)) * 3, 15)`` for integer totals.
+    
+    Totals are looked up in a table built with math.log1p, so the result is
+    bit-for-bit what the scalar code computes (np.log1p can differ in the
+    last bit). Negative totals get the bonus of 0, like in the scalar code.
+    """
+    table = np.array(_ENGAGEMENT_TABLE, dtype=np.float64)
+    return table[np.clip(totals, 0, _ENGAGEMENT_CAP_AT)]
+
+
 def check_mention_allowed(
     title: str,
     selftext: str,
     subreddit: str,
+    matches: Optional[dict[str, list[str]]] = None,
 ) -> bool:
     """
     Determine if mentioning HireLab is appropriate.
@@ -115,25 +253,23 @@ def check_mention_allowed(
     - Subreddit is recruitinghell
     - Post tone is hostile to tools/spam
     - Contains spam/promotion keywords
-    """
-    combined_text = normalize_text(f"{title} {selftext}")
     
+    Args:
+        matches: Precomputed result of match_keywords for this post
+    """
     # Never mention in recruitinghell
     if subreddit.lower() == "recruitinghell":
         return False
     
+    if matches is None:
+        matches = match_keywords(title, selftext)
+    
     # Check for hostile/spam indicators
-    hostile_indicators = ["spam", "promotion", "sick of", "hate these", "stop promoting"]
-    for indicator in hostile_indicators:
-        if indicator in combined_text:
-            return False
+    if matches["hostile"]:
+        return False
     
     # Check for tool-request indicators
-    for phrase in MENTION_ALLOWED_PHRASES:
-        if phrase.lower() in combined_text:
-            return True
-    
-    return False
+    return bool(matches["mention_allowed"])
 
 
 def get_match_reasons(post) -> list[str]:
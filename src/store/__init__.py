@@ -1,7 +1,11 @@
 """Database storage module."""
 
-from .db import Database
-from .models import Post, Action, PostStatus, ActionType
-
-__all__ = ["Database", "Post", "Action", "PostStatus", "ActionType"]
+from .db import Database, fts_query
+from .cache import DraftCache, create_draft_cache, draft_cache_key
+from .models import Post, Action, PostStatus, ActionType, FetchCursor, DraftBatch, PostSummary, SearchHit
 
+__all__ = [
+    "Database", "fts_query", "DraftCache", "create_draft_cache", "draft_cache_key",
+    "Post", "Action", "PostStatus", "ActionType", "FetchCursor", "DraftBatch",
+    "PostSummary", "SearchHit",
+]
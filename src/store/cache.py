@@ -0,0 +1,187 @@
+"""Persistent cache of generated drafts, keyed by the prompt inputs."""
+
+import hashlib
+import json
+import threading
+import time
+from typing import TYPE_CHECKING, Optional
+
+from .db import Database
+
+if TYPE_CHECKING:
+    from ..config import AppConfig
+
+
+def draft_cache_key(model: str, system_prompt: str, user_prompt: str, temperature: float) -> str:
+    """
+    Content address of a draft request.
+    
+    Two requests with the same model, prompts and temperature get the same
+    key, so cross-posts and unchanged posts reuse one LLM answer.
+    """
+    payload = json.dumps([model, system_prompt, user_prompt, temperature], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def create_draft_cache(db: Database, app_config: "AppConfig") -> Optional["DraftCache"]:
+    """Get the draft cache configured in app_config, or None if it is disabled."""
+    if app_config.draft_cache_ttl_hours <= 0:
+        return None
+    return DraftCache(
+        db,
+        ttl_seconds=app_config.draft_cache_ttl_hours * 3600,
+        max_entries=app_config.draft_cache_max_entries,
+    )
+
+
+class DraftCache:
+    """
+    Draft cache stored in the draft_cache table.
+    
+    Entries expire ttl_seconds after they were generated, and once the table
+    grows past max_entries the least recently used ones are evicted. Hits and
+    misses are counted per instance and accumulated in the database.
+    
+    Lookups are plain reads. Their hit counters and last use times are kept
+    in memory and written in one transaction every FLUSH_EVERY lookups, with
+    the next put(), or on flush().
+    """
+    
+    # Evict every this many writes, rather than on every write
+    PRUNE_EVERY = 32
+    # Write lookup statistics every this many lookups, rather than on every lookup
+    FLUSH_EVERY = 32
+    
+    def __init__(self, db: Database, ttl_seconds: float = 7 * 24 * 3600, max_entries: int = 5000):
+        """
+        Initialize the cache.
+        
+        Args:
+            db: Database instance
+            ttl_seconds: Age after which an entry is no longer used
+            max_entries: Entries kept after eviction
+        """
+        self.db = db
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._writes = 0
+        self._lock = threading.Lock()
+        # Lookups not yet written: cache_key -> (hits, last_used_at), and counter increments
+        self._pending_hits: dict[str, tuple[int, float]] = {}
+        self._pending_counts = {"hits": 0, "misses": 0}
+    
+    def get(self, key: str) -> Optional[tuple[str, str]]:
+        """Look up cached (draft_a, draft_b), counting the hit or miss."""
+        now = time.time()
+        with self.db._get_connection() as conn:
+            row = conn.execute(
+                "SELECT draft_a, draft_b FROM draft_cache WHERE cache_key = ? AND created_at > ?",
+                (key, now - self.ttl_seconds),
+            ).fetchone()
+        
+        with self._lock:
+            if row:
+                self.hits += 1
+                hits, _ = self._pending_hits.get(key, (0, now))
+                self._pending_hits[key] = (hits + 1, now)
+            else:
+                self.misses += 1
+            self._pending_counts["hits" if row else "misses"] += 1
+            flush = sum(self._pending_counts.values()) >= self.FLUSH_EVERY
+        if flush:
+            self.flush()
+        return (row["draft_a"], row["draft_b"]) if row else None
+    
+    def flush(self) -> None:
+        """Write the hit counters and last use times of pending lookups."""
+        pending = self._take_pending()
+        if pending[0] or any(pending[1].values()):
+            with self.db.transaction() as conn:
+                self._write_pending(conn, *pending)
+    
+    def put(self, key: str, model: str, draft_a: str, draft_b: str) -> None:
+        """Store drafts under a key, replacing any previous entry."""
+        now = time.time()
+        pending = self._take_pending()
+        with self.db.transaction() as conn:
+            self._write_pending(conn, *pending)
+            conn.execute(
+                """
+                INSERT INTO draft_cache (cache_key, model, draft_a, draft_b, created_at, last_used_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(cache_key) DO UPDATE SET
+                    model = excluded.model,
+                    draft_a = excluded.draft_a,
+                    draft_b = excluded.draft_b,
+                    created_at = excluded.created_at,
+                    last_used_at = excluded.last_used_at,
+                    hits = 0
+                """,
+                (key, model, draft_a, draft_b, now, now),
+            )
+        
+        with self._lock:
+            self._writes += 1
+            prune = self._writes % self.PRUNE_EVERY == 0
+        if prune:
+            self.prune()
+    
+    def prune(self) -> int:
+        """
+        Evict expired entries, then the least recently used beyond max_entries.
+        
+        Returns:
+            Number of entries removed
+        """
+        # Recent lookups must count as uses before picking what to evict
+        self.flush()
+        with self.db.transaction() as conn:
+            expired = conn.execute(
+                "DELETE FROM draft_cache WHERE created_at <= ?",
+                (time.time() - self.ttl_seconds,),
+            ).rowcount
+            overflow = conn.execute(
+                """
+                DELETE FROM draft_cache WHERE cache_key IN (
+                    SELECT cache_key FROM draft_cache
+                    ORDER BY last_used_at DESC
+                    LIMIT -1 OFFSET ?
+                )
+                """,
+                (self.max_entries,),
+            ).rowcount
+        return expired + overflow
+    
+    def stats(self) -> dict:
+        """Entry count and lifetime hit/miss counters."""
+        self.flush()
+        with self.db._get_connection() as conn:
+            entries = conn.execute("SELECT COUNT(*) FROM draft_cache").fetchone()[0]
+            counters = dict(conn.execute("SELECT name, value FROM draft_cache_counters").fetchall())
+        return {
+            "entries": entries,
+            "hits": counters.get("hits", 0),
+            "misses": counters.get("misses", 0),
+        }
+    
+    def _take_pending(self) -> tuple[dict[str, tuple[int, float]], dict[str, int]]:
+        with self._lock:
+            pending = (self._pending_hits, self._pending_counts)
+            self._pending_hits = {}
+            self._pending_counts = {"hits": 0, "misses": 0}
+        return pending
+    
+    def _write_pending(self, conn, pending_hits: dict[str, tuple[int, float]], counts: dict[str, int]) -> None:
+        conn.executemany(
+            "UPDATE draft_cache SET last_used_at = MAX(last_used_at, ?), hits = hits + ? WHERE cache_key = ?",
+            [(last_used_at, hits, key) for key, (hits, last_used_at) in pending_hits.items()],
+        )
+        conn.executemany(
+            """
+            INSERT INTO draft_cache_counters (name, value) VALUES (?, ?)
+            ON CONFLICT(name) DO UPDATE SET value = value + excluded.value
+            """,
+            [(name, value) for name, value in counts.items() if value],
+        )
@@ -0,0 +1,79 @@
+"""
+Optional compression of post bodies and drafts.
+
+Values in the post_bodies table are TEXT when stored as they are, or a BLOB
+of the compressed UTF-8 text when compressed. The codec is recognized from
+the BLOB's first bytes, so rows written under any BODY_COMPRESSION setting
+stay readable after it changes.
+
+SQL sees the text through the body_text() function, registered on every
+connection the store opens (see register_functions()). No trigger calls it,
+so other SQLite clients can still write to the database; only reading
+compressed text (e.g. the post_texts view) needs it.
+"""
+
+import sqlite3
+import zlib
+from typing import Optional, Union
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - zstd compression is optional
+    zstandard = None
+
+
+CODECS = ("none", "zlib", "zstd")
+
+# Texts shorter than this are stored as they are; compression barely
+# shrinks them and costs a decompression on every read
+MIN_COMPRESS_BYTES = 256
+
+ZLIB_LEVEL = 6
+ZSTD_LEVEL = 3
+
+# Every zstd frame starts with this; zlib streams start with 0x78
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+
+def check_codec(codec: str) -> None:
+    """
+    Check that a codec can be used to compress.
+    
+    Raises:
+        ValueError: If the codec is unknown
+        RuntimeError: If it is zstd and zstandard is not installed
+    """
+    if codec not in CODECS:
+        raise ValueError(f"Unknown body compression {codec!r} (expected one of: {', '.join(CODECS)})")
+    if codec == "zstd" and zstandard is None:
+        raise RuntimeError("BODY_COMPRESSION=zstd needs the zstandard package (pip install zstandard)")
+
+
+def compress_text(text: Optional[str], codec: str) -> Union[str, bytes, None]:
+    """Value to store for a text: the text itself, or its compressed bytes if they are smaller."""
+    if not text or codec == "none":
+        return text
+    data = text.encode("utf-8")
+    if len(data) < MIN_COMPRESS_BYTES:
+        return text
+    if codec == "zstd":
+        compressed = zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+    else:
+        compressed = zlib.compress(data, ZLIB_LEVEL)
+    return compressed if len(compressed) < len(data) else text
+
+
+def decompress_text(value: Union[str, bytes, None]) -> Optional[str]:
+    """Text of a stored value, whichever way it was stored."""
+    if not isinstance(value, bytes):
+        return value
+    if value[:4] == _ZSTD_MAGIC:
+        if zstandard is None:
+            raise RuntimeError("Post bodies are zstd-compressed; install the zstandard package to read them")
+        return zstandard.ZstdDecompressor().decompress(value).decode("utf-8")
+    return zlib.decompress(value).decode("utf-8")
+
+
+def register_functions(conn: sqlite3.Connection) -> None:
+    """Make body_text(value) available to a connection's SQL, views and triggers."""
+    conn.create_function("body_text", 1, decompress_text, deterministic=True)
@@ -1,72 +1,213 @@
 """SQLite database management."""
 
+import json
 import sqlite3
+import threading
+import time
+import weakref
+from contextlib import contextmanager
 from datetime import datetime
+from functools import partial
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional, Union
 
-from .models import Post, Action, PostStatus, ActionType
+from .. import perf
+from . import migrations
+from .compression import check_codec, compress_text, decompress_text, register_functions
+from .models import (
+    Post, Action, PostStatus, ActionType, FetchCursor, DraftBatch, PostSummary, SearchHit,
+    BODY_FIELDS, SNIPPET_END, SNIPPET_START, to_epoch,
+)
+
+
+# Bound parameters per IN (...) query, below SQLite's historical 999 limit
+_MAX_IN_PARAMS = 500
+
+# Applied to every connection when it is opened
+_CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA cache_size = -65536",  # 64 MiB
+    "PRAGMA mmap_size = 268435456",  # 256 MiB
+    "PRAGMA temp_store = MEMORY",
+)
 
 
 class Database:
-    """SQLite database for storing posts and actions."""
+    """
+    SQLite database for storing posts and actions.
+    
+    Each thread gets one long-lived connection, opened on first use and kept
+    until the thread ends or close() is called. The database runs in WAL
+    mode, so readers never block the fetch writer (or each other). Statements
+    autocommit unless they run inside transaction().
+    
+    Post titles and bodies are indexed for search_posts() in an FTS5 table, when
+    the SQLite build has FTS5 (see fts_enabled). Posts are indexed as they are
+    stored, so other SQLite clients can write to the database without
+    hirelab's SQL functions; posts they delete stay in the index (but not in
+    search results) until rebuild_search_index().
     
-    def __init__(self, db_path: Path):
-        """Initialize database connection."""
+    Post bodies and drafts are kept out of the posts table, in post_bodies, so
+    the rows that queries scan stay small. Posts read by status, recency or
+    search load them on first access (see Post); they can be stored
+    compressed (see compression.py).
+    """
+    
+    def __init__(self, db_path: Path, auto_migrate: bool = True, compression: str = "none"):
+        """
+        Open a database, creating or migrating its schema as needed.
+        
+        Args:
+            db_path: SQLite file
+            auto_migrate: Apply pending schema migrations (off to inspect a
+                database without changing it, see migrate())
+            compression: Codec for post bodies and drafts written from now
+                on: "none", "zlib" or "zstd"
+        
+        Raises:
+            ValueError: If the codec is unknown
+            RuntimeError: If it is zstd and zstandard is not installed
+        """
+        check_codec(compression)
+        self.compression = compression
         self.db_path = db_path
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
-        self._init_db()
+        self._local = threading.local()
+        self._connections: set[sqlite3.Connection] = set()
+        self._connections_lock = threading.Lock()
+        self.fts_enabled = False
+        if auto_migrate:
+            self.migrate()
+        self._check_fts()
+    
+    def __enter__(self) -> "Database":
+        return self
     
-    def _get_connection(self) -> sqlite3.Connection:
-        """Get a database connection."""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+    
+    def _connect(self) -> sqlite3.Connection:
+        """Get this thread's connection, opening it on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(
+                self.db_path,
+                timeout=30,
+                isolation_level=None,
+                check_same_thread=False,
+            )
+            conn.row_factory = sqlite3.Row
+            for pragma in _CONNECTION_PRAGMAS:
+                conn.execute(pragma)
+            register_functions(conn)
+            self._local.conn = conn
+            self._local.depth = 0
+            with self._connections_lock:
+                self._connections.add(conn)
+            # A thread's locals are dropped when it ends (e.g. a draft worker
+            # pool shutting down); close its connection with them
+            self._local.closer = _ConnectionCloser()
+            weakref.finalize(
+                self._local.closer, _close_connection, conn, self._connections, self._connections_lock
+            )
         return conn
     
-    def _init_db(self):
-        """Initialize database schema."""
-        with self._get_connection() as conn:
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS posts (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    reddit_id TEXT UNIQUE NOT NULL,
-                    subreddit TEXT NOT NULL,
-                    title TEXT NOT NULL,
-                    selftext TEXT,
-                    url TEXT NOT NULL,
-                    author TEXT NOT NULL,
-                    created_utc TEXT NOT NULL,
-                    score INTEGER DEFAULT 0,
-                    num_comments INTEGER DEFAULT 0,
-                    matched_keywords TEXT DEFAULT '[]',
-                    intent_score REAL DEFAULT 0.0,
-                    status TEXT DEFAULT 'NEW',
-                    last_seen_at TEXT NOT NULL,
-                    content_hash TEXT NOT NULL,
-                    draft_a TEXT DEFAULT '',
-                    draft_b TEXT DEFAULT '',
-                    mention_allowed INTEGER DEFAULT 0
-                )
-            """)
-            
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS actions (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    reddit_id TEXT NOT NULL,
-                    action_type TEXT NOT NULL,
-                    notes TEXT DEFAULT '',
-                    created_at TEXT NOT NULL,
-                    FOREIGN KEY (reddit_id) REFERENCES posts(reddit_id)
-                )
-            """)
-            
-            # Create indexes
-            conn.execute("CREATE INDEX IF NOT EXISTS idx_posts_reddit_id ON posts(reddit_id)")
-            conn.execute("CREATE INDEX IF NOT EXISTS idx_posts_status ON posts(status)")
-            conn.execute("CREATE INDEX IF NOT EXISTS idx_posts_content_hash ON posts(content_hash)")
-            conn.execute("CREATE INDEX IF NOT EXISTS idx_actions_reddit_id ON actions(reddit_id)")
-            
-            conn.commit()
+    @contextmanager
+    def _get_connection(self) -> Iterator[sqlite3.Connection]:
+        """
+        Get a database connection (timed as db.read outside transactions).
+        
+        For reads only; writes, even single statements, go through
+        transaction() so they are timed as db.write.
+        """
+        conn = self._connect()
+        if self._local.depth:
+            yield conn
+            return
+        with perf.timer("db.read"):
+            yield conn
+    
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """
+        Run a block of statements in a single write transaction.
+        
+        Commits when the block exits normally and rolls back on error. Nested
+        calls join the outermost transaction.
+        """
+        conn = self._connect()
+        if self._local.depth:
+            self._local.depth += 1
+            try:
+                yield conn
+            finally:
+                self._local.depth -= 1
+            return
+        
+        with perf.timer("db.write"):
+            conn.execute("BEGIN IMMEDIATE")
+            self._local.depth = 1
+            try:
+                yield conn
+                conn.execute("COMMIT")
+            except BaseException:
+                # Also after a failed COMMIT (e.g. SQLITE_BUSY), which leaves the
+                # transaction open; some errors have already rolled it back
+                if conn.in_transaction:
+                    conn.execute("ROLLBACK")
+                raise
+            finally:
+                self._local.depth = 0
+    
+    def close(self) -> None:
+        """Close every connection opened by this instance."""
+        with self._connections_lock:
+            connections = list(self._connections)
+            self._connections.clear()
+        for conn in connections:
+            conn.close()
+        self._local = threading.local()
+    
+    def migrate(
+        self,
+        chunk_size: int = migrations.DEFAULT_CHUNK_SIZE,
+        pause: float = migrations.DEFAULT_CHUNK_PAUSE,
+        verbose: bool = False,
+    ) -> list[migrations.Migration]:
+        """
+        Apply pending schema migrations (see migrations.py).
+        
+        Args:
+            chunk_size: Rows copied per transaction when a table is rebuilt
+            pause: Seconds between those transactions, to let other writers in
+            verbose: Print each migration and the progress of rebuilds
+        
+        Returns:
+            The migrations applied
+        """
+        applied = migrations.migrate(self._connect(), chunk_size=chunk_size, pause=pause, verbose=verbose)
+        self._check_fts()
+        return applied
+    
+    def schema_version(self) -> int:
+        """Version of the schema (PRAGMA user_version)."""
+        return migrations.get_version(self._connect())
+    
+    def pending_migrations(self) -> list[migrations.Migration]:
+        """Migrations not applied yet."""
+        return migrations.pending_migrations(self._connect())
+    
+    def _check_fts(self) -> None:
+        self.fts_enabled = self._connect().execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'posts_fts'"
+        ).fetchone() is not None
+    
+    def rebuild_search_index(self) -> None:
+        """Rebuild the full-text index from the posts table and merge its segments."""
+        with self.transaction() as conn:
+            conn.execute("INSERT INTO posts_fts (posts_fts) VALUES ('rebuild')")
+            conn.execute("INSERT INTO posts_fts (posts_fts) VALUES ('optimize')")
     
     def post_exists(self, reddit_id: str) -> bool:
         """Check if a post already exists by reddit_id."""
@@ -89,7 +230,7 @@ class Database:
     
     def save_post(self, post: Post) -> int:
         """Save or update a post."""
-        with self._get_connection() as conn:
+        with self.transaction() as conn:
             data = post.to_dict()
             
             # Check if post exists
@@ -101,8 +242,6 @@ class Database:
                         num_comments = ?,
                         intent_score = ?,
                         last_seen_at = ?,
-                        draft_a = ?,
-                        draft_b = ?,
                         mention_allowed = ?
                     WHERE reddit_id = ?
                 """, (
@@ -110,25 +249,30 @@ class Database:
                     data["num_comments"],
                     data["intent_score"],
                     data["last_seen_at"],
-                    data["draft_a"],
-                    data["draft_b"],
                     data["mention_allowed"],
                     data["reddit_id"],
                 ))
+                post_id = conn.execute(
+                    "SELECT id FROM posts WHERE reddit_id = ?",
+                    (post.reddit_id,)
+                ).fetchone()["id"]
+                conn.execute(
+                    "UPDATE post_bodies SET draft_a = ?, draft_b = ? WHERE post_id = ?",
+                    (self._compress(data["draft_a"]), self._compress(data["draft_b"]), post_id),
+                )
             else:
                 # Insert new post
-                conn.execute("""
+                cursor = conn.execute("""
                     INSERT INTO posts (
-                        reddit_id, subreddit, title, selftext, url, author,
+                        reddit_id, subreddit, title, url, author,
                         created_utc, score, num_comments, matched_keywords,
                         intent_score, status, last_seen_at, content_hash,
-                        draft_a, draft_b, mention_allowed
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                        mention_allowed
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                 """, (
                     data["reddit_id"],
                     data["subreddit"],
                     data["title"],
-                    data["selftext"],
                     data["url"],
                     data["author"],
                     data["created_utc"],
@@ -139,17 +283,201 @@ class Database:
                     data["status"],
                     data["last_seen_at"],
                     data["content_hash"],
-                    data["draft_a"],
-                    data["draft_b"],
                     data["mention_allowed"],
                 ))
+                post_id = cursor.lastrowid
+                self._insert_bodies(conn, [(post_id, data)])
+            return post_id
+    
+    def _compress(self, text: Optional[str]) -> Union[str, bytes, None]:
+        return compress_text(text, self.compression)
+    
+    def _insert_bodies(self, conn: sqlite3.Connection, posts: list[tuple[int, dict]]) -> None:
+        """
+        Store the body and drafts of new posts, given (id, to_dict()) pairs.
+        
+        Also adds the posts to the full-text index, from the uncompressed
+        text: the schema has no triggers that would need body_text() for it.
+        """
+        conn.executemany("""
+            INSERT INTO post_bodies (post_id, selftext, draft_a, draft_b)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT(post_id) DO NOTHING
+        """, [
+            (
+                post_id,
+                self._compress(data["selftext"]),
+                self._compress(data["draft_a"]),
+                self._compress(data["draft_b"]),
+            )
+            for post_id, data in posts
+        ])
+        if self.fts_enabled:
+            conn.executemany(
+                "INSERT INTO posts_fts (rowid, title, selftext) VALUES (?, ?, ?)",
+                [(post_id, data["title"], data["selftext"]) for post_id, data in posts],
+            )
+    
+    def _load_bodies(self, post_id: int) -> dict:
+        """Body and drafts of a post, for Post to load lazily."""
+        with self._get_connection() as conn:
+            row = conn.execute(
+                "SELECT selftext, draft_a, draft_b FROM post_bodies WHERE post_id = ?",
+                (post_id,)
+            ).fetchone()
+        if row is None:
+            return {name: "" for name in BODY_FIELDS}
+        return {name: decompress_text(row[name]) or "" for name in BODY_FIELDS}
+    
+    def _post_from_row(self, row: sqlite3.Row) -> Post:
+        """A post from a row of the posts table, loading its body and drafts on first access."""
+        return Post.from_dict(dict(row), load_bodies=partial(self._load_bodies, row["id"]))
+    
+    def find_existing_ids(self, reddit_ids: list[str]) -> set[str]:
+        """Get the reddit_ids among the given ones that are already stored."""
+        existing: set[str] = set()
+        with self._get_connection() as conn:
+            for chunk in _chunks(list(set(reddit_ids)), _MAX_IN_PARAMS):
+                cursor = conn.execute(
+                    f"SELECT reddit_id FROM posts WHERE reddit_id IN ({','.join('?' * len(chunk))})",
+                    chunk,
+                )
+                existing.update(row["reddit_id"] for row in cursor)
+        return existing
+    
+    def find_content_hashes(self, content_hashes: list[str]) -> dict[str, str]:
+        """
+        Batch version of hash_exists.
+        
+        Returns:
+            Mapping of each stored content hash among the given ones to the
+            reddit_id of the earliest post stored with it
+        """
+        found: dict[str, str] = {}
+        with self._get_connection() as conn:
+            for chunk in _chunks(list(set(content_hashes)), _MAX_IN_PARAMS):
+                cursor = conn.execute(
+                    f"SELECT content_hash, reddit_id FROM posts "
+                    f"WHERE content_hash IN ({','.join('?' * len(chunk))}) ORDER BY id",
+                    chunk,
+                )
+                for row in cursor:
+                    found.setdefault(row["content_hash"], row["reddit_id"])
+        return found
+    
+    def upsert_posts(
+        self,
+        posts: list[Post],
+        actions: Optional[list[Action]] = None,
+    ) -> list[tuple[int, bool]]:
+        """
+        Insert or refresh a batch of posts (and their actions) in one transaction.
+        
+        Posts that already exist only have their engagement and scoring fields
+        refreshed; status, body and drafts are left untouched. Each post's
+        ``id`` is set from the database.
+        
+        Returns:
+            One (id, is_new) tuple per post, in input order
+        """
+        if not posts and not actions:
+            return []
+        
+        with self.transaction() as conn:
+            reddit_ids = [post.reddit_id for post in posts]
+            existing: set[str] = set()
+            for chunk in _chunks(reddit_ids, _MAX_IN_PARAMS):
+                cursor = conn.execute(
+                    f"SELECT reddit_id FROM posts WHERE reddit_id IN ({','.join('?' * len(chunk))})",
+                    chunk,
+                )
+                existing.update(row["reddit_id"] for row in cursor)
             
-            conn.commit()
-            cursor = conn.execute(
-                "SELECT id FROM posts WHERE reddit_id = ?",
-                (post.reddit_id,)
+            rows = [post.to_dict() for post in posts]
+            conn.executemany("""
+                INSERT INTO posts (
+                    reddit_id, subreddit, title, url, author,
+                    created_utc, score, num_comments, matched_keywords,
+                    intent_score, status, last_seen_at, content_hash,
+                    mention_allowed
+                ) VALUES (
+                    :reddit_id, :subreddit, :title, :url, :author,
+                    :created_utc, :score, :num_comments, :matched_keywords,
+                    :intent_score, :status, :last_seen_at, :content_hash,
+                    :mention_allowed
+                )
+                ON CONFLICT(reddit_id) DO UPDATE SET
+                    score = excluded.score,
+                    num_comments = excluded.num_comments,
+                    matched_keywords = excluded.matched_keywords,
+                    intent_score = excluded.intent_score,
+                    last_seen_at = excluded.last_seen_at,
+                    mention_allowed = excluded.mention_allowed
+            """, rows)
+            
+            ids: dict[str, int] = {}
+            for chunk in _chunks(reddit_ids, _MAX_IN_PARAMS):
+                cursor = conn.execute(
+                    f"SELECT id, reddit_id FROM posts WHERE reddit_id IN ({','.join('?' * len(chunk))})",
+                    chunk,
+                )
+                ids.update((row["reddit_id"], row["id"]) for row in cursor)
+            
+            self._insert_bodies(conn, [
+                (ids[row["reddit_id"]], row) for row in rows if row["reddit_id"] not in existing
+            ])
+            
+            if actions:
+                conn.executemany("""
+                    INSERT INTO actions (reddit_id, action_type, notes, created_at)
+                    VALUES (:reddit_id, :action_type, :notes, :created_at)
+                """, [action.to_dict() for action in actions])
+        
+        results = []
+        seen: set[str] = set()
+        for post in posts:
+            post.id = ids[post.reddit_id]
+            results.append((post.id, post.reddit_id not in existing and post.reddit_id not in seen))
+            seen.add(post.reddit_id)
+        return results
+    
+    def save_signatures(self, signatures: list[tuple[str, bytes, list[int]]]) -> None:
+        """
+        Save near-duplicate signatures and their LSH buckets.
+        
+        Args:
+            signatures: (reddit_id, encoded signature, bucket keys) tuples
+        """
+        if not signatures:
+            return
+        
+        with self.transaction() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO post_signatures (reddit_id, minhash) VALUES (?, ?)",
+                [(reddit_id, minhash) for reddit_id, minhash, _ in signatures],
+            )
+            conn.executemany(
+                "INSERT OR IGNORE INTO signature_buckets (bucket, reddit_id) VALUES (?, ?)",
+                [
+                    (bucket, reddit_id)
+                    for reddit_id, _, buckets in signatures
+                    for bucket in buckets
+                ],
             )
-            return cursor.fetchone()["id"]
+    
+    def find_signature_candidates(self, buckets: list[int]) -> list[tuple[str, bytes]]:
+        """Get (reddit_id, encoded signature) of posts sharing any of the buckets."""
+        if not buckets:
+            return []
+        
+        with self._get_connection() as conn:
+            cursor = conn.execute(f"""
+                SELECT DISTINCT s.reddit_id, s.minhash
+                FROM signature_buckets b
+                JOIN post_signatures s ON s.reddit_id = b.reddit_id
+                WHERE b.bucket IN ({','.join('?' * len(buckets))})
+            """, buckets)
+            return [(row["reddit_id"], row["minhash"]) for row in cursor]
     
     def get_post(self, reddit_id: str) -> Optional[Post]:
         """Get a post by reddit_id."""
@@ -160,7 +488,7 @@ class Database:
             )
             row = cursor.fetchone()
             if row:
-                return Post.from_dict(dict(row))
+                return self._post_from_row(row)
             return None
     
     def get_posts_by_status(
@@ -185,22 +513,152 @@ class Database:
             query += " ORDER BY intent_score DESC LIMIT ?"
             params.append(limit)
             
+            cursor = conn.execute(query, params)
+            return [self._post_from_row(row) for row in cursor.fetchall()]
+    
+    def get_post_summaries(
+        self,
+        statuses: list[PostStatus],
+        min_score: Optional[float] = None,
+        limit: int = 100
+    ) -> list[PostSummary]:
+        """
+        Like get_posts_by_status, but only the columns post lists show.
+        
+        Reads only what lists show, without building Post objects.
+        """
+        with self._get_connection() as conn:
+            status_placeholders = ",".join("?" * len(statuses))
+            query = f"""
+                SELECT reddit_id, subreddit, title, intent_score, status FROM posts
+                WHERE status IN ({status_placeholders})
+            """
+            params: list = [s.value for s in statuses]
+            
+            if min_score is not None:
+                query += " AND intent_score >= ?"
+                params.append(min_score)
+            
+            query += " ORDER BY intent_score DESC LIMIT ?"
+            params.append(limit)
+            
+            cursor = conn.execute(query, params)
+            return [PostSummary.from_dict(dict(row)) for row in cursor.fetchall()]
+    
+    def get_posts_without_drafts(
+        self,
+        statuses: list[PostStatus],
+        limit: Optional[int] = None,
+    ) -> list[Post]:
+        """Get posts with the given statuses that have no drafts yet, with their bodies."""
+        with self._get_connection() as conn:
+            status_placeholders = ",".join("?" * len(statuses))
+            query = f"""
+                SELECT posts.*,
+                    body_text(post_bodies.selftext) AS selftext,
+                    body_text(post_bodies.draft_a) AS draft_a,
+                    body_text(post_bodies.draft_b) AS draft_b
+                FROM posts
+                JOIN post_bodies ON post_bodies.post_id = posts.id
+                WHERE status IN ({status_placeholders})
+                AND (post_bodies.draft_a IS NULL OR post_bodies.draft_a = '')
+                ORDER BY intent_score DESC
+            """
+            params: list = [s.value for s in statuses]
+            
+            if limit is not None:
+                query += " LIMIT ?"
+                params.append(limit)
+            
             cursor = conn.execute(query, params)
             return [Post.from_dict(dict(row)) for row in cursor.fetchall()]
     
+    def save_drafts(
+        self,
+        drafts: list[tuple[str, str, str]],
+        notes: Optional[str] = None,
+        overwrite: bool = True,
+    ) -> int:
+        """
+        Store drafts for many posts in one transaction.
+        
+        A DRAFTED action is recorded for every post whose drafts were written.
+        
+        Args:
+            drafts: (reddit_id, draft_a, draft_b) tuples
+            notes: Notes for the DRAFTED actions
+            overwrite: Replace drafts a post already has
+        
+        Returns:
+            Number of posts updated
+        """
+        query = """
+            UPDATE post_bodies SET draft_a = ?, draft_b = ?
+            WHERE post_id = (SELECT id FROM posts WHERE reddit_id = ?)
+        """
+        if not overwrite:
+            query += " AND (draft_a IS NULL OR draft_a = '')"
+        created_at = datetime.utcnow().isoformat()
+        
+        updated = 0
+        with self.transaction() as conn:
+            for reddit_id, draft_a, draft_b in drafts:
+                values = (self._compress(draft_a), self._compress(draft_b), reddit_id)
+                if conn.execute(query, values).rowcount:
+                    conn.execute(
+                        "INSERT INTO actions (reddit_id, action_type, notes, created_at) VALUES (?, ?, ?, ?)",
+                        (reddit_id, ActionType.DRAFTED.value, notes, created_at),
+                    )
+                    updated += 1
+        return updated
+    
+    def recompress_bodies(self, chunk_size: int = 2000) -> int:
+        """
+        Rewrite stored bodies and drafts with the current compression codec.
+        
+        Runs one short transaction per chunk of posts, so it can run while
+        fetches write. Rows already stored that way are left alone.
+        
+        Returns:
+            Number of posts rewritten
+        """
+        rewritten = 0
+        last_id = 0
+        while True:
+            with self.transaction() as conn:
+                rows = conn.execute(
+                    "SELECT post_id, selftext, draft_a, draft_b FROM post_bodies "
+                    "WHERE post_id > ? ORDER BY post_id LIMIT ?",
+                    (last_id, chunk_size),
+                ).fetchall()
+                if not rows:
+                    return rewritten
+                
+                updates = []
+                for row in rows:
+                    stored = tuple(row[name] for name in BODY_FIELDS)
+                    values = tuple(self._compress(decompress_text(value)) for value in stored)
+                    if values != stored:
+                        updates.append(values + (row["post_id"],))
+                conn.executemany(
+                    "UPDATE post_bodies SET selftext = ?, draft_a = ?, draft_b = ? WHERE post_id = ?",
+                    updates,
+                )
+                rewritten += len(updates)
+            last_id = rows[-1]["post_id"]
+    
     def update_status(self, reddit_id: str, status: PostStatus) -> bool:
         """Update the status of a post."""
-        with self._get_connection() as conn:
+        with self.transaction() as conn:
             cursor = conn.execute(
                 "UPDATE posts SET status = ? WHERE reddit_id = ?",
                 (status.value, reddit_id)
             )
-            conn.commit()
             return cursor.rowcount > 0
     
     def save_action(self, action: Action) -> int:
         """Save an action."""
-        with self._get_connection() as conn:
+        with self.transaction() as conn:
             data = action.to_dict()
             cursor = conn.execute("""
                 INSERT INTO actions (reddit_id, action_type, notes, created_at)
@@ -211,7 +669,6 @@ class Database:
                 data["notes"],
                 data["created_at"],
             ))
-            conn.commit()
             return cursor.lastrowid
     
     def get_actions(self, reddit_id: str) -> list[Action]:
@@ -225,14 +682,231 @@ class Database:
     
     def get_recent_posts(self, hours: int = 24, limit: int = 50) -> list[Post]:
         """Get recent posts from the last N hours."""
+        since = int(time.time()) - hours * 3600
         with self._get_connection() as conn:
             cursor = conn.execute("""
-                SELECT * FROM posts 
-                WHERE datetime(created_utc) >= datetime('now', ?)
+                SELECT * FROM posts
+                WHERE created_utc >= ?
                 ORDER BY intent_score DESC
                 LIMIT ?
-            """, (f"-{hours} hours", limit))
-            return [Post.from_dict(dict(row)) for row in cursor.fetchall()]
+            """, (since, limit))
+            return [self._post_from_row(row) for row in cursor.fetchall()]
+    
+    def search_posts(
+        self,
+        query: str,
+        statuses: Optional[list[PostStatus]] = None,
+        subreddits: Optional[list[str]] = None,
+        min_score: Optional[float] = None,
+        since: Optional[datetime] = None,
+        limit: int = 20,
+        offset: int = 0,
+    ) -> list[SearchHit]:
+        """
+        Full-text search over post titles and bodies, best matches first.
+        
+        Args:
+            query: FTS5 query, e.g. `workday ats`, `"cover letter"`, `resum*`,
+                `ats NOT workday` (see fts_query() for plain user input)
+            statuses: Only posts with one of these statuses
+            subreddits: Only posts from one of these subreddits
+            min_score: Minimum intent score
+            since: Only posts created at or after this time (UTC)
+            limit: Maximum hits to return
+            offset: Hits to skip, for pagination
+        
+        Returns:
+            Hits ranked by bm25, title matches counting double
+        
+        Raises:
+            RuntimeError: If the SQLite build has no FTS5
+            sqlite3.OperationalError: If the query is not valid FTS5 syntax
+        """
+        if not self.fts_enabled:
+            raise RuntimeError("Full-text search needs an SQLite build with FTS5")
+        
+        sql = """
+            SELECT posts.*, posts_fts.rank AS rank,
+                highlight(posts_fts, 0, ?1, ?2) AS highlighted_title,
+                snippet(posts_fts, 1, ?1, ?2, '…', 16) AS snippet
+            FROM posts_fts
+            JOIN posts ON posts.id = posts_fts.rowid
+            WHERE posts_fts MATCH ?3
+        """
+        params: list = [SNIPPET_START, SNIPPET_END, query]
+        
+        if statuses:
+            sql += f" AND posts.status IN ({','.join('?' * len(statuses))})"
+            params.extend(s.value for s in statuses)
+        if subreddits:
+            sql += f" AND posts.subreddit COLLATE NOCASE IN ({','.join('?' * len(subreddits))})"
+            params.extend(subreddits)
+        if min_score is not None:
+            sql += " AND posts.intent_score >= ?"
+            params.append(min_score)
+        if since is not None:
+            sql += " AND posts.created_utc >= ?"
+            params.append(to_epoch(since))
+        
+        sql += " ORDER BY posts_fts.rank LIMIT ? OFFSET ?"
+        params.extend([limit, offset])
+        
+        with self._get_connection() as conn:
+            cursor = conn.execute(sql, params)
+            return [
+                SearchHit(
+                    post=self._post_from_row(row),
+                    rank=row["rank"],
+                    title=row["highlighted_title"],
+                    snippet=row["snippet"] or "",
+                )
+                for row in cursor.fetchall()
+            ]
+    
+    def iter_post_chunks(
+        self,
+        columns: list[str],
+        chunk_size: int = 5000,
+    ) -> Iterator[list[sqlite3.Row]]:
+        """
+        Stream selected columns of every post in id order, one chunk at a time.
+        
+        Uses keyset pagination on the primary key, so memory stays bounded by
+        the chunk size and no read transaction is held open between chunks.
+        Rows always include ``id``. Body and draft columns are joined in from
+        post_bodies only when asked for.
+        """
+        select = ", ".join(["id"] + [
+            f"body_text({c}) AS {c}" if c in BODY_FIELDS else c
+            for c in columns if c != "id"
+        ])
+        source = "posts"
+        if any(c in BODY_FIELDS for c in columns):
+            source += " LEFT JOIN post_bodies ON post_bodies.post_id = posts.id"
+        last_id = 0
+        while True:
+            with self._get_connection() as conn:
+                rows = conn.execute(
+                    f"SELECT {select} FROM {source} WHERE id > ? ORDER BY id LIMIT ?",
+                    (last_id, chunk_size),
+                ).fetchall()
+            if not rows:
+                return
+            yield rows
+            last_id = rows[-1]["id"]
+    
+    def update_scores(self, updates: list[dict]) -> tuple[int, int]:
+        """
+        Write back recomputed scoring fields in one transaction.
+        
+        The new status only applies to posts that are still NEW or QUEUED when
+        the update runs, so a post sent, replied to or skipped since it was read
+        keeps its status. DUPLICATE posts are not updated at all.
+        
+        Args:
+            updates: Dicts with ``id``, ``intent_score``, ``matched_keywords``
+                (list), ``mention_allowed`` and ``status`` (PostStatus, or None
+                to keep the current status)
+        
+        Returns:
+            Tuple of (rows updated, rows whose status changed)
+        """
+        if not updates:
+            return 0, 0
+        
+        with self.transaction() as conn:
+            status_changed = conn.executemany("""
+                UPDATE posts SET status = ?1
+                WHERE id = ?2 AND status IN ('NEW', 'QUEUED') AND status != ?1
+            """, [
+                (update["status"].value, update["id"])
+                for update in updates
+                if update["status"]
+            ]).rowcount
+            updated = conn.executemany("""
+                UPDATE posts SET
+                    intent_score = ?,
+                    matched_keywords = ?,
+                    mention_allowed = ?
+                WHERE id = ? AND status != 'DUPLICATE'
+            """, [
+                (
+                    update["intent_score"],
+                    json.dumps(update["matched_keywords"]),
+                    int(update["mention_allowed"]),
+                    update["id"],
+                )
+                for update in updates
+            ]).rowcount
+            return updated, status_changed
+    
+    def count_posts(self) -> int:
+        """Count all stored posts."""
+        with self._get_connection() as conn:
+            return conn.execute("SELECT COUNT(*) FROM posts").fetchone()[0]
+    
+    def get_fetch_cursor(self, subreddit: str) -> Optional[FetchCursor]:
+        """Get the incremental fetch cursor for a subreddit."""
+        with self._get_connection() as conn:
+            cursor = conn.execute(
+                "SELECT * FROM fetch_cursors WHERE subreddit = ?",
+                (subreddit,)
+            )
+            row = cursor.fetchone()
+            if row:
+                return FetchCursor.from_dict(dict(row))
+            return None
+    
+    def save_fetch_cursor(self, fetch_cursor: FetchCursor) -> None:
+        """Save a fetch cursor, never moving an existing one backwards."""
+        with self.transaction() as conn:
+            data = fetch_cursor.to_dict()
+            conn.execute("""
+                INSERT INTO fetch_cursors (subreddit, last_created_utc, last_fullname, updated_at)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT(subreddit) DO UPDATE SET
+                    last_created_utc = excluded.last_created_utc,
+                    last_fullname = excluded.last_fullname,
+                    updated_at = excluded.updated_at
+                WHERE excluded.last_created_utc > fetch_cursors.last_created_utc
+            """, (
+                data["subreddit"],
+                data["last_created_utc"],
+                data["last_fullname"],
+                data["updated_at"],
+            ))
+    
+    def save_draft_batch(self, batch: DraftBatch) -> None:
+        """Save or update a draft batch."""
+        data = batch.to_dict()
+        with self.transaction() as conn:
+            conn.execute("""
+                INSERT INTO draft_batches (
+                    batch_id, input_file_id, reddit_ids, status,
+                    output_file_id, created_at, collected_at
+                ) VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(batch_id) DO UPDATE SET
+                    status = excluded.status,
+                    output_file_id = excluded.output_file_id,
+                    collected_at = excluded.collected_at
+            """, (
+                data["batch_id"],
+                data["input_file_id"],
+                data["reddit_ids"],
+                data["status"],
+                data["output_file_id"],
+                data["created_at"],
+                data["collected_at"],
+            ))
+    
+    def get_draft_batches(self, pending_only: bool = False) -> list[DraftBatch]:
+        """Get draft batches, oldest first."""
+        with self._get_connection() as conn:
+            query = "SELECT * FROM draft_batches"
+            if pending_only:
+                query += " WHERE collected_at IS NULL"
+            cursor = conn.execute(query + " ORDER BY created_at")
+            return [DraftBatch.from_dict(dict(row)) for row in cursor.fetchall()]
     
     def get_stats(self) -> dict:
         """Get database statistics."""
@@ -255,3 +929,37 @@ class Database:
             
             return stats
 
+
+def fts_query(text: str) -> str:
+    """
+    Turn plain search input into an FTS5 query matching every word.
+    
+    Each word is quoted, so punctuation (C++, node.js, "don't") can't break
+    the query syntax; a trailing * is kept as a prefix match.
+    """
+    terms = []
+    for word in text.split():
+        prefix = word.endswith("*")
+        word = word.rstrip("*").replace('"', '""')
+        if word:
+            terms.append(f'"{word}"*' if prefix else f'"{word}"')
+    return " ".join(terms)
+
+
+class _ConnectionCloser:
+    """Stored in a thread's locals; its finalizer closes that thread's connection."""
+
+
+def _close_connection(
+    conn: sqlite3.Connection,
+    connections: set[sqlite3.Connection],
+    lock: threading.Lock,
+) -> None:
+    with lock:
+        connections.discard(conn)
+    conn.close()
+
+
+def _chunks(items: list, size: int) -> list[list]:
+    """Split a list into consecutive chunks of at most ``size`` items."""
+    return [items[i:i + size] for i in range(0, len(items), size)]
@@ -0,0 +1,806 @@
+"""
+Versioned schema migrations for the SQLite store.
+
+The schema version is kept in `PRAGMA user_version`. migrate() applies every
+migration newer than it, in order, each in its own transaction that also
+bumps the version, so a crash leaves the database at a known version and
+several processes opening it at once apply each migration exactly once.
+
+Migrations that rewrite a large table run online instead (see
+TableRebuild): rows are copied into a new table in short transactions,
+triggers mirror the writes other processes make in the meantime, and the
+swap itself is a pair of renames. No transaction holds the write lock for
+longer than building one index. A rebuild that is interrupted resumes
+where it stopped.
+
+To change the schema, append a Migration with the next version number.
+Never edit one that has shipped: databases that already applied it won't
+run it again. Databases created before versioning (user_version 0) replay
+every migration, so each must be a no-op for changes already made.
+"""
+
+import sqlite3
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Callable, Iterator, Optional, Union
+
+from .compression import register_functions
+
+
+# Rows copied per transaction by online rebuilds
+DEFAULT_CHUNK_SIZE = 2000
+
+# Seconds between chunks, so writers waiting on the lock get their turn
+DEFAULT_CHUNK_PAUSE = 0.05
+
+
+@dataclass(frozen=True)
+class SideTable:
+    """
+    A new table a TableRebuild moves some of the old table's columns into.
+    
+    Attributes:
+        name: Table name
+        create: CREATE TABLE statement; the first column holds the row's id
+        columns: Columns to fill, the id column first
+        values: SQL expression for each column, as in TableRebuild.values
+    """
+    name: str
+    create: str
+    columns: tuple[str, ...]
+    values: tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class TableRebuild:
+    """
+    Rewrite a table into a new layout without holding the write lock throughout.
+    
+    Attributes:
+        table: Table to rebuild; must have an INTEGER PRIMARY KEY AUTOINCREMENT
+            `id`, so rows inserted during the rebuild get ids after the copied ones
+        create: CREATE TABLE statement for the new layout, with `{name}` for
+            the table name
+        columns: Columns of the new table to fill
+        values: SQL expression for each column, over the old row's columns
+            prefixed with `{row}` (e.g. "CAST(strftime('%s', {row}created_utc) AS INTEGER)")
+        indexes: (name, columns) of each index of the new table; they are
+            built before the swap, each in its own transaction
+        after_swap: Creates the new table's triggers, which don't follow
+            it through the swap
+        side: Table filled alongside the new one, from the same rows
+    """
+    table: str
+    create: str
+    columns: tuple[str, ...]
+    values: tuple[str, ...]
+    indexes: tuple[tuple[str, str], ...]
+    after_swap: Callable[[sqlite3.Connection], None]
+    side: Optional[SideTable] = None
+    
+    @property
+    def shadow(self) -> str:
+        return f"{self.table}_rebuild"
+    
+    @property
+    def retired(self) -> str:
+        return f"{self.table}_retired"
+    
+    def targets(self) -> list[tuple[str, tuple[str, ...], tuple[str, ...]]]:
+        """(table, columns, values) of each table the old rows are copied into."""
+        targets = [(self.shadow, self.columns, self.values)]
+        if self.side:
+            targets.append((self.side.name, self.side.columns, self.side.values))
+        return targets
+
+
+@dataclass(frozen=True)
+class Migration:
+    """
+    One schema change.
+    
+    `apply` either is a function run inside the migration's transaction, or a
+    TableRebuild run online, in chunks. `skip_if` lets a migration recognize
+    changes a database got before it was versioned.
+    """
+    version: int
+    description: str
+    apply: Union[Callable[[sqlite3.Connection], None], TableRebuild]
+    skip_if: Optional[Callable[[sqlite3.Connection], bool]] = field(default=None)
+
+
+def get_version(conn: sqlite3.Connection) -> int:
+    """Schema version of a database (0 if it predates migrations)."""
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def pending_migrations(conn: sqlite3.Connection) -> list[Migration]:
+    """Migrations not yet applied to a database, in order."""
+    version = get_version(conn)
+    return [migration for migration in MIGRATIONS if migration.version > version]
+
+
+def migrate(
+    conn: sqlite3.Connection,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    pause: float = DEFAULT_CHUNK_PAUSE,
+    verbose: bool = False,
+) -> list[Migration]:
+    """
+    Bring a database's schema up to date.
+    
+    Args:
+        conn: Connection in autocommit mode (isolation_level=None), outside
+            any transaction
+        chunk_size: Rows copied per transaction by online rebuilds
+        pause: Seconds to wait between chunks
+        verbose: Print a line per migration and progress of rebuilds
+    
+    Returns:
+        The migrations this call applied
+    
+    Raises:
+        RuntimeError: If the database is newer than this code
+    """
+    # Views and triggers created by migrations call body_text()
+    register_functions(conn)
+    latest = MIGRATIONS[-1].version
+    version = get_version(conn)
+    if version > latest:
+        raise RuntimeError(
+            f"Database schema version {version} is newer than this version of hirelab "
+            f"supports ({latest}); upgrade hirelab before using it"
+        )
+    
+    # Old tables of rebuilds that swapped but were stopped while deleting them
+    if _table_exists(conn, "schema_migration_progress"):
+        swapped = conn.execute(
+            "SELECT version FROM schema_migration_progress WHERE version <= ?", (version,)
+        ).fetchall()
+        for (swapped_version,) in swapped:
+            _drop_retired(conn, MIGRATIONS[swapped_version - 1], chunk_size, pause)
+    
+    applied = []
+    for migration in MIGRATIONS:
+        if migration.version <= version:
+            continue
+        if verbose:
+            print(f"[INFO] Migrating database to version {migration.version}: {migration.description}")
+        
+        if isinstance(migration.apply, TableRebuild):
+            done = _rebuild_online(conn, migration, chunk_size, pause, verbose)
+        else:
+            with _transaction(conn):
+                # Another process may have applied it while we waited for the lock
+                done = get_version(conn) < migration.version
+                if done:
+                    if not (migration.skip_if and migration.skip_if(conn)):
+                        migration.apply(conn)
+                    _set_version(conn, migration.version)
+        if done:
+            applied.append(migration)
+        version = migration.version
+    return applied
+
+
+@contextmanager
+def _transaction(conn: sqlite3.Connection) -> Iterator[sqlite3.Connection]:
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield conn
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    else:
+        conn.execute("COMMIT")
+
+
+def _set_version(conn: sqlite3.Connection, version: int) -> None:
+    # PRAGMA takes no bound parameters; version is always an int from MIGRATIONS
+    conn.execute(f"PRAGMA user_version = {int(version)}")
+
+
+def _rebuild_online(
+    conn: sqlite3.Connection,
+    migration: Migration,
+    chunk_size: int,
+    pause: float,
+    verbose: bool,
+) -> bool:
+    """
+    Run a TableRebuild in short transactions. Returns False if another process finished it.
+    
+    1. Create the new table under a temporary name (and the side table),
+       with triggers on the old table that mirror every insert, update and
+       delete into them.
+    2. Copy the rows that existed before that, in id order and chunk_size
+       per transaction, recording the last copied id in
+       schema_migration_progress so a restart resumes there.
+    3. Move each index from the old table to the new one, one per
+       transaction.
+    4. In one transaction: rename the old table out of the way and the new
+       one in its place, create its triggers, and bump the version.
+    5. Delete the old table's rows in chunks and drop it.
+    """
+    rebuild = migration.apply
+    table, shadow = rebuild.table, rebuild.shadow
+    
+    with _transaction(conn):
+        if get_version(conn) >= migration.version:
+            return False
+        if migration.skip_if and migration.skip_if(conn):
+            _set_version(conn, migration.version)
+            return True
+        
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS schema_migration_progress (
+                version INTEGER PRIMARY KEY,
+                last_id INTEGER NOT NULL,
+                stop_id INTEGER NOT NULL
+            )
+        """)
+        started = conn.execute(
+            "SELECT 1 FROM schema_migration_progress WHERE version = ?", (migration.version,)
+        ).fetchone()
+        if not started:
+            # Leftovers of a rebuild whose progress row was lost are started over
+            conn.execute(f"DROP TABLE IF EXISTS {shadow}")
+            conn.execute(rebuild.create.format(name=shadow))
+            if rebuild.side:
+                conn.execute(f"DROP TABLE IF EXISTS {rebuild.side.name}")
+                conn.execute(rebuild.side.create)
+            _create_mirror_triggers(conn, rebuild)
+            # Rows after the current last id are written once the triggers
+            # exist, so they are mirrored and the copy can stop there
+            conn.execute(
+                f"INSERT INTO schema_migration_progress (version, last_id, stop_id) "
+                f"SELECT ?, 0, COALESCE(MAX(id), 0) FROM {table}",
+                (migration.version,),
+            )
+    
+    total = conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+    if total and not verbose:
+        print(f"[INFO] Migrating database to version {migration.version}: {migration.description}")
+    
+    copied = 0
+    reported = time.monotonic()
+    while True:
+        with _transaction(conn):
+            if get_version(conn) >= migration.version:
+                return False
+            last_id, stop_id = conn.execute(
+                "SELECT last_id, stop_id FROM schema_migration_progress WHERE version = ?",
+                (migration.version,),
+            ).fetchone()
+            end_id = conn.execute(
+                f"SELECT MAX(id) FROM (SELECT id FROM {table} WHERE id > ? AND id <= ? ORDER BY id LIMIT ?)",
+                (last_id, stop_id, chunk_size),
+            ).fetchone()[0]
+            if end_id is None:
+                break
+            # REPLACE: rows written since the rebuild started are already mirrored
+            for target, columns, values in rebuild.targets():
+                cursor = conn.execute(
+                    f"INSERT OR REPLACE INTO {target} ({', '.join(columns)}) "
+                    f"SELECT {', '.join(value.format(row='') for value in values)} "
+                    f"FROM {table} WHERE id > ? AND id <= ?",
+                    (last_id, end_id),
+                )
+                if target == shadow:
+                    copied += cursor.rowcount
+            conn.execute(
+                "UPDATE schema_migration_progress SET last_id = ? WHERE version = ?",
+                (end_id, migration.version),
+            )
+        
+        if verbose and time.monotonic() - reported >= 5:
+            print(f"[INFO]   copied {copied:,} of ~{total:,} rows")
+            reported = time.monotonic()
+        if pause:
+            time.sleep(pause)
+    
+    for name, columns in rebuild.indexes:
+        with _transaction(conn):
+            if get_version(conn) >= migration.version:
+                return False
+            built = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = ? AND tbl_name = ?",
+                (name, shadow),
+            ).fetchone()
+            if not built:
+                # Index names are per database, so the old table's goes first
+                conn.execute(f"DROP INDEX IF EXISTS {name}")
+                conn.execute(f"CREATE INDEX {name} ON {shadow} ({columns})")
+    
+    with _transaction(conn):
+        if get_version(conn) >= migration.version:
+            return False
+        # Triggers stay with the renamed table; the full-text ones must not
+        # fire as its rows are deleted, and the mirror ones are done
+        triggers = conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'trigger' AND tbl_name = ?", (table,)
+        ).fetchall()
+        for (trigger,) in triggers:
+            conn.execute(f"DROP TRIGGER {trigger}")
+        # Legacy mode renames without rewriting views and triggers that name
+        # the table; they refer to the new one once it has the old name
+        conn.execute("PRAGMA legacy_alter_table = ON")
+        try:
+            conn.execute(f"ALTER TABLE {table} RENAME TO {rebuild.retired}")
+            conn.execute(f"ALTER TABLE {shadow} RENAME TO {table}")
+        finally:
+            conn.execute("PRAGMA legacy_alter_table = OFF")
+        rebuild.after_swap(conn)
+        _set_version(conn, migration.version)
+    
+    _drop_retired(conn, migration, chunk_size, pause)
+    return True
+
+
+def _drop_retired(conn: sqlite3.Connection, migration: Migration, chunk_size: int, pause: float) -> None:
+    """
+    Delete the old table of a swapped rebuild in chunks, then drop it.
+    
+    Dropping a large table at once would hold the write lock while every
+    page is freed. The progress row is removed last, so migrate() finishes
+    the job if it is interrupted.
+    """
+    retired = migration.apply.retired
+    while True:
+        with _transaction(conn):
+            deleted = 0
+            if _table_exists(conn, retired):
+                deleted = conn.execute(
+                    f"DELETE FROM {retired} WHERE id IN (SELECT id FROM {retired} ORDER BY id LIMIT ?)",
+                    (chunk_size,),
+                ).rowcount
+            if deleted < chunk_size:
+                conn.execute(f"DROP TABLE IF EXISTS {retired}")
+                conn.execute("DELETE FROM schema_migration_progress WHERE version = ?", (migration.version,))
+                return
+        if pause:
+            time.sleep(pause)
+
+
+def _create_mirror_triggers(conn: sqlite3.Connection, rebuild: TableRebuild) -> None:
+    """Triggers copying writes to the old table into the new one while it is filled."""
+    table, shadow = rebuild.table, rebuild.shadow
+    upserts = "".join(
+        f"INSERT OR REPLACE INTO {target} ({', '.join(columns)}) "
+        f"VALUES ({', '.join(value.format(row='new.') for value in values)});\n"
+        for target, columns, values in rebuild.targets()
+    )
+    deletes = "".join(
+        f"DELETE FROM {target} WHERE {columns[0]} = old.id;\n"
+        for target, columns, _ in rebuild.targets()
+    )
+    for event, body in (("INSERT", upserts), ("UPDATE", upserts), ("DELETE", deletes)):
+        conn.execute(f"DROP TRIGGER IF EXISTS {shadow}_{event.lower()}")
+        conn.execute(f"CREATE TRIGGER {shadow}_{event.lower()} AFTER {event} ON {table} BEGIN\n{body}END")
+
+
+def _table_exists(conn: sqlite3.Connection, name: str) -> bool:
+    return conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (name,)
+    ).fetchone() is not None
+
+
+def _column_type(conn: sqlite3.Connection, table: str, column: str) -> Optional[str]:
+    for row in conn.execute(f"PRAGMA table_info({table})"):
+        if row[1] == column:
+            return row[2].upper()
+    return None
+
+
+# --- 1: tables as they were before schema versioning ---
+
+def _create_base_schema(conn: sqlite3.Connection) -> None:
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS posts (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            reddit_id TEXT UNIQUE NOT NULL,
+            subreddit TEXT NOT NULL,
+            title TEXT NOT NULL,
+            selftext TEXT,
+            url TEXT NOT NULL,
+            author TEXT NOT NULL,
+            created_utc TEXT NOT NULL,
+            score INTEGER DEFAULT 0,
+            num_comments INTEGER DEFAULT 0,
+            matched_keywords TEXT DEFAULT '[]',
+            intent_score REAL DEFAULT 0.0,
+            status TEXT DEFAULT 'NEW',
+            last_seen_at TEXT NOT NULL,
+            content_hash TEXT NOT NULL,
+            draft_a TEXT DEFAULT '',
+            draft_b TEXT DEFAULT '',
+            mention_allowed INTEGER DEFAULT 0
+        )
+    """)
+    
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS actions (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            reddit_id TEXT NOT NULL,
+            action_type TEXT NOT NULL,
+            notes TEXT DEFAULT '',
+            created_at TEXT NOT NULL,
+            FOREIGN KEY (reddit_id) REFERENCES posts(reddit_id)
+        )
+    """)
+    
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS fetch_cursors (
+            subreddit TEXT PRIMARY KEY,
+            last_created_utc REAL NOT NULL,
+            last_fullname TEXT NOT NULL,
+            updated_at TEXT NOT NULL
+        )
+    """)
+    
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS post_signatures (
+            reddit_id TEXT PRIMARY KEY,
+            minhash BLOB NOT NULL
+        )
+    """)
+    
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS signature_buckets (
+            bucket INTEGER NOT NULL,
+            reddit_id TEXT NOT NULL,
+            PRIMARY KEY (bucket, reddit_id)
+        ) WITHOUT ROWID
+    """)
+    
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS draft_cache (
+            cache_key TEXT PRIMARY KEY,
+            model TEXT NOT NULL,
+            draft_a TEXT NOT NULL,
+            draft_b TEXT NOT NULL,
+            created_at REAL NOT NULL,
+            last_used_at REAL NOT NULL,
+            hits INTEGER DEFAULT 0
+        )
+    """)
+    
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS draft_cache_counters (
+            name TEXT PRIMARY KEY,
+            value INTEGER NOT NULL
+        )
+    """)
+    
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS draft_batches (
+            batch_id TEXT PRIMARY KEY,
+            input_file_id TEXT NOT NULL,
+            reddit_ids TEXT NOT NULL,
+            status TEXT NOT NULL,
+            output_file_id TEXT,
+            created_at TEXT NOT NULL,
+            collected_at TEXT
+        )
+    """)
+    
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_posts_reddit_id ON posts(reddit_id)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_posts_status ON posts(status)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_posts_content_hash ON posts(content_hash)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_actions_reddit_id ON actions(reddit_id)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_draft_cache_last_used ON draft_cache(last_used_at)")
+
+
+# --- 2: full-text index ---
+
+def _create_fts_triggers(conn: sqlite3.Connection) -> None:
+    """Keep posts_fts in step with posts (external content: the text lives only in posts)."""
+    if not _table_exists(conn, "posts_fts"):
+        return
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS posts_fts_insert AFTER INSERT ON posts BEGIN
+            INSERT INTO posts_fts (rowid, title, selftext) VALUES (new.id, new.title, new.selftext);
+        END
+    """)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS posts_fts_delete AFTER DELETE ON posts BEGIN
+            INSERT INTO posts_fts (posts_fts, rowid, title, selftext) VALUES ('delete', old.id, old.title, old.selftext);
+        END
+    """)
+    # Only fires when the text itself is written, not on score or status updates
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS posts_fts_update AFTER UPDATE OF title, selftext ON posts BEGIN
+            INSERT INTO posts_fts (posts_fts, rowid, title, selftext) VALUES ('delete', old.id, old.title, old.selftext);
+            INSERT INTO posts_fts (rowid, title, selftext) VALUES (new.id, new.title, new.selftext);
+        END
+    """)
+
+
+def _create_fts(conn: sqlite3.Connection) -> None:
+    try:
+        conn.execute("SAVEPOINT create_fts")
+        conn.execute("""
+            CREATE VIRTUAL TABLE posts_fts USING fts5(
+                title, selftext,
+                content = 'posts', content_rowid = 'id',
+                tokenize = 'porter unicode61 remove_diacritics 2'
+            )
+        """)
+        # bm25 with title matches weighted twice body matches, used by ORDER BY rank
+        conn.execute("INSERT INTO posts_fts (posts_fts, rank) VALUES ('rank', 'bm25(2.0, 1.0)')")
+        # Index posts stored before the index existed
+        conn.execute("INSERT INTO posts_fts (posts_fts) VALUES ('rebuild')")
+        conn.execute("RELEASE create_fts")
+    except sqlite3.OperationalError as e:
+        conn.execute("ROLLBACK TO create_fts")
+        conn.execute("RELEASE create_fts")
+        print(f"[WARN] Full-text search unavailable (SQLite built without FTS5?): {e}")
+        return
+    _create_fts_triggers(conn)
+
+
+# --- 3: indexes for status lists and recent posts ---
+
+def _create_list_indexes(conn: sqlite3.Connection) -> None:
+    # Status lists come out in score order straight from the index; it also
+    # serves status-only lookups, so the single-column index is dropped
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_posts_status_score ON posts(status, intent_score DESC)")
+    conn.execute("DROP INDEX IF EXISTS idx_posts_status")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_posts_created ON posts(created_utc)")
+
+
+# --- 4: epoch timestamps ---
+
+# SQLite can't change a column's type in place (and TEXT affinity would turn
+# stored integers back into text), so posts is copied into a table with
+# INTEGER timestamps. Ids are kept, so the full-text index stays valid.
+_EPOCH_TIMESTAMPS = TableRebuild(
+    table="posts",
+    create="""
+        CREATE TABLE {name} (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            reddit_id TEXT UNIQUE NOT NULL,
+            subreddit TEXT NOT NULL,
+            title TEXT NOT NULL,
+            selftext TEXT,
+            url TEXT NOT NULL,
+            author TEXT NOT NULL,
+            created_utc INTEGER NOT NULL,
+            score INTEGER DEFAULT 0,
+            num_comments INTEGER DEFAULT 0,
+            matched_keywords TEXT DEFAULT '[]',
+            intent_score REAL DEFAULT 0.0,
+            status TEXT DEFAULT 'NEW',
+            last_seen_at INTEGER NOT NULL,
+            content_hash TEXT NOT NULL,
+            draft_a TEXT DEFAULT '',
+            draft_b TEXT DEFAULT '',
+            mention_allowed INTEGER DEFAULT 0
+        )
+    """,
+    columns=(
+        "id", "reddit_id", "subreddit", "title", "selftext", "url", "author",
+        "created_utc", "score", "num_comments", "matched_keywords", "intent_score",
+        "status", "last_seen_at", "content_hash", "draft_a", "draft_b", "mention_allowed",
+    ),
+    values=(
+        "{row}id", "{row}reddit_id", "{row}subreddit", "{row}title", "{row}selftext", "{row}url",
+        "{row}author", "CAST(strftime('%s', {row}created_utc) AS INTEGER)", "{row}score",
+        "{row}num_comments", "{row}matched_keywords", "{row}intent_score", "{row}status",
+        "CAST(strftime('%s', {row}last_seen_at) AS INTEGER)", "{row}content_hash",
+        "{row}draft_a", "{row}draft_b", "{row}mention_allowed",
+    ),
+    indexes=(
+        ("idx_posts_reddit_id", "reddit_id"),
+        ("idx_posts_content_hash", "content_hash"),
+        ("idx_posts_status_score", "status, intent_score DESC"),
+        ("idx_posts_created", "created_utc"),
+    ),
+    after_swap=_create_fts_triggers,
+)
+
+
+# --- 5: ISO timestamps view ---
+
+def _create_posts_iso_view(conn: sqlite3.Connection) -> None:
+    """posts with ISO 8601 timestamps, as stored before they were epoch seconds."""
+    conn.execute("""
+        CREATE VIEW IF NOT EXISTS posts_iso AS SELECT
+            id, reddit_id, subreddit, title, selftext, url, author,
+            strftime('%Y-%m-%dT%H:%M:%S+00:00', created_utc, 'unixepoch') AS created_utc,
+            score, num_comments, matched_keywords, intent_score, status,
+            strftime('%Y-%m-%dT%H:%M:%S+00:00', last_seen_at, 'unixepoch') AS last_seen_at,
+            content_hash, draft_a, draft_b, mention_allowed
+        FROM posts
+    """)
+
+
+# --- 6: bodies and drafts in post_bodies ---
+
+def _create_body_fts_triggers(conn: sqlite3.Connection) -> None:
+    """Keep posts_fts in step with posts and post_bodies, which a post is written to in that order."""
+    if not _table_exists(conn, "posts_fts"):
+        return
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS posts_fts_insert AFTER INSERT ON post_bodies BEGIN
+            INSERT INTO posts_fts (rowid, title, selftext)
+            SELECT id, title, body_text(new.selftext) FROM posts WHERE id = new.post_id;
+        END
+    """)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS posts_fts_delete AFTER DELETE ON posts BEGIN
+            INSERT INTO posts_fts (posts_fts, rowid, title, selftext)
+            SELECT 'delete', old.id, old.title, body_text(selftext) FROM post_bodies WHERE post_id = old.id;
+            DELETE FROM post_bodies WHERE post_id = old.id;
+        END
+    """)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS posts_fts_update_title AFTER UPDATE OF title ON posts BEGIN
+            INSERT INTO posts_fts (posts_fts, rowid, title, selftext)
+            SELECT 'delete', old.id, old.title, body_text(selftext) FROM post_bodies WHERE post_id = old.id;
+            INSERT INTO posts_fts (rowid, title, selftext)
+            SELECT new.id, new.title, body_text(selftext) FROM post_bodies WHERE post_id = new.id;
+        END
+    """)
+    # Not when only drafts change, or a body is recompressed
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS posts_fts_update_body AFTER UPDATE OF selftext ON post_bodies
+        WHEN body_text(old.selftext) IS NOT body_text(new.selftext) BEGIN
+            INSERT INTO posts_fts (posts_fts, rowid, title, selftext)
+            SELECT 'delete', id, title, body_text(old.selftext) FROM posts WHERE id = old.post_id;
+            INSERT INTO posts_fts (rowid, title, selftext)
+            SELECT id, title, body_text(new.selftext) FROM posts WHERE id = new.post_id;
+        END
+    """)
+
+
+def _repoint_fts(conn: sqlite3.Connection) -> None:
+    """
+    Make posts_fts read its text from the post_texts view instead of posts.
+    
+    FTS5 can't change a table's content source, but the index itself stays
+    the same: its shadow tables are copied into a table declared with the new
+    source, which is much faster than tokenizing every post again.
+    """
+    if not _table_exists(conn, "posts_fts"):
+        return
+    conn.execute("DROP TABLE IF EXISTS posts_fts_new")
+    conn.execute("""
+        CREATE VIRTUAL TABLE posts_fts_new USING fts5(
+            title, selftext,
+            content = 'post_texts', content_rowid = 'id',
+            tokenize = 'porter unicode61 remove_diacritics 2'
+        )
+    """)
+    for shadow in ("data", "idx", "docsize", "config"):
+        conn.execute(f"DELETE FROM posts_fts_new_{shadow}")
+        conn.execute(f"INSERT INTO posts_fts_new_{shadow} SELECT * FROM posts_fts_{shadow}")
+    conn.execute("DROP TABLE posts_fts")
+    conn.execute("ALTER TABLE posts_fts_new RENAME TO posts_fts")
+
+
+def _finish_post_bodies(conn: sqlite3.Connection) -> None:
+    # Renaming posts_fts checks every view, and this one names the moved columns
+    conn.execute("DROP VIEW IF EXISTS posts_iso")
+    # What the full-text index reads titles and (decompressed) bodies from
+    conn.execute("""
+        CREATE VIEW IF NOT EXISTS post_texts AS
+        SELECT posts.id AS id, posts.title AS title, body_text(post_bodies.selftext) AS selftext
+        FROM posts JOIN post_bodies ON post_bodies.post_id = posts.id
+    """)
+    _repoint_fts(conn)
+    _create_body_fts_triggers(conn)
+    # Bodies and drafts appear as stored: text, or a BLOB if compressed
+    conn.execute("""
+        CREATE VIEW posts_iso AS SELECT
+            posts.id, reddit_id, subreddit, title, post_bodies.selftext, url, author,
+            strftime('%Y-%m-%dT%H:%M:%S+00:00', created_utc, 'unixepoch') AS created_utc,
+            score, num_comments, matched_keywords, intent_score, status,
+            strftime('%Y-%m-%dT%H:%M:%S+00:00', last_seen_at, 'unixepoch') AS last_seen_at,
+            content_hash, post_bodies.draft_a, post_bodies.draft_b, mention_allowed
+        FROM posts LEFT JOIN post_bodies ON post_bodies.post_id = posts.id
+    """)
+
+
+# Bodies and drafts are most of a row's bytes but only read for one post at
+# a time, so they move out of posts: scans and index lookups on posts then
+# touch a fraction of the pages. Ids are kept, so the full-text index stays valid.
+_POST_BODIES = TableRebuild(
+    table="posts",
+    create="""
+        CREATE TABLE {name} (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            reddit_id TEXT UNIQUE NOT NULL,
+            subreddit TEXT NOT NULL,
+            title TEXT NOT NULL,
+            url TEXT NOT NULL,
+            author TEXT NOT NULL,
+            created_utc INTEGER NOT NULL,
+            score INTEGER DEFAULT 0,
+            num_comments INTEGER DEFAULT 0,
+            matched_keywords TEXT DEFAULT '[]',
+            intent_score REAL DEFAULT 0.0,
+            status TEXT DEFAULT 'NEW',
+            last_seen_at INTEGER NOT NULL,
+            content_hash TEXT NOT NULL,
+            mention_allowed INTEGER DEFAULT 0
+        )
+    """,
+    columns=(
+        "id", "reddit_id", "subreddit", "title", "url", "author", "created_utc", "score",
+        "num_comments", "matched_keywords", "intent_score", "status", "last_seen_at",
+        "content_hash", "mention_allowed",
+    ),
+    values=(
+        "{row}id", "{row}reddit_id", "{row}subreddit", "{row}title", "{row}url", "{row}author",
+        "{row}created_utc", "{row}score", "{row}num_comments", "{row}matched_keywords",
+        "{row}intent_score", "{row}status", "{row}last_seen_at", "{row}content_hash",
+        "{row}mention_allowed",
+    ),
+    indexes=(
+        ("idx_posts_reddit_id", "reddit_id"),
+        ("idx_posts_content_hash", "content_hash"),
+        ("idx_posts_status_score", "status, intent_score DESC"),
+        ("idx_posts_created", "created_utc"),
+    ),
+    after_swap=_finish_post_bodies,
+    side=SideTable(
+        name="post_bodies",
+        # No column types: values are TEXT, or BLOB when compressed (see compression.py)
+        create="""
+            CREATE TABLE post_bodies (
+                post_id INTEGER PRIMARY KEY REFERENCES posts(id),
+                selftext,
+                draft_a DEFAULT '',
+                draft_b DEFAULT ''
+            )
+        """,
+        columns=("post_id", "selftext", "draft_a", "draft_b"),
+        values=("{row}id", "{row}selftext", "{row}draft_a", "{row}draft_b"),
+    ),
+)
+
+
+# --- 7: search index triggers without body_text() ---
+
+def _create_plain_fts_triggers(conn: sqlite3.Connection) -> None:
+    """
+    Replace the triggers that call body_text() with one that doesn't.
+    
+    Triggers run on every connection that writes, but body_text() is only
+    registered on the store's own, so deleting a post from another SQLite
+    client failed with "no such function: body_text". Database now indexes
+    a post's text itself when it stores the post (posts are never retitled
+    or given a new body); the trigger left removes a deleted post's body.
+    """
+    for trigger in (
+        "posts_fts_insert", "posts_fts_update", "posts_fts_delete",
+        "posts_fts_update_title", "posts_fts_update_body",
+    ):
+        conn.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS post_bodies_delete AFTER DELETE ON posts BEGIN
+            DELETE FROM post_bodies WHERE post_id = old.id;
+        END
+    """)
+
+
+MIGRATIONS = [
+    Migration(1, "base schema", _create_base_schema),
+    Migration(
+        2, "full-text index over post titles and bodies", _create_fts,
+        skip_if=lambda conn: _table_exists(conn, "posts_fts"),
+    ),
+    Migration(3, "indexes for status lists and recent posts", _create_list_indexes),
+    Migration(
+        4, "store post timestamps as epoch seconds", _EPOCH_TIMESTAMPS,
+        skip_if=lambda conn: _column_type(conn, "posts", "created_utc") == "INTEGER",
+    ),
+    Migration(5, "posts_iso view with ISO 8601 timestamps", _create_posts_iso_view),
+    Migration(
+        6, "move post bodies and drafts to post_bodies", _POST_BODIES,
+        skip_if=lambda conn: _column_type(conn, "posts", "selftext") is None,
+    ),
+    Migration(7, "search index triggers without body_text()", _create_plain_fts_triggers),
+]
@@ -1,12 +1,30 @@
 """Data models for the Reddit listener."""
 
 from dataclasses import dataclass, field
-from datetime import datetime
+from datetime import datetime, timezone
 from enum import Enum
-from typing import Optional
+from typing import Callable, Optional
 import json
 
 
+def to_epoch(value: datetime) -> int:
+    """Whole seconds since the epoch; naive datetimes are taken as UTC."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return int(value.timestamp())
+
+
+def _from_epoch(value, tz: Optional[timezone] = None) -> datetime:
+    """Parse a stored timestamp: epoch seconds, or ISO text from older rows."""
+    if isinstance(value, (int, float)):
+        if tz is None:
+            return datetime.utcfromtimestamp(value)
+        return datetime.fromtimestamp(value, tz)
+    if isinstance(value, str):
+        return datetime.fromisoformat(value)
+    return value
+
+
 class PostStatus(str, Enum):
     """Status of a Reddit post in our system."""
     NEW = "NEW"
@@ -26,9 +44,18 @@ class ActionType(str, Enum):
     MARK_SKIPPED = "MARK_SKIPPED"
 
 
+# Post fields stored in the post_bodies table rather than posts
+BODY_FIELDS = ("selftext", "draft_a", "draft_b")
+
+
 @dataclass
 class Post:
-    """Represents a Reddit post."""
+    """
+    Represents a Reddit post.
+    
+    Posts read from the database without their body and drafts (see
+    BODY_FIELDS) load them together the first time one of them is accessed.
+    """
     reddit_id: str
     subreddit: str
     title: str
@@ -44,10 +71,28 @@ class Post:
     last_seen_at: datetime = field(default_factory=datetime.utcnow)
     content_hash: str = ""
     id: Optional[int] = None
-    draft_a: str = ""
-    draft_b: str = ""
+    # default_factory leaves no class attribute that would hide an unloaded draft from __getattr__
+    draft_a: str = field(default_factory=str)
+    draft_b: str = field(default_factory=str)
     mention_allowed: bool = False
     
+    @property
+    def fullname(self) -> str:
+        """Reddit fullname (type-prefixed ID) of the submission."""
+        return f"t3_{self.reddit_id}"
+    
+    def __getattr__(self, name: str):
+        # Only reached for attributes that aren't set: the body fields of a
+        # post read without them
+        load_bodies = self.__dict__.get("_load_bodies")
+        if name in BODY_FIELDS and load_bodies is not None:
+            del self.__dict__["_load_bodies"]
+            for field_name, value in load_bodies().items():
+                # Keep fields assigned in the meantime (new drafts)
+                self.__dict__.setdefault(field_name, value)
+            return self.__dict__[name]
+        raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+    
     def to_dict(self) -> dict:
         """Convert to dictionary for database storage."""
         return {
@@ -57,13 +102,13 @@ class Post:
             "selftext": self.selftext,
             "url": self.url,
             "author": self.author,
-            "created_utc": self.created_utc.isoformat(),
+            "created_utc": to_epoch(self.created_utc),
             "score": self.score,
             "num_comments": self.num_comments,
             "matched_keywords": json.dumps(self.matched_keywords),
             "intent_score": self.intent_score,
             "status": self.status.value,
-            "last_seen_at": self.last_seen_at.isoformat(),
+            "last_seen_at": to_epoch(self.last_seen_at),
             "content_hash": self.content_hash,
             "draft_a": self.draft_a,
             "draft_b": self.draft_b,
@@ -71,28 +116,89 @@ class Post:
         }
     
     @classmethod
-    def from_dict(cls, data: dict) -> "Post":
-        """Create from dictionary."""
-        return cls(
+    def from_dict(cls, data: dict, load_bodies: Optional[Callable[[], dict]] = None) -> "Post":
+        """
+        Create from dictionary.
+        
+        Args:
+            data: Column values
+            load_bodies: Returns the BODY_FIELDS missing from data, called
+                when one of them is first accessed
+        """
+        post = cls(
             id=data.get("id"),
             reddit_id=data["reddit_id"],
             subreddit=data["subreddit"],
             title=data["title"],
-            selftext=data["selftext"],
+            selftext=data.get("selftext", ""),
             url=data["url"],
             author=data["author"],
-            created_utc=datetime.fromisoformat(data["created_utc"]) if isinstance(data["created_utc"], str) else data["created_utc"],
+            created_utc=_from_epoch(data["created_utc"], timezone.utc),
             score=data["score"],
             num_comments=data["num_comments"],
             matched_keywords=json.loads(data["matched_keywords"]) if isinstance(data["matched_keywords"], str) else data["matched_keywords"],
             intent_score=data["intent_score"],
             status=PostStatus(data["status"]),
-            last_seen_at=datetime.fromisoformat(data["last_seen_at"]) if isinstance(data["last_seen_at"], str) else data["last_seen_at"],
+            last_seen_at=_from_epoch(data["last_seen_at"]),
             content_hash=data["content_hash"],
             draft_a=data.get("draft_a", ""),
             draft_b=data.get("draft_b", ""),
             mention_allowed=bool(data.get("mention_allowed", False)),
         )
+        if load_bodies is not None:
+            for name in BODY_FIELDS:
+                if name not in data:
+                    del post.__dict__[name]
+            post.__dict__["_load_bodies"] = load_bodies
+        return post
+
+
+@dataclass
+class PostSummary:
+    """The columns of a post shown in post lists."""
+    reddit_id: str
+    subreddit: str
+    title: str
+    intent_score: float
+    status: PostStatus
+    
+    @classmethod
+    def from_dict(cls, data: dict) -> "PostSummary":
+        """Create from dictionary."""
+        return cls(
+            reddit_id=data["reddit_id"],
+            subreddit=data["subreddit"],
+            title=data["title"],
+            intent_score=data["intent_score"],
+            status=PostStatus(data["status"]),
+        )
+
+
+# Mark the matched terms in SearchHit.title and SearchHit.snippet
+SNIPPET_START = "\x02"
+SNIPPET_END = "\x03"
+
+
+@dataclass
+class SearchHit:
+    """A post matching a full-text search."""
+    post: Post
+    rank: float
+    title: str  # post title with the matches marked
+    snippet: str  # best matching fragment of the body, with the matches marked
+    
+    @staticmethod
+    def split_matches(text: str) -> list[tuple[str, bool]]:
+        """Split a marked title or snippet into (text, is_match) parts, for highlighting."""
+        parts = []
+        for i, chunk in enumerate(text.split(SNIPPET_START)):
+            if i == 0:
+                parts.append((chunk, False))
+                continue
+            match, _, rest = chunk.partition(SNIPPET_END)
+            parts.append((match, True))
+            parts.append((rest, False))
+        return [(part, is_match) for part, is_match in parts if part]
 
 
 @dataclass
@@ -124,3 +230,81 @@ class Action:
             created_at=datetime.fromisoformat(data["created_at"]) if isinstance(data["created_at"], str) else data["created_at"],
         )
 
+
+@dataclass
+class FetchCursor:
+    """High-water mark of the newest post seen in a subreddit."""
+    subreddit: str
+    last_created_utc: float
+    last_fullname: str
+    updated_at: datetime = field(default_factory=datetime.utcnow)
+    
+    def is_seen(self, fullname: str, created_utc: float) -> bool:
+        """
+        Check whether a post is the cursor post or older than it.
+        
+        Other posts from the cursor post's second may not have been seen yet,
+        so they are let through; dedupe drops the ones that were.
+        """
+        return fullname == self.last_fullname or created_utc < self.last_created_utc
+    
+    def to_dict(self) -> dict:
+        """Convert to dictionary for database storage."""
+        return {
+            "subreddit": self.subreddit,
+            "last_created_utc": self.last_created_utc,
+            "last_fullname": self.last_fullname,
+            "updated_at": self.updated_at.isoformat(),
+        }
+    
+    @classmethod
+    def from_dict(cls, data: dict) -> "FetchCursor":
+        """Create from dictionary."""
+        return cls(
+            subreddit=data["subreddit"],
+            last_created_utc=data["last_created_utc"],
+            last_fullname=data["last_fullname"],
+            updated_at=datetime.fromisoformat(data["updated_at"]) if isinstance(data["updated_at"], str) else data["updated_at"],
+        )
+
+
+@dataclass
+class DraftBatch:
+    """A batch of draft requests submitted to the OpenAI Batch API."""
+    batch_id: str
+    input_file_id: str
+    reddit_ids: list[str]
+    status: str = "validating"
+    output_file_id: Optional[str] = None
+    created_at: datetime = field(default_factory=datetime.utcnow)
+    collected_at: Optional[datetime] = None
+    
+    @property
+    def is_pending(self) -> bool:
+        """Check whether results have not been collected yet."""
+        return self.collected_at is None
+    
+    def to_dict(self) -> dict:
+        """Convert to dictionary for database storage."""
+        return {
+            "batch_id": self.batch_id,
+            "input_file_id": self.input_file_id,
+            "reddit_ids": json.dumps(self.reddit_ids),
+            "status": self.status,
+            "output_file_id": self.output_file_id,
+            "created_at": self.created_at.isoformat(),
+            "collected_at": self.collected_at.isoformat() if self.collected_at else None,
+        }
+    
+    @classmethod
+    def from_dict(cls, data: dict) -> "DraftBatch":
+        """Create from dictionary."""
+        return cls(
+            batch_id=data["batch_id"],
+            input_file_id=data["input_file_id"],
+            reddit_ids=json.loads(data["reddit_ids"]) if isinstance(data["reddit_ids"], str) else data["reddit_ids"],
+            status=data["status"],
+            output_file_id=data.get("output_file_id"),
+            created_at=datetime.fromisoformat(data["created_at"]) if isinstance(data["created_at"], str) else data["created_at"],
+            collected_at=datetime.fromisoformat(data["collected_at"]) if data.get("collected_at") else None,
+        )
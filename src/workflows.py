@@ -0,0 +1,167 @@
+"""
+Scheduled workflows shared by the cron scripts and the `hirelab serve` daemon.
+
+Each function does one run of a job against objects the caller owns (the
+database, configs, a Reddit client), so a long-running process can keep
+them warm between runs.
+"""
+
+from typing import Optional
+
+import requests
+
+from . import perf
+from .config import AppConfig, OpenAIConfig, SheetsConfig, SlackConfig
+from .drafts import generate_drafts_batch
+from .outputs import print_to_console, send_to_slack, write_to_sheets
+from .outputs.slack import build_daily_digest
+from .store import Action, ActionType, Database, DraftCache, PostStatus
+
+
+def notify_high_intent_posts(
+    db: Database,
+    slack_config: SlackConfig,
+    sheets_config: SheetsConfig,
+    openai_config: OpenAIConfig,
+    app_config: AppConfig,
+    limit: int = 20,
+    cache: Optional[DraftCache] = None,
+) -> int:
+    """
+    Draft replies for high-intent posts and send them to Slack and Sheets/CSV.
+    
+    Args:
+        db: Database instance
+        slack_config: Slack configuration
+        sheets_config: Google Sheets configuration
+        openai_config: OpenAI API configuration
+        app_config: Application settings
+        limit: Maximum posts per run
+        cache: Draft cache checked before calling the LLM
+    
+    Returns:
+        Number of posts processed
+    """
+    # Get high-intent posts that need processing
+    print("\n🎯 Finding high-intent posts...")
+    posts = db.get_posts_by_status(
+        statuses=[PostStatus.NEW, PostStatus.QUEUED],
+        min_score=app_config.intent_score_threshold,
+        limit=limit,
+    )
+    
+    if not posts:
+        print("No new high-intent posts found.")
+        return 0
+    
+    print(f"Found {len(posts)} posts above threshold")
+    
+    # Generate drafts
+    print("\n✍️ Generating draft replies...")
+    
+    def save_drafts(post, draft_a, draft_b):
+        post.draft_a = draft_a
+        post.draft_b = draft_b
+        with db.transaction():
+            db.save_post(post)
+            db.save_action(Action(
+                reddit_id=post.reddit_id,
+                action_type=ActionType.DRAFTED,
+            ))
+        print(f"  ✓ Generated drafts for {post.reddit_id}")
+    
+    generate_drafts_batch(
+        [post for post in posts if not post.draft_a],
+        openai_config,
+        on_result=save_drafts,
+        cache=cache,
+        on_draft_a=lambda post, _: print(f"  … Draft A ready for {post.reddit_id}"),
+    )
+    
+    # Send to Slack
+    if slack_config.is_configured:
+        print("\n📤 Sending to Slack...")
+        if send_to_slack(posts, slack_config):
+            for post in posts:
+                db.update_status(post.reddit_id, PostStatus.SENT)
+                db.save_action(Action(
+                    reddit_id=post.reddit_id,
+                    action_type=ActionType.SENT_TO_SLACK,
+                ))
+            print("  ✓ Sent to Slack")
+        else:
+            print("  ✗ Failed to send to Slack")
+    else:
+        print("\n⚠ Slack not configured, printing to console...")
+        print_to_console(posts)
+    
+    # Write to Sheets/CSV
+    csv_path = app_config.data_dir / "queue.csv"
+    print("\n📝 Writing to Sheets/CSV...")
+    if write_to_sheets(posts, sheets_config, csv_path):
+        for post in posts:
+            db.save_action(Action(
+                reddit_id=post.reddit_id,
+                action_type=ActionType.WRITTEN_TO_SHEETS,
+            ))
+        print("  ✓ Written to Sheets/CSV")
+    
+    return len(posts)
+
+
+def send_daily_digest(db: Database, slack_config: SlackConfig) -> bool:
+    """
+    Send the daily digest of the last 24 hours to Slack (or print it).
+    
+    Returns:
+        True if the digest was sent to Slack
+    """
+    # Get stats
+    db_stats = db.get_stats()
+    
+    # Get top posts from last 24 hours
+    print("\n📊 Generating daily digest...")
+    posts = db.get_recent_posts(hours=24, limit=10)
+    
+    # Calculate additional stats
+    stats = {
+        "total_posts": db_stats.get("total_posts", 0),
+        "new_today": len(posts),
+        "replied": db_stats.get("by_status", {}).get("REPLIED", 0),
+    }
+    
+    print(f"  Posts tracked: {stats['total_posts']}")
+    print(f"  New in last 24h: {stats['new_today']}")
+    print(f"  Total replied: {stats['replied']}")
+    
+    if not slack_config.is_configured:
+        print("\n⚠ Slack not configured")
+        print("Set SLACK_WEBHOOK_URL in .env to receive daily digests")
+        
+        # Print to console instead
+        print("\n📋 Top 10 Posts (Last 24 Hours):")
+        for i, post in enumerate(posts[:10], 1):
+            print(f"\n{i}. [{post.intent_score:.0f}] r/{post.subreddit}")
+            print(f"   {post.title[:60]}...")
+            print(f"   {post.url}")
+        
+        return False
+    
+    # Build and send Slack message
+    print("\n📤 Sending daily digest to Slack...")
+    blocks = build_daily_digest(posts, stats)
+    
+    try:
+        with perf.timer("slack.send"):
+            response = requests.post(
+                slack_config.webhook_url,
+                json={"blocks": blocks},
+                headers={"Content-Type": "application/json"},
+                timeout=30,
+            )
+            response.raise_for_status()
+        print("  ✓ Daily digest sent to Slack")
+        return True
+    except requests.RequestException as e:
+        print(f"  ✗ Failed to send: {e}")
+        return False